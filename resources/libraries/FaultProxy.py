@@ -0,0 +1,147 @@
+"""
+WordMate Fault Proxy Library
+
+Robot Framework keywords running the fault-injection proxy of
+``fault_proxy.py`` inside the test process. A suite starts the proxy in
+front of the API, points WordmateAPI (or RequestsLibrary, or the browser)
+at it, and switches scenarios or single rules between tests to check how
+timeouts, retries and waits behave on a degraded network.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from robot.api import logger
+from robot.api.deco import keyword
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.fault_proxy import (  # noqa: E402
+    FaultInjectionProxy,
+    load_scenario,
+)
+
+
+class FaultProxy:
+    """Latency and fault injection between the tests and the target"""
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+    ROBOT_LIBRARY_VERSION = "1.0.0"
+
+    def __init__(self):
+        self.proxy = None
+
+    def _running(self) -> FaultInjectionProxy:
+        if self.proxy is None:
+            raise RuntimeError("Fault proxy is not running; use Start Fault Proxy")
+        return self.proxy
+
+    @keyword
+    def start_fault_proxy(
+        self,
+        target: str,
+        scenario: str = None,
+        port: int = 0,
+        seed: int = None,
+    ) -> str:
+        """Start the proxy in front of ``target`` and return ``target`` through it
+
+        Each pabot process gets its own proxy; with the default port 0 a
+        free port is picked.
+
+        Args:
+            target: URL to degrade, e.g. ``${API_BASE_URL}``
+            scenario: Scenario file, or a name from config/fault_scenarios/;
+                without one requests pass untouched until rules are added
+            port: Port to listen on
+            seed: Seed of the random faults; defaults to the scenario's
+
+        Returns:
+            ``target`` rewritten to go through the proxy, for
+            ``Set API Base URL`` or ``Ensure Session``
+        """
+        self.stop_fault_proxy()
+        loaded = load_scenario(scenario) if scenario else {}
+        self.proxy = FaultInjectionProxy(target=target, port=int(port))
+        self.proxy.load_scenario(loaded, None if seed is None else int(seed))
+        self.proxy.start()
+        url = self.proxy.proxied_url(target)
+        logger.info(f"Fault proxy on {self.proxy.url} -> {self.proxy.target}")
+        return url
+
+    @keyword
+    def stop_fault_proxy(self) -> None:
+        """Stop the proxy, if running, logging its counters"""
+        if self.proxy is None:
+            return
+        logger.info(f"Fault proxy stats: {self.proxy.stats()}")
+        self.proxy.stop()
+        self.proxy = None
+
+    @keyword
+    def get_fault_proxy_url(self) -> str:
+        """Return the proxy's own URL, e.g. for a browser ``--proxy-server``"""
+        return self._running().url
+
+    @keyword
+    def load_fault_scenario(self, scenario: str) -> List[Dict[str, Any]]:
+        """Replace the rules with those of a scenario file and return them"""
+        proxy = self._running()
+        proxy.load_scenario(load_scenario(scenario))
+        logger.info(f"Fault scenario '{proxy.scenario_name}': {proxy.rules()}")
+        return proxy.rules()
+
+    @keyword
+    def add_fault_rule(self, match: str = "*", **settings) -> Dict[str, Any]:
+        """Add a rule ahead of the current ones
+
+        Args:
+            match: Glob over the request path and query. Pass it by name,
+                e.g. ``match=*endpoint=login*``: a bare ``*endpoint=login*``
+                contains ``=`` and would be read as a setting named
+                ``*endpoint``
+            settings: Rule settings as in scenario files: ``name``,
+                ``methods`` (comma separated), ``latency_ms``,
+                ``jitter_ms``, ``bandwidth_kbps``, ``reset_rate``,
+                ``error_rate``, ``status``, ``retry_after``,
+                ``burst_every`` and ``burst_length``, e.g.
+                ``status=503  burst_every=10  burst_length=3``
+        """
+        spec: Dict[str, Any] = {"match": match}
+        burst_every = settings.pop("burst_every", None)
+        burst_length = settings.pop("burst_length", None)
+        if burst_every is not None:
+            spec["burst"] = {"every": burst_every, "length": burst_length or 1}
+        methods = settings.pop("methods", None)
+        if methods:
+            spec["methods"] = [m.strip() for m in str(methods).split(",")]
+        spec.update(settings)
+
+        proxy = self._running()
+        proxy.add_rule(spec)
+        rule = proxy.rules()[0]
+        logger.info(f"Fault rule added: {rule}")
+        return rule
+
+    @keyword
+    def clear_fault_rules(self) -> None:
+        """Forward everything untouched"""
+        self._running().set_rules([])
+
+    @keyword
+    def get_fault_proxy_stats(self) -> Dict[str, Any]:
+        """Return request, forward and tunnel counts, and per-rule fault counts
+
+        Each rule reports ``requests`` matched, ``delayed`` with
+        ``delay_seconds`` in total, ``throttled``, ``resets`` and
+        ``injected`` answers per status.
+        """
+        return self._running().stats()
+
+    @keyword
+    def reset_fault_proxy_stats(self) -> None:
+        """Zero the counters and restart burst cycles"""
+        self._running().reset_stats()
@@ -0,0 +1,197 @@
+"""
+WordMate Load Test Library
+
+Robot Framework keywords running the scenario-based load engine of
+``load_engine.py``. A test runs a scenario of user journeys built from the
+WordmateAPI operations, gets the per-step latency and throughput figures
+back, checks them with the threshold keywords, and leaves a per-step table
+in the Robot log plus a ``load_results_*.json`` file for the consolidated
+report.
+"""
+
+import sys
+from html import escape
+from pathlib import Path
+from typing import Any, Dict
+
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.load_engine import (  # noqa: E402
+    PERCENTILES,
+    REQUEST_TIMEOUT,
+    LoadProfile,
+    load_scenario,
+    run_scenario,
+    write_results,
+)
+
+# Seconds between progress lines on the console
+PROGRESS_EVERY = 10
+
+
+def _step_table(steps: Dict[str, Dict[str, Any]]) -> str:
+    columns = ["Step", "Requests", "Errors %", "Req/s", "Mean"]
+    columns += [f"p{percent}" for percent in PERCENTILES] + ["Max"]
+    rows = []
+    for name, step in steps.items():
+        cells = [escape(name), step["requests"], step["error_rate"], step["throughput"]]
+        cells += [
+            step[key]
+            for key in ["mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]
+        ]
+        rows.append("".join(f"<td>{'-' if c is None else c}</td>" for c in cells))
+    header = "".join(f"<th>{column}</th>" for column in columns)
+    body = "".join(f"<tr>{row}</tr>" for row in rows)
+    return f'<table border="1"><tr>{header}</tr>{body}</table>'
+
+
+class LoadTest:
+    """Scenario-based load tests from WordmateAPI operations"""
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+    ROBOT_LIBRARY_VERSION = "1.0.0"
+
+    def _robot_variable(self, name: str) -> Any:
+        try:
+            return BuiltIn().get_variable_value(name)
+        except RobotNotRunningError:
+            return None
+
+    @keyword
+    def run_load_scenario(
+        self,
+        scenario: str,
+        base_url: str = None,
+        users: int = None,
+        ramp_up: float = None,
+        steady: float = None,
+        ramp_down: float = None,
+        seed: int = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+    ) -> Dict[str, Any]:
+        """Run a load scenario to the end and return its results
+
+        The profile comes from the scenario; any of ``users``, ``ramp_up``,
+        ``steady`` and ``ramp_down`` (seconds) given here override it.
+
+        Args:
+            scenario: Scenario file, or a name from config/load_scenarios/
+            base_url: API base URL; defaults to ``${API_BASE_URL}``
+            users: Virtual users at the steady phase
+            ramp_up: Seconds to start all users
+            steady: Seconds all users run
+            ramp_down: Seconds to stop them
+            seed: Seed for journey choice and think times
+            request_timeout: Seconds before a request counts as failed
+
+        Returns:
+            Results with ``steps`` and ``steady_steps`` (per-step requests,
+            error rate, throughput and latency percentiles in ms),
+            ``journeys``, ``throughput``, ``error_rate``, ``timeline``,
+            ``thresholds`` and ``passed``
+        """
+        loaded = load_scenario(scenario)
+        spec = dict(loaded.get("profile") or {})
+        overrides = {
+            "users": users,
+            "ramp_up_s": ramp_up,
+            "steady_s": steady,
+            "ramp_down_s": ramp_down,
+        }
+        spec.update({k: float(v) for k, v in overrides.items() if v is not None})
+        profile = LoadProfile.from_dict(spec)
+        base_url = base_url or self._robot_variable("${API_BASE_URL}")
+        if not base_url:
+            raise RuntimeError("No API base URL: pass base_url or set ${API_BASE_URL}")
+
+        logger.info(
+            f"Load scenario '{loaded['name']}' against {base_url}: "
+            f"{profile.users} users, {profile.ramp_up_s:.0f}s ramp up, "
+            f"{profile.steady_s:.0f}s steady, {profile.ramp_down_s:.0f}s ramp down"
+        )
+
+        def progress(entry: Dict[str, Any]) -> None:
+            if entry["second"] % PROGRESS_EVERY == 0:
+                logger.console(
+                    f"  {entry['second']:>5}s  {entry['users']:>6} users  "
+                    f"{entry['requests']:>6} req/s  {entry['failures']} failed"
+                )
+
+        results = run_scenario(
+            loaded,
+            base_url,
+            profile=profile,
+            seed=None if seed is None else int(seed),
+            request_timeout=float(request_timeout),
+            on_progress=progress,
+        )
+
+        logger.info(
+            f"{results['requests']} requests, {results['throughput']} req/s "
+            f"({results['steady_throughput']} req/s steady), "
+            f"{results['error_rate']}% errors"
+        )
+        logger.info(_step_table(results["steady_steps"] or results["steps"]), html=True)
+        if results["errors"]:
+            logger.info(f"Errors: {results['errors']}")
+
+        output_dir = self._robot_variable("${OUTPUT DIR}")
+        if output_dir:
+            path = write_results(results, Path(output_dir))
+            logger.info(f"Load test results written to {path}")
+        return results
+
+    @keyword
+    def load_test_thresholds_should_pass(self, results: Dict[str, Any]) -> None:
+        """Fail listing every threshold of the scenario that was missed"""
+        missed = [check for check in results["thresholds"] if not check["passed"]]
+        for check in results["thresholds"]:
+            logger.info(
+                f"{check['step']} {check['metric']}: {check['actual']} "
+                f"(limit {check['limit']}) {'ok' if check['passed'] else 'MISSED'}"
+            )
+        if missed:
+            raise AssertionError(
+                "Load test thresholds missed: "
+                + "; ".join(
+                    f"{c['step']} {c['metric']} {c['actual']} > {c['limit']}"
+                    for c in missed
+                )
+            )
+
+    @keyword
+    def load_step_percentile_should_be_below(
+        self, results: Dict[str, Any], step: str, percentile: int, limit_ms: float
+    ) -> None:
+        """Fail when a step's steady-state latency percentile exceeds ``limit_ms``
+
+        ``percentile`` is one of 50, 90, 95 or 99.
+        """
+        steps = results["steady_steps"] or results["steps"]
+        if step not in steps:
+            raise AssertionError(f"Step '{step}' did not run; ran {sorted(steps)}")
+        actual = steps[step][f"p{int(percentile)}_ms"]
+        if actual is None or actual > float(limit_ms):
+            raise AssertionError(
+                f"{step} p{percentile} is {actual} ms, limit {limit_ms} ms"
+            )
+
+    @keyword
+    def load_error_rate_should_be_below(
+        self, results: Dict[str, Any], percent: float, step: str = None
+    ) -> None:
+        """Fail when the error rate, of one step or all requests, exceeds ``percent``"""
+        actual = results["error_rate"]
+        if step:
+            actual = results["steps"][step]["error_rate"]
+        if actual > float(percent):
+            raise AssertionError(
+                f"{step or 'All requests'}: {actual}% errors, limit {percent}%"
+                + (f"; {results['errors']}" if results["errors"] else "")
+            )
@@ -0,0 +1,59 @@
+"""
+WordMate Quarantine Modifier
+
+Robot Framework pre-run modifier that tags the tests listed in the
+flaky-test quarantine file, so runs can include or exclude them by tag:
+
+    robot --prerunmodifier resources/libraries/QuarantineModifier.py:config/quarantine.yaml \
+          --exclude quarantine tests/
+"""
+
+from pathlib import Path
+
+import yaml
+from robot.api import SuiteVisitor, logger
+
+QUARANTINE_TAG = "quarantine"
+
+
+class QuarantineModifier(SuiteVisitor):
+    """Tag quarantined tests with ``quarantine``"""
+
+    def __init__(self, quarantine_file: str = "config/quarantine.yaml"):
+        """Load quarantined test names
+
+        Args:
+            quarantine_file: YAML file written by generate_report.py
+        """
+        self.quarantined = set()
+        path = Path(quarantine_file)
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                document = yaml.safe_load(f) or {}
+            self.quarantined = {entry["test"] for entry in document.get("tests", [])}
+        self.tagged = 0
+
+    def _is_quarantined(self, longname: str) -> bool:
+        # The top-level suite name depends on what was passed to robot, so a
+        # stored name matches when either name ends with the other
+        if longname in self.quarantined:
+            return True
+        return any(
+            name.endswith("." + longname) or longname.endswith("." + name)
+            for name in self.quarantined
+        )
+
+    def start_suite(self, suite):
+        """Skip traversal entirely when nothing is quarantined"""
+        return bool(self.quarantined)
+
+    def visit_test(self, test):
+        """Tag the test when it is on the quarantine list"""
+        if self._is_quarantined(test.longname):
+            test.tags.add(QUARANTINE_TAG)
+            self.tagged += 1
+
+    def end_suite(self, suite):
+        """Report how many tests were tagged once the top suite is done"""
+        if suite.parent is None and self.quarantined:
+            logger.info(f"Quarantine: tagged {self.tagged} tests as '{QUARANTINE_TAG}'")
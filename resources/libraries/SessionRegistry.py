@@ -0,0 +1,139 @@
+"""
+WordMate Session Registry Library
+
+Robot Framework keywords giving RequestsLibrary the pooled sessions of
+the shared session registry, the same sessions WordmateAPI sends its
+requests through. ``Ensure Session`` replaces ``Create Session``: asking
+again for a session that exists is a no-op returning the warm one.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import requests
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.session_registry import (  # noqa: E402
+    DEFAULT_IDENTITY,
+    REGISTRY,
+)
+
+
+def _share(library_session: requests.Session, session: requests.Session) -> None:
+    """Make a session RequestsLibrary created use the pools and state of ``session``"""
+    library_session.adapters = session.adapters
+    library_session.headers = session.headers
+    library_session.cookies = session.cookies
+    library_session.auth = session.auth
+    library_session.verify = session.verify
+
+
+class SessionRegistry:
+    """Shared pooled sessions for RequestsLibrary keywords"""
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+    ROBOT_LIBRARY_VERSION = "1.0.0"
+
+    def __init__(self):
+        # alias -> (base URL, identity) it was created for
+        self._aliases: Dict[str, Tuple[str, str]] = {}
+        # Test that last used the anonymous session of each base URL
+        self._anonymous_tests: Dict[str, str] = {}
+
+    def _current_test(self) -> str:
+        try:
+            builtin = BuiltIn()
+            suite = builtin.get_variable_value("${SUITE NAME}")
+            return f"{suite}.{builtin.get_variable_value('${TEST NAME}')}"
+        except RobotNotRunningError:
+            return ""
+
+    def _requests_library_loaded(self) -> bool:
+        try:
+            BuiltIn().get_library_instance("RequestsLibrary")
+        except (RuntimeError, RobotNotRunningError):
+            return False
+        return True
+
+    def _reset_for_test(self, url: str, session: requests.Session) -> None:
+        """Start each test with the anonymous session's cookies and headers cleared
+
+        ``Create Session`` used to give every test a fresh session; the
+        shared one keeps its warm connections but not the previous test's
+        state.
+        """
+        test = self._current_test()
+        previous = self._anonymous_tests.get(url)
+        self._anonymous_tests[url] = test
+        if previous is not None and previous != test:
+            session.cookies.clear()
+            session.headers.clear()
+            session.headers.update(requests.utils.default_headers())
+
+    @keyword
+    def ensure_session(
+        self, alias: str, url: str, identity: str = DEFAULT_IDENTITY, **headers
+    ) -> requests.Session:
+        """Make ``alias`` refer to the shared session for ``url`` and ``identity``
+
+        Use instead of ``Create Session``; the ``On Session`` keywords of
+        RequestsLibrary then work with ``alias`` as before. When the alias
+        already refers to that session nothing is done. The anonymous
+        session starts each test without the cookies and headers of the
+        previous one.
+
+        Args:
+            alias: RequestsLibrary session alias
+            url: Base URL of the session
+            identity: User the session belongs to (cookies, auth headers)
+            headers: Headers to set on the session, e.g. ``Authorization=...``
+
+        Returns:
+            The shared session
+        """
+        session, created = REGISTRY.get(url, identity)
+        if identity == DEFAULT_IDENTITY:
+            self._reset_for_test(url, session)
+        if headers:
+            session.headers.update(headers)
+
+        if not self._requests_library_loaded():
+            return session
+
+        builtin = BuiltIn()
+        key = (url, identity)
+        if self._aliases.get(alias) == key and builtin.run_keyword(
+            "RequestsLibrary.Session Exists", alias
+        ):
+            return session
+
+        library_session = builtin.run_keyword(
+            "RequestsLibrary.Create Session", alias, url
+        )
+        _share(library_session, session)
+        self._aliases[alias] = key
+        logger.info(
+            f"Session '{alias}' -> {url} as {identity}"
+            + (" (new)" if created else " (reused)")
+        )
+        return session
+
+    @keyword
+    def get_registered_sessions(self) -> List[str]:
+        """Return the ``base URL (identity)`` of every shared session"""
+        return [f"{url} ({identity})" for url, identity in REGISTRY.keys()]
+
+    @keyword
+    def close_registered_sessions(self) -> None:
+        """Close every shared session, e.g. in a final suite teardown"""
+        REGISTRY.close()
+        self._aliases.clear()
+        self._anonymous_tests.clear()
+        logger.info("Shared sessions closed")
@@ -5,16 +5,74 @@ Custom Robot Framework library for WordMate API interactions.
 Provides high-level keywords for API testing and validation.
 """
 
+import hashlib
 import json
+import os
+import sys
+import threading
 import time
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 import jwt
 import requests
-from requests.adapters import HTTPAdapter
 from robot.api import logger
 from robot.api.deco import keyword
-from urllib3.util.retry import Retry
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries import api_operations  # noqa: E402
+from resources.libraries.cassette import api_mode, cassette_stats  # noqa: E402
+from resources.libraries.circuit_breaker import (  # noqa: E402
+    DEFAULT_STATE_FILE as BREAKER_STATE_FILE,
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_keys,
+)
+from resources.libraries.compression import accept_encoding, read_body  # noqa: E402
+from resources.libraries.http_transport import create_transport  # noqa: E402
+from resources.libraries.rate_limiter import (  # noqa: E402
+    DEFAULT_STATE_FILE as RATE_LIMIT_STATE_FILE,
+    RateLimiter,
+    endpoint_group,
+)
+from resources.libraries.request_log import (  # noqa: E402
+    DEFAULT_SAMPLE_EVERY,
+    RequestLog,
+    new_record,
+)
+from resources.libraries.session_registry import (  # noqa: E402
+    DEFAULT_IDENTITY,
+    REGISTRY as SESSIONS,
+    RETRIES,
+    RETRY_BACKOFF,
+    RETRY_STATUSES,
+    configure_session,
+)
+from resources.libraries.single_flight import SingleFlight  # noqa: E402
+from resources.libraries.transfer_stats import TransferStats  # noqa: E402
+
+# 429 answers are retried after the shared rate limiter has slowed all workers
+RATE_LIMIT_RETRIES = 3
+# Methods retried after a server error or broken connection, as urllib3 does
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"}
+# Concurrent identical requests with these methods share one network call
+DEDUPLICATED_METHODS = {"GET", "HEAD"}
+
+
+class _RunListener:
+    """Writes the library's run artifacts when Robot closes the library"""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, library: "WordmateAPI"):
+        self.library = library
+
+    def close(self) -> None:
+        self.library._write_run_artifacts()
 
 
 class WordmateAPI:
@@ -23,28 +81,157 @@ class WordmateAPI:
     ROBOT_LIBRARY_SCOPE = "GLOBAL"
     ROBOT_LIBRARY_VERSION = "1.0.0"
 
-    def __init__(self, base_url: str = None, timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: int = 30,
+        circuit_breaker: bool = True,
+        breaker_state_file: str = None,
+        rate_limit: bool = True,
+        rate_limit_state_file: str = None,
+        transport: str = None,
+        log_sample_every: int = None,
+        request_log_file: str = None,
+    ):
         """Initialize WordMate API library
 
         Args:
             base_url: Base URL for API endpoints
             timeout: Default timeout for requests
+            circuit_breaker: Fail fast while a host or endpoint keeps failing;
+                off, like ``rate_limit``, when replaying cassettes
+            breaker_state_file: Circuit state shared by all pabot processes
+            rate_limit: Pace requests with a token bucket shared by all processes
+            rate_limit_state_file: Rate limiter state shared by all pabot processes
+            transport: ``http1``, ``http2`` or ``h2c``; defaults to the
+                ``${API_TRANSPORT}`` variable set by run_tests.py, else ``http1``
+            log_sample_every: Log one in this many successful requests in
+                full (failures always); defaults to ``${API_LOG_SAMPLE}``,
+                else 100. 0 turns the request log off
+            request_log_file: Side file for full records; defaults to
+                ``api_requests_<pid>.jsonl.gz`` in Robot's output directory
         """
         self.base_url = base_url
         self.timeout = timeout
-        self.session = requests.Session()
+        self.identity = DEFAULT_IDENTITY
         self.auth_token = None
         self.refresh_token = None
 
-        # Setup retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+        # Retry strategy for sessions this library creates; with rate
+        # limiting, 429 is handled in _send, and with the circuit breaker
+        # all retries are, so the breaker counts every attempt
+        self.retry_statuses = list(RETRY_STATUSES)
+        if not rate_limit:
+            self.retry_statuses.insert(0, 429)
+
+        self.transfer_stats = TransferStats()
+        self.output_dir = None
+        self.log_sample_every = log_sample_every
+        self.request_log_file = request_log_file
+        self.request_log = None
+        self.ROBOT_LIBRARY_LISTENER = _RunListener(self)
+
+        # Record and replay go through the cassette adapter of the shared
+        # sessions; in replay there is no server to protect or pace
+        self.api_mode = api_mode()
+        if self.api_mode == "replay":
+            circuit_breaker = rate_limit = False
+
+        # Created on first use, once Robot variables can be read
+        self._run_settings_resolved = False
+        self.transport_name = transport
+        self._transport = None
+        self._transport_lock = threading.Lock()
+
+        self.circuit_breaker = None
+        if circuit_breaker:
+            self.circuit_breaker = CircuitBreaker(
+                Path(breaker_state_file or BREAKER_STATE_FILE),
+                on_transition=self._log_circuit_transition,
+            )
+
+        self.single_flight = SingleFlight()
+
+        self.rate_limiter = None
+        if rate_limit:
+            self.rate_limiter = RateLimiter(
+                Path(rate_limit_state_file or RATE_LIMIT_STATE_FILE),
+                on_throttle=lambda group, message: logger.warn(
+                    f"Rate limit ({group}): {message}"
+                ),
+            )
+
+    @property
+    def session(self) -> requests.Session:
+        """Shared session of the current base URL and identity
+
+        Sessions come from the process-wide registry, so RequestsLibrary
+        keywords using ``Ensure Session`` reuse the same connections.
+        """
+        session, _ = SESSIONS.get(
+            self.base_url,
+            self.identity,
+            lambda new: configure_session(
+                new, self.retry_statuses, 0 if self.circuit_breaker else RETRIES
+            ),
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        return session
+
+    def _robot_variable(self, name: str) -> Any:
+        try:
+            return BuiltIn().get_variable_value(name)
+        except RobotNotRunningError:
+            return None
+
+    def _resolve_run_settings(self) -> None:
+        """Fill settings left open at import from the run's Robot variables"""
+        self._run_settings_resolved = True
+        if self.transport_name is None:
+            self.transport_name = self._robot_variable("${API_TRANSPORT}")
+        self.transport_name = self.transport_name or "http1"
+        if self.api_mode != "live" and self.transport_name != "http1":
+            # The HTTP/2 client does not go through the sessions' cassettes
+            logger.warn(
+                f"API transport {self.transport_name} ignored in "
+                f"{self.api_mode} mode, using http1"
+            )
+            self.transport_name = "http1"
+        self.output_dir = self._robot_variable("${OUTPUT DIR}")
+
+        if self.log_sample_every is None:
+            self.log_sample_every = self._robot_variable("${API_LOG_SAMPLE}")
+        if self.log_sample_every is None:
+            self.log_sample_every = DEFAULT_SAMPLE_EVERY
+        self.log_sample_every = int(self.log_sample_every)
+        if self.log_sample_every > 0:
+            path = self.request_log_file or Path(self.output_dir or ".") / (
+                f"api_requests_{os.getpid()}.jsonl.gz"
+            )
+            self.request_log = RequestLog(Path(path), self.log_sample_every)
+
+    def _get_transport(self) -> Any:
+        """Object requests are sent through: the session or an HTTP/2 client"""
+        with self._transport_lock:
+            if not self._run_settings_resolved:
+                self._resolve_run_settings()
+            if self._transport is None:
+                name = self.transport_name
+                self._transport = create_transport(name, self.session, self.timeout)
+                logger.info(f"API transport: {name}")
+            transport = self._transport
+        # Over HTTP/1.1 the transport is the session of the current identity
+        if isinstance(transport, requests.Session):
+            return self.session
+        return transport
+
+    def _log_circuit_transition(
+        self, key: str, old_state: str, new_state: str, reason: str
+    ) -> None:
+        message = f"Circuit breaker {key}: {old_state} -> {new_state} ({reason})"
+        if new_state == "closed":
+            logger.info(message)
+        else:
+            logger.warn(message)
 
     @keyword
     def set_api_base_url(self, url: str) -> None:
@@ -54,18 +241,57 @@ class WordmateAPI:
             url: Base URL for the API
         """
         self.base_url = url
+        if self.auth_token:
+            self.session.headers["Authorization"] = f"Bearer {self.auth_token}"
         logger.info(f"API base URL set to: {url}")
 
     @keyword
-    def set_auth_token(self, token: str) -> None:
+    def set_api_transport(self, transport: str) -> None:
+        """Switch the transport used for subsequent API requests
+
+        Args:
+            transport: ``http1``, ``http2`` (ALPN over TLS) or ``h2c``;
+                always ``http1`` in record and replay mode
+        """
+        if self.api_mode != "live":
+            logger.warn(f"API transport stays http1 in {self.api_mode} mode")
+            return
+        new_transport = create_transport(transport, self.session, self.timeout)
+        with self._transport_lock:
+            if self._transport is not None and not isinstance(
+                self._transport, requests.Session
+            ):
+                self._transport.close()
+            self._transport = new_transport
+            self.transport_name = transport.lower()
+        logger.info(f"API transport set to: {self.transport_name}")
+
+    @keyword
+    def set_auth_token(self, token: str, identity: str = None) -> None:
         """Set authentication token for API requests
 
+        Requests are then sent through the shared session of ``identity``,
+        which ``Ensure Session`` hands to RequestsLibrary as well.
+
         Args:
             token: JWT authentication token
+            identity: User the token belongs to; taken from the token's
+                claims when not given
         """
+        self.identity = identity or self._token_identity(token)
         self.auth_token = token
         self.session.headers.update({"Authorization": f"Bearer {token}"})
-        logger.info("Authentication token set")
+        logger.info(f"Authentication token set for {self.identity}")
+
+    def _token_identity(self, token: str) -> str:
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            claims = {}
+        for claim in ("email", "username", "sub", "user_id", "userId"):
+            if claims.get(claim):
+                return str(claims[claim])
+        return "token-" + hashlib.sha256(token.encode()).hexdigest()[:12]
 
     @keyword
     def clear_auth_token(self) -> None:
@@ -73,6 +299,7 @@ class WordmateAPI:
         self.auth_token = None
         if "Authorization" in self.session.headers:
             del self.session.headers["Authorization"]
+        self.identity = DEFAULT_IDENTITY
         logger.info("Authentication token cleared")
 
     @keyword
@@ -98,41 +325,249 @@ class WordmateAPI:
         """
         url = f"{self.base_url}{endpoint}"
         request_headers = self.session.headers.copy()
+        # Offer every encoding read_body can decode
+        request_headers["Accept-Encoding"] = accept_encoding()
 
         if headers:
             request_headers.update(headers)
 
+        started = time.time()
+        clock = time.perf_counter()
+        log_context = (method, url, data, request_headers, started, expected_status)
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                headers=request_headers,
-                timeout=self.timeout,
-            )
-
-            logger.info(f"{method} {url} - Status: {response.status_code}")
+            shared = False
+            if method.upper() in DEDUPLICATED_METHODS and data is None:
+                key = (method.upper(), url, tuple(sorted(request_headers.items())))
+                result, shared = self.single_flight.do(
+                    key, lambda: self._request(method, url, data, request_headers)
+                )
+            else:
+                result = self._request(method, url, data, request_headers)
 
-            if response.status_code != expected_status:
+            self._log_request(
+                *log_context, time.perf_counter() - clock, result, shared=shared
+            )
+            if result["status_code"] != expected_status:
                 logger.warn(
-                    f"Expected status {expected_status}, got {response.status_code}"
+                    f"Expected status {expected_status}, got {result['status_code']}"
                 )
 
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError:
-                response_data = {"text": response.text}
-
-            return {
-                "status_code": response.status_code,
-                "data": response_data,
-                "headers": dict(response.headers),
-            }
+            return result
 
+        except CircuitOpenError as e:
+            logger.error(f"API request not sent: {str(e)}")
+            self._log_request(*log_context, time.perf_counter() - clock, error=str(e))
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {str(e)}")
+            self._log_request(*log_context, time.perf_counter() - clock, error=str(e))
             raise
 
+    def _log_request(
+        self,
+        method: str,
+        url: str,
+        data: Dict,
+        headers: Dict,
+        started: float,
+        expected_status: int,
+        elapsed: float,
+        result: Dict = None,
+        error: str = None,
+        shared: bool = False,
+    ) -> None:
+        """One-line summary in the Robot log, full record in the request log
+
+        Failures and the sampled successes are summarized at INFO level;
+        other requests only at DEBUG, which output.xml leaves out by default.
+        """
+        status = result["status_code"] if result else None
+        failed = error is not None or status != expected_status
+        summary = (
+            f"{method} {url} - "
+            + (f"Status: {status}" if result else "No response")
+            + f" in {elapsed * 1000:.0f} ms"
+            + (" (shared with an identical request in flight)" if shared else "")
+        )
+
+        record_id = self.request_log.sample(failed) if self.request_log else None
+        if record_id is None:
+            if failed:
+                logger.info(summary)
+            else:
+                logger.debug(summary)
+            return
+
+        logger.info(f"{summary} [request log #{record_id}]")
+        self.request_log.submit(
+            new_record(
+                record_id,
+                method,
+                url,
+                started,
+                elapsed,
+                status_code=status,
+                expected_status=expected_status,
+                shared=shared,
+                error=error,
+                request_headers=dict(headers),
+                request_body=data,
+                response_headers=result["headers"] if result else None,
+                response_body=result["data"] if result else None,
+            )
+        )
+
+    def _request(self, method: str, url: str, data: Dict, headers: Dict) -> Dict:
+        """Send a request and decode its response"""
+        response, body = self._send(method, url, data, headers)
+
+        try:
+            response_data = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            response_data = {
+                "text": body.decode(response.encoding or "utf-8", errors="replace")
+            }
+
+        return {
+            "status_code": response.status_code,
+            "data": response_data,
+            "headers": dict(response.headers),
+        }
+
+    def _send(
+        self, method: str, url: str, data: Dict, headers: Dict
+    ) -> Tuple[Any, bytes]:
+        """Send a request through the circuit breaker and rate limiter
+
+        Returns the response and its decoded body.
+        """
+        breaker_keys = circuit_keys(url)
+        group = endpoint_group(url)
+
+        # With the circuit breaker the adapter does not retry, so this does,
+        # with the same backoff and, like urllib3, only idempotent methods
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        rate_limit_retries = retries = 0
+        while True:
+            # An open circuit also cuts the remaining retries short
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request(breaker_keys)
+            if self.rate_limiter:
+                waited = self.rate_limiter.acquire(group)
+                if waited >= 1:
+                    logger.info(f"Rate limit ({group}): waited {waited:.1f}s")
+
+            started = time.perf_counter()
+            try:
+                response = self._get_transport().request(
+                    method=method,
+                    url=url,
+                    json=data,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=True,
+                )
+                body, wire_bytes, encoding = read_body(response)
+            except requests.exceptions.RequestException as e:
+                if not self.circuit_breaker:
+                    raise
+                self.circuit_breaker.record(breaker_keys, False)
+                retryable = idempotent or isinstance(
+                    e, requests.exceptions.ConnectTimeout
+                )
+                if not retryable or retries >= RETRIES:
+                    raise
+                retries += 1
+                logger.info(f"{method} {url} - {e}, retrying ({retries})")
+                time.sleep(RETRY_BACKOFF * 2 ** (retries - 1))
+                continue
+            self.transfer_stats.record(
+                url, encoding, wire_bytes, len(body), time.perf_counter() - started
+            )
+
+            if self.circuit_breaker:
+                self.circuit_breaker.record(breaker_keys, response.status_code < 500)
+                if (
+                    idempotent
+                    and response.status_code in self.retry_statuses
+                    and retries < RETRIES
+                ):
+                    retries += 1
+                    logger.info(
+                        f"{method} {url} - {response.status_code}, "
+                        f"retrying ({retries})"
+                    )
+                    time.sleep(RETRY_BACKOFF * 2 ** (retries - 1))
+                    continue
+            if not self.rate_limiter:
+                break
+            self.rate_limiter.observe(group, response.status_code, response.headers)
+            if response.status_code != 429 or rate_limit_retries >= RATE_LIMIT_RETRIES:
+                break
+            rate_limit_retries += 1
+            logger.info(f"{method} {url} - 429, retrying ({rate_limit_retries})")
+
+        return response, body
+
+    @keyword
+    def get_transfer_stats(self) -> List[Dict]:
+        """Return wire and decoded response bytes per endpoint, largest first
+
+        Returns:
+            One dictionary per endpoint with responses, wire_bytes,
+            decoded_bytes, compression_ratio, encodings and seconds
+        """
+        rows = self.transfer_stats.summary()
+        for row in rows:
+            ratio = row["compression_ratio"]
+            logger.info(
+                f"{row['endpoint']}: {row['responses']} responses, "
+                f"{row['wire_bytes']} bytes on the wire, "
+                f"{row['decoded_bytes']} decoded"
+                + (f" ({ratio:.1f}x)" if ratio else "")
+            )
+        return rows
+
+    def _write_run_artifacts(self) -> None:
+        """Write transfer stats and flush the request log at the end of the run"""
+        if self.output_dir and self.transfer_stats.endpoints:
+            self.transfer_stats.write(Path(self.output_dir))
+        if self.request_log:
+            self.request_log.close()
+
+    @keyword
+    def get_cassette_stats(self) -> Dict:
+        """Return the API mode and the cassette counts of this process
+
+        Returns:
+            Dictionary with mode and directory, plus ``recorded`` in record
+            mode or ``responses``, ``hits`` and ``misses`` in replay mode
+        """
+        stats = cassette_stats()
+        logger.info(f"API mode {stats['mode']}: {stats}")
+        return stats
+
+    @keyword
+    def get_request_deduplication_stats(self) -> Dict:
+        """Return how many requests were served by an identical in-flight call
+
+        Returns:
+            Dictionary with requests, network_calls and deduplicated counts
+        """
+        stats = self.single_flight.stats()
+        logger.info(
+            f"{stats['deduplicated']} of {stats['requests']} deduplicable "
+            "requests shared an in-flight call"
+        )
+        return stats
+
+    @keyword
+    def reset_circuit_breakers(self) -> None:
+        """Close all circuits, e.g. in suite setup after an outage was fixed"""
+        if self.circuit_breaker:
+            self.circuit_breaker.reset()
+            logger.info("Circuit breakers reset")
+
     @keyword
     def login_user(self, username: str, password: str) -> Dict:
         """Login user and return authentication data
@@ -144,12 +579,10 @@ class WordmateAPI:
         Returns:
             Login response data
         """
-        login_data = {"username": username, "password": password}
-
-        response = self.make_api_request("POST", "?endpoint=login", login_data)
+        response = self.make_api_request(*api_operations.login(username, password))
 
         if response["status_code"] == 200 and "token" in response["data"]:
-            self.set_auth_token(response["data"]["token"])
+            self.set_auth_token(response["data"]["token"], identity=username)
             if "refreshToken" in response["data"]:
                 self.refresh_token = response["data"]["refreshToken"]
 
@@ -188,7 +621,7 @@ class WordmateAPI:
         Returns:
             User profile data
         """
-        return self.make_api_request("GET", "?endpoint=profile")
+        return self.make_api_request(*api_operations.user_profile())
 
     @keyword
     def get_vocabulary_list(
@@ -204,11 +637,9 @@ class WordmateAPI:
         Returns:
             Vocabulary list data
         """
-        endpoint = f"?endpoint=vocabulario&page={page}&limit={limit}"
-        if search:
-            endpoint += f"&search={search}"
-
-        return self.make_api_request("GET", endpoint)
+        return self.make_api_request(
+            *api_operations.vocabulary_list(page, limit, search)
+        )
 
     @keyword
     def add_word_to_favorites(self, word_id: int) -> Dict:
@@ -220,8 +651,7 @@ class WordmateAPI:
         Returns:
             Response data
         """
-        data = {"wordId": word_id}
-        return self.make_api_request("POST", "?endpoint=favoritos", data)
+        return self.make_api_request(*api_operations.add_favorite(word_id))
 
     @keyword
     def remove_word_from_favorites(self, word_id: int) -> Dict:
@@ -233,7 +663,7 @@ class WordmateAPI:
         Returns:
             Response data
         """
-        return self.make_api_request("DELETE", f"?endpoint=favoritos&wordId={word_id}")
+        return self.make_api_request(*api_operations.remove_favorite(word_id))
 
     @keyword
     def create_custom_vocabulary(
@@ -311,11 +741,7 @@ class WordmateAPI:
         Returns:
             Grammar exercises data
         """
-        endpoint = "?endpoint=grammarExercises"
-        if category:
-            endpoint += f"&category={category}"
-
-        return self.make_api_request("GET", endpoint)
+        return self.make_api_request(*api_operations.grammar_exercises(category))
 
     @keyword
     def submit_grammar_answer(self, exercise_id: int, answer: Any) -> Dict:
@@ -328,9 +754,9 @@ class WordmateAPI:
         Returns:
             Response data
         """
-        data = {"exerciseId": exercise_id, "answer": answer}
-
-        return self.make_api_request("POST", "?endpoint=grammarSubmit", data)
+        return self.make_api_request(
+            *api_operations.submit_grammar_answer(exercise_id, answer)
+        )
 
     @keyword
     def validate_jwt_token(self, token: str) -> bool:
@@ -537,9 +963,10 @@ class WordmateAPI:
         """
         response_times = []
 
-        for i in range(iterations):
-            start_time = time.time()
-            end_time = time.time()
+        for i in range(int(iterations)):
+            start_time = time.perf_counter()
+            self.make_api_request(method, endpoint, data)
+            end_time = time.perf_counter()
 
             response_times.append(end_time - start_time)
 
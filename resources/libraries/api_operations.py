@@ -0,0 +1,50 @@
+"""
+WordMate API Operations
+
+Method, endpoint and body of the WordMate API calls user journeys are made
+of. The WordmateAPI keywords and the load engine both build their requests
+here, so a load test sends exactly what the functional suites send.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+# (method, endpoint relative to the API base URL, JSON body)
+Operation = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def _endpoint(name: str, **params: Any) -> str:
+    """Query string of an api.php endpoint, values URL-encoded"""
+    query = {"endpoint": name}
+    query.update({key: value for key, value in params.items() if value is not None})
+    return f"?{urlencode(query)}"
+
+
+def login(username: str, password: str) -> Operation:
+    return "POST", _endpoint("login"), {"username": username, "password": password}
+
+
+def user_profile() -> Operation:
+    return "GET", _endpoint("profile"), None
+
+
+def vocabulary_list(page: int = 1, limit: int = 50, search: str = None) -> Operation:
+    endpoint = _endpoint("vocabulario", page=page, limit=limit, search=search or None)
+    return "GET", endpoint, None
+
+
+def add_favorite(word_id: int) -> Operation:
+    return "POST", _endpoint("favoritos"), {"wordId": word_id}
+
+
+def remove_favorite(word_id: int) -> Operation:
+    return "DELETE", _endpoint("favoritos", wordId=word_id), None
+
+
+def grammar_exercises(category: str = None) -> Operation:
+    return "GET", _endpoint("grammarExercises", category=category or None), None
+
+
+def submit_grammar_answer(exercise_id: Any, answer: Any) -> Operation:
+    data = {"exerciseId": exercise_id, "answer": answer}
+    return "POST", _endpoint("grammarSubmit"), data
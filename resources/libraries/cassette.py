@@ -0,0 +1,370 @@
+"""
+WordMate API Cassettes
+
+Record/replay of API traffic. In record mode every request sent through a
+session of the shared session registry (WordmateAPI and the
+RequestsLibrary keywords using ``Ensure Session``) goes to the network as
+usual, and the request/response pair is appended to a cassette file. In
+replay mode responses are served from the cassettes and nothing touches
+the network, so the API suites run offline and in seconds, and the client
+and keyword layers can be benchmarked on their own.
+
+The mode comes from ``WORDMATE_API_MODE`` (``live``, ``record`` or
+``replay``) and the cassette directory from ``WORDMATE_CASSETTE_DIR``;
+run_tests.py sets both from ``--api-mode`` and ``--cassette-dir``. Each
+recording process writes its own ``<pid>.cassette``, so pabot workers
+never share a file; replay merges every cassette in the directory.
+
+Requests are matched by fingerprint: method, path and sorted query (not
+the host, so a cassette recorded on dev replays against any base URL),
+the JSON body with secrets redacted, and whether the request was
+authenticated. The nth identical request gets the nth recorded response,
+later ones the last. A request that was never recorded fails with
+``CassetteMissError``, a connection error, as it would without a server.
+
+Cassette layout::
+
+    record*  index  trailer
+
+Each record is a JSON header (status, headers, request summary) followed
+by the decoded body bytes. The index is JSON mapping fingerprints to the
+offsets of their records, and the trailer is ``MAGIC`` plus the index
+offset. Replay memory-maps the file and reads only the index; bodies are
+sliced out of the map when a response is served.
+
+Secrets are redacted before anything is written: credential headers are
+dropped, password fields replaced, and tokens in response bodies re-signed
+with ``SIGNING_KEY`` and a far-future expiry, so replayed logins still
+hand out tokens the suites can decode.
+"""
+
+import atexit
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from resources.libraries.compression import StreamDecoder
+from resources.libraries.request_log import (
+    REDACTED,
+    SENSITIVE_FIELDS,
+    SENSITIVE_HEADERS,
+    redact_body,
+)
+
+MODES = ("live", "record", "replay")
+DEFAULT_MODE = "live"
+DEFAULT_CASSETTE_DIR = Path(__file__).resolve().parent.parent.parent / "cassettes"
+CASSETTE_SUFFIX = ".cassette"
+MAGIC = b"WMCASS01"
+TRAILER = struct.Struct("<8sQ")
+SIGNING_KEY = "wordmate-cassette-replay-signing-key"
+# 2100-01-01T00:00:00Z
+FAR_FUTURE_EXP = 4102444800
+TOKEN_FIELDS = ("token",)
+# Headers describing the recorded connection or encoding, not the response
+DROPPED_HEADERS = SENSITIVE_HEADERS | {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Replayed request that is not in any cassette"""
+
+
+def api_mode() -> str:
+    """Mode of this process, from ``WORDMATE_API_MODE``"""
+    mode = os.environ.get("WORDMATE_API_MODE", DEFAULT_MODE).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"WORDMATE_API_MODE must be one of {', '.join(MODES)}")
+    return mode
+
+
+def cassette_dir() -> Path:
+    return Path(os.environ.get("WORDMATE_CASSETTE_DIR", DEFAULT_CASSETTE_DIR))
+
+
+def _json_body(body: Any) -> Any:
+    """Parsed JSON of a request or response body, None if it is not JSON"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+def fingerprint(method: str, url: str, headers: Any, body: Any) -> str:
+    """Key identical requests share, whatever the host and secrets"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    parsed = _json_body(body)
+    if parsed is not None:
+        canonical = json.dumps(redact_body(parsed), sort_keys=True)
+    elif body:
+        raw = body.encode() if isinstance(body, str) else body
+        canonical = hashlib.sha256(raw).hexdigest()
+    else:
+        canonical = ""
+    authenticated = bool(headers and headers.get("Authorization"))
+    key = "\n".join(
+        [method.upper(), parts.path or "/", query, canonical, str(authenticated)]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _scrub_token(value: Any) -> Any:
+    """Re-signed copy of a JWT with a far-future expiry, else ``REDACTED``"""
+    if not isinstance(value, str):
+        return REDACTED
+    try:
+        claims = jwt.decode(value, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return REDACTED
+    if "exp" in claims:
+        claims["exp"] = FAR_FUTURE_EXP
+    return jwt.encode(claims, SIGNING_KEY, algorithm="HS256")
+
+
+def scrub_response_body(body: Any) -> Any:
+    """Copy of a JSON response body that is safe to write to a cassette"""
+    if isinstance(body, dict):
+        scrubbed = {}
+        for key, value in body.items():
+            name = str(key).lower()
+            if any(field in name for field in TOKEN_FIELDS):
+                scrubbed[key] = _scrub_token(value)
+            elif any(field in name for field in SENSITIVE_FIELDS):
+                scrubbed[key] = REDACTED
+            else:
+                scrubbed[key] = scrub_response_body(value)
+        return scrubbed
+    if isinstance(body, list):
+        return [scrub_response_body(item) for item in body]
+    return body
+
+
+class CassetteWriter:
+    """Appends records to ``<pid>.cassette`` and writes the index at close"""
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{os.getpid()}{CASSETTE_SUFFIX}"
+        self._partial = self.path.with_suffix(CASSETTE_SUFFIX + ".partial")
+        self._file = open(self._partial, "wb")
+        self._index: Dict[str, List[List[int]]] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        atexit.register(self.close)
+
+    def record(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        reason: Optional[str],
+        headers: Any,
+        body: bytes,
+    ) -> None:
+        """Append one request/response pair"""
+        parsed = _json_body(body)
+        if parsed is not None:
+            body = json.dumps(scrub_response_body(parsed)).encode()
+        meta = json.dumps(
+            {
+                "request": {
+                    "method": request.method,
+                    "url": request.url,
+                    "body": redact_body(_json_body(request.body)),
+                },
+                "status": status,
+                "reason": reason,
+                "headers": {
+                    name: value
+                    for name, value in headers.items()
+                    if name.lower() not in DROPPED_HEADERS
+                },
+            }
+        ).encode()
+        key = fingerprint(request.method, request.url, request.headers, request.body)
+        with self._lock:
+            if self._file.closed:
+                return
+            offset = self._file.tell()
+            self._file.write(meta)
+            self._file.write(body)
+            self._index.setdefault(key, []).append([offset, len(meta), len(body)])
+            self.recorded += 1
+
+    def close(self) -> None:
+        """Write index and trailer and move the finished cassette in place"""
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            self._file.write(json.dumps(self._index).encode())
+            self._file.write(TRAILER.pack(MAGIC, index_offset))
+            self._file.close()
+            if self.recorded:
+                os.replace(self._partial, self.path)
+            else:
+                self._partial.unlink()
+
+
+class CassetteLibrary:
+    """Responses of every cassette in a directory, keyed by fingerprint"""
+
+    def __init__(self, directory: Path):
+        self._maps: List[mmap.mmap] = []
+        self._entries: Dict[str, List[Tuple[mmap.mmap, int, int, int]]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        for path in sorted(Path(directory).glob(f"*{CASSETTE_SUFFIX}")):
+            self._load(path)
+
+    def _load(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < TRAILER.size:
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset = TRAILER.unpack(mapped[-TRAILER.size :])
+        if magic != MAGIC:
+            mapped.close()
+            print(f"Skipping {path}: not a cassette")
+            return
+        index = json.loads(mapped[index_offset : -TRAILER.size])
+        for key, records in index.items():
+            self._entries.setdefault(key, []).extend(
+                (mapped, offset, meta_len, body_len)
+                for offset, meta_len, body_len in records
+            )
+        self._maps.append(mapped)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._entries.values())
+
+    def lookup(self, request: requests.PreparedRequest) -> Tuple[Dict, bytes]:
+        """``(header, body)`` of the recorded response to ``request``"""
+        key = fingerprint(request.method, request.url, request.headers, request.body)
+        with self._lock:
+            records = self._entries.get(key)
+            if not records:
+                self.misses += 1
+                raise CassetteMissError(
+                    f"No recorded response for {request.method} {request.url}"
+                )
+            occurrence = self._served.get(key, 0)
+            self._served[key] = occurrence + 1
+            self.hits += 1
+        mapped, offset, meta_len, body_len = records[min(occurrence, len(records) - 1)]
+        meta = json.loads(mapped[offset : offset + meta_len])
+        start = offset + meta_len
+        return meta, mapped[start : start + body_len]
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter recording to or replaying from cassettes"""
+
+    def __init__(
+        self,
+        mode: str,
+        writer: Optional[CassetteWriter] = None,
+        library: Optional[CassetteLibrary] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.writer = writer
+        self.library = library
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any):
+        if self.mode == "replay":
+            return self._replay(request)
+        response = super().send(request, **kwargs)
+        if self.mode == "record":
+            self._record(request, response)
+        return response
+
+    def _replay(self, request: requests.PreparedRequest) -> requests.Response:
+        meta, body = self.library.lookup(request)
+        headers = dict(meta["headers"], **{"Content-Length": str(len(body))})
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=meta["status"],
+            reason=meta.get("reason"),
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+    def _record(
+        self, request: requests.PreparedRequest, response: requests.Response
+    ) -> None:
+        raw = response.raw
+        wire = raw.read(decode_content=False)
+        raw.release_conn()
+        decoder = StreamDecoder(response.headers.get("Content-Encoding", ""))
+        body = decoder.decompress(wire) + decoder.flush()
+        self.writer.record(
+            request, response.status_code, response.reason, response.headers, body
+        )
+        # Hand the caller the bytes as they came off the wire
+        response.raw = HTTPResponse(
+            body=io.BytesIO(wire),
+            headers=raw.headers,
+            status=raw.status,
+            reason=raw.reason,
+            preload_content=False,
+            decode_content=False,
+        )
+
+
+_adapter_lock = threading.Lock()
+_state: Dict[str, Any] = {}
+
+
+def cassette_adapter(**adapter_kwargs: Any) -> Optional[CassetteAdapter]:
+    """Adapter for new sessions in record or replay mode, None when live
+
+    The cassette writer or library is created once per process and shared
+    by every adapter.
+    """
+    mode = api_mode()
+    if mode == "live":
+        return None
+    with _adapter_lock:
+        if mode == "record" and "writer" not in _state:
+            _state["writer"] = CassetteWriter(cassette_dir())
+        if mode == "replay" and "library" not in _state:
+            _state["library"] = CassetteLibrary(cassette_dir())
+    return CassetteAdapter(
+        mode, _state.get("writer"), _state.get("library"), **adapter_kwargs
+    )
+
+
+def cassette_stats() -> Dict[str, Any]:
+    """Mode and record/hit/miss counts of this process"""
+    stats: Dict[str, Any] = {"mode": api_mode(), "directory": str(cassette_dir())}
+    if "writer" in _state:
+        stats["recorded"] = _state["writer"].recorded
+    if "library" in _state:
+        library = _state["library"]
+        stats.update(responses=len(library), hits=library.hits, misses=library.misses)
+    return stats
@@ -0,0 +1,191 @@
+"""
+WordMate Circuit Breaker
+
+Client-side circuit breaker used by WordmateAPI. Requests are tracked per
+host and per API endpoint (the ``endpoint`` query parameter of api.php);
+when too many of them fail, further requests fail immediately instead of
+waiting through timeouts and retries.
+
+- closed: requests pass; outcomes are counted in a rolling time window.
+  Once the window holds at least ``min_requests`` calls and the failure
+  rate reaches ``failure_threshold``, the circuit opens.
+- open: requests fail fast with CircuitOpenError for ``open_seconds``.
+- half_open: one request at a time is let through as a probe. Success
+  closes the circuit, failure opens it again.
+
+State lives in a small JSON file guarded by a file lock, so all pabot
+processes of a run see the same circuits and stop together. run_tests.py
+gives each run its own file through ``WORDMATE_CIRCUIT_STATE_FILE``, so an
+open circuit does not carry over into the next run.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from resources.libraries.shared_state import locked_json_file
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_FILE_ENV = "WORDMATE_CIRCUIT_STATE_FILE"
+DEFAULT_STATE_FILE = Path(
+    os.getenv(
+        STATE_FILE_ENV,
+        Path(tempfile.gettempdir()) / "wordmate_circuit_breaker.json",
+    )
+)
+WINDOW_SECONDS = 120
+WINDOW_BUCKETS = 12
+FAILURE_THRESHOLD = 0.5
+MIN_REQUESTS = 5
+OPEN_SECONDS = 30
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while its circuit is open"""
+
+
+def circuit_keys(url: str) -> List[str]:
+    """Circuits a request to ``url`` counts towards: its host and endpoint"""
+    parts = urlsplit(url)
+    endpoint = parse_qs(parts.query).get("endpoint", [parts.path or "/"])[0]
+    return [parts.netloc, f"{parts.netloc} {endpoint}"]
+
+
+class CircuitBreaker:
+    """Per-host and per-endpoint circuits shared through a state file"""
+
+    def __init__(
+        self,
+        state_file: Path = DEFAULT_STATE_FILE,
+        window_seconds: float = WINDOW_SECONDS,
+        failure_threshold: float = FAILURE_THRESHOLD,
+        min_requests: int = MIN_REQUESTS,
+        open_seconds: float = OPEN_SECONDS,
+        on_transition: Optional[Callable[[str, str, str, str], None]] = None,
+    ):
+        """Create a breaker
+
+        Args:
+            state_file: JSON file shared by all processes of a run
+            window_seconds: Length of the rolling failure-rate window
+            failure_threshold: Failure rate (0-1) that opens a circuit
+            min_requests: Calls needed in the window before it can open
+            open_seconds: How long a circuit stays open before probing
+            on_transition: Called as ``(key, old_state, new_state, reason)``
+        """
+        self.state_file = Path(state_file)
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / WINDOW_BUCKETS
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.on_transition = on_transition
+
+    def _circuit(self, circuits: Dict[str, dict], key: str) -> dict:
+        return circuits.setdefault(
+            key, {"state": CLOSED, "opened_at": 0.0, "probe_until": 0.0, "buckets": {}}
+        )
+
+    def _transition(self, key: str, circuit: dict, state: str, reason: str) -> None:
+        old_state = circuit["state"]
+        circuit["state"] = state
+        if self.on_transition:
+            self.on_transition(key, old_state, state, reason)
+
+    def _window_counts(self, circuit: dict, now: float) -> List[int]:
+        """Drop expired buckets and return ``[calls, failures]`` in the window"""
+        oldest = int((now - self.window_seconds) // self.bucket_seconds)
+        buckets = {
+            bucket: counts
+            for bucket, counts in circuit["buckets"].items()
+            if int(bucket) > oldest
+        }
+        circuit["buckets"] = buckets
+        return [
+            sum(counts[0] for counts in buckets.values()),
+            sum(counts[1] for counts in buckets.values()),
+        ]
+
+    def before_request(self, keys: List[str]) -> None:
+        """Let a request through or raise CircuitOpenError
+
+        A half-open circuit hands out one probe at a time, leased for
+        ``open_seconds`` so a probe lost with its process is not waited
+        for forever.
+        """
+        now = time.time()
+        with locked_json_file(self.state_file) as circuits:
+            probes = []
+            for key in keys:
+                circuit = circuits.get(key)
+                if circuit is None or circuit["state"] == CLOSED:
+                    continue
+                if circuit["state"] == OPEN:
+                    retry_in = circuit["opened_at"] + self.open_seconds - now
+                    if retry_in > 0:
+                        raise CircuitOpenError(
+                            f"Circuit open for {key}, failing fast "
+                            f"(next probe in {retry_in:.0f}s)"
+                        )
+                elif circuit["probe_until"] > now:
+                    raise CircuitOpenError(
+                        f"Circuit half-open for {key}, waiting for a probe request"
+                    )
+                probes.append((key, circuit))
+
+            for key, circuit in probes:
+                if circuit["state"] == OPEN:
+                    self._transition(key, circuit, HALF_OPEN, "open period elapsed")
+                circuit["probe_until"] = now + self.open_seconds
+
+    def record(self, keys: List[str], success: bool) -> None:
+        """Count the outcome of a request and open or close circuits"""
+        now = time.time()
+        bucket = str(int(now // self.bucket_seconds))
+        with locked_json_file(self.state_file) as circuits:
+            for key in keys:
+                circuit = self._circuit(circuits, key)
+                counts = circuit["buckets"].setdefault(bucket, [0, 0])
+                counts[0] += 1
+                counts[1] += 0 if success else 1
+
+                if circuit["state"] == HALF_OPEN:
+                    circuit["probe_until"] = 0.0
+                    if success:
+                        circuit["buckets"] = {}
+                        self._transition(key, circuit, CLOSED, "probe succeeded")
+                    else:
+                        circuit["opened_at"] = now
+                        self._transition(key, circuit, OPEN, "probe failed")
+                elif circuit["state"] == CLOSED:
+                    calls, failures = self._window_counts(circuit, now)
+                    if (
+                        calls >= self.min_requests
+                        and failures / calls >= self.failure_threshold
+                    ):
+                        circuit["opened_at"] = now
+                        self._transition(
+                            key,
+                            circuit,
+                            OPEN,
+                            f"{failures}/{calls} requests failed "
+                            f"in the last {self.window_seconds:.0f}s",
+                        )
+
+    def reset(self) -> None:
+        """Close every circuit and forget all counts"""
+        with locked_json_file(self.state_file) as circuits:
+            circuits.clear()
+
+    def states(self) -> Dict[str, str]:
+        """Current state of every known circuit"""
+        with locked_json_file(self.state_file) as circuits:
+            return {key: circuit["state"] for key, circuit in circuits.items()}
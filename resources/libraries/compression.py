@@ -0,0 +1,196 @@
+"""
+WordMate Response Compression
+
+Content-Encoding negotiation and streaming decompression for WordmateAPI.
+gzip and deflate are always offered; brotli (``br``) and zstd only when
+the ``brotli``/``brotlicffi`` or ``zstandard`` package is installed.
+
+Responses are read without letting the HTTP client decode them, so the
+compressed bytes received can be counted, and every chunk is
+decompressed as it arrives instead of after the whole compressed body
+has been buffered.
+"""
+
+import zlib
+from typing import Any, List, Tuple
+
+import requests
+from urllib3.exceptions import HTTPError as Urllib3Error, ReadTimeoutError
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CHUNK_SIZE = 64 * 1024
+IDENTITY = "identity"
+
+
+def supported_encodings() -> List[str]:
+    """Content encodings this client can decode, best compression first"""
+    encodings = []
+    if ZSTD_AVAILABLE:
+        encodings.append("zstd")
+    if BROTLI_AVAILABLE:
+        encodings.append("br")
+    return encodings + ["gzip", "deflate"]
+
+
+def accept_encoding() -> str:
+    """``Accept-Encoding`` header value offering every supported encoding"""
+    return ", ".join(supported_encodings())
+
+
+class _DeflateDecoder:
+    """``deflate`` is sent both zlib-wrapped and raw; try wrapped first"""
+
+    def __init__(self):
+        self._obj = zlib.decompressobj()
+        self._pending = b""
+        self._detecting = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self._detecting:
+            return self._obj.decompress(data)
+        self._pending += data
+        try:
+            decoded = self._obj.decompress(data)
+        except zlib.error:
+            self._detecting = False
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            pending, self._pending = self._pending, b""
+            return self._obj.decompress(pending)
+        if decoded:
+            self._detecting = False
+            self._pending = b""
+        return decoded
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _GzipDecoder:
+    def __init__(self):
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        # brotli calls it process(), brotlicffi decompress()
+        self._decompress = getattr(self._obj, "decompress", None) or self._obj.process
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if hasattr(self._obj, "flush") else b""
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+_DECODERS = {"gzip": _GzipDecoder, "x-gzip": _GzipDecoder, "deflate": _DeflateDecoder}
+if BROTLI_AVAILABLE:
+    _DECODERS["br"] = _BrotliDecoder
+if ZSTD_AVAILABLE:
+    _DECODERS["zstd"] = _ZstdDecoder
+
+
+class StreamDecoder:
+    """Incremental decoder for a ``Content-Encoding`` header value"""
+
+    def __init__(self, content_encoding: str):
+        encodings = [
+            encoding.strip().lower()
+            for encoding in (content_encoding or "").split(",")
+            if encoding.strip() and encoding.strip().lower() != IDENTITY
+        ]
+        unsupported = [encoding for encoding in encodings if encoding not in _DECODERS]
+        if unsupported:
+            raise requests.exceptions.ContentDecodingError(
+                f"Unsupported Content-Encoding: {', '.join(unsupported)}"
+            )
+        self.encoding = ", ".join(encodings) or IDENTITY
+        # Encodings are listed in the order they were applied
+        self._decoders = [_DECODERS[encoding]() for encoding in reversed(encodings)]
+
+    def decompress(self, data: bytes) -> bytes:
+        try:
+            for decoder in self._decoders:
+                data = decoder.decompress(data)
+        except Exception as e:
+            raise requests.exceptions.ContentDecodingError(
+                f"Failed to decode {self.encoding} response: {e}"
+            ) from e
+        return data
+
+    def flush(self) -> bytes:
+        """Remaining output; each decoder's tail is fed through the next"""
+        data = b""
+        try:
+            for decoder in self._decoders:
+                data = decoder.decompress(data) + decoder.flush()
+        except Exception as e:
+            raise requests.exceptions.ContentDecodingError(
+                f"Failed to decode {self.encoding} response: {e}"
+            ) from e
+        return data
+
+
+def read_body(response: Any) -> Tuple[bytes, int, str]:
+    """Read a response body, returning ``(decoded, wire_bytes, encoding)``
+
+    ``requests`` responses must have been sent with ``stream=True``; they
+    are decoded chunk by chunk here and closed afterwards. ``httpx``
+    responses are already decoded while downloading and count the raw
+    bytes themselves. Wire bytes are the body as transferred, after
+    de-chunking and without headers.
+    """
+    encoding = response.headers.get("Content-Encoding", "") or IDENTITY
+    if hasattr(response, "num_bytes_downloaded"):
+        return response.content, response.num_bytes_downloaded, encoding.lower()
+
+    chunks = []
+    wire_bytes = 0
+    try:
+        decoder = StreamDecoder(encoding)
+        for chunk in response.raw.stream(CHUNK_SIZE, decode_content=False):
+            wire_bytes += len(chunk)
+            chunks.append(decoder.decompress(chunk))
+        chunks.append(decoder.flush())
+    except ReadTimeoutError as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except Urllib3Error as e:
+        raise requests.exceptions.ChunkedEncodingError(str(e)) from e
+    finally:
+        response.close()
+    return b"".join(chunks), wire_bytes, decoder.encoding
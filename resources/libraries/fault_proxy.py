@@ -0,0 +1,792 @@
+"""
+WordMate Fault-Injection Proxy
+
+Local HTTP proxy that degrades the traffic between a client (WordmateAPI,
+RequestsLibrary or a browser) and the real target. Each request is
+matched against an ordered list of rules, first match wins; a rule can
+add latency and jitter, cap the response bandwidth, reset the connection,
+or answer with a 429 or 5xx instead of forwarding, either at random or in
+bursts of consecutive failures.
+
+The proxy works in two ways at once:
+
+- Reverse proxy: requests with a plain path are forwarded to ``target``,
+  so ``http://127.0.0.1:<port>/dev/php/api.php`` stands in for the API.
+- Forward proxy: requests with an absolute URL go to that URL, and
+  ``CONNECT`` opens a tunnel, which is how browsers use ``--proxy-server``.
+  Tunnelled HTTPS is opaque, so only latency, bandwidth and resets apply,
+  matched against ``host:port``.
+
+Rules come from YAML scenario files (``config/fault_scenarios/``) and can
+be replaced while the proxy runs, from Python or through the control
+endpoints under ``/__proxy``.
+"""
+
+import asyncio
+import fnmatch
+import json
+import random
+import socket
+import ssl
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8888
+DEFAULT_SCENARIO_DIR = (
+    Path(__file__).resolve().parent.parent.parent / "config" / "fault_scenarios"
+)
+CONTROL_PREFIX = "/__proxy"
+READ_SIZE = 64 * 1024
+MAX_HEAD_SIZE = 64 * 1024
+UPSTREAM_TIMEOUT = 30
+# Idle upstream connections kept per (scheme, host, port)
+POOL_SIZE = 8
+# Bandwidth-limited bodies are written in slices of this many seconds
+THROTTLE_SLICE = 0.05
+HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+RULE_FIELDS = {
+    "name",
+    "match",
+    "methods",
+    "latency_ms",
+    "jitter_ms",
+    "bandwidth_kbps",
+    "reset_rate",
+    "error_rate",
+    "status",
+    "retry_after",
+    "burst",
+}
+
+
+class FaultRule:
+    """One entry of a scenario: which requests, and what goes wrong"""
+
+    def __init__(self, spec: Dict[str, Any], index: int = 0):
+        """Validate a rule from its scenario mapping
+
+        Args:
+            spec: Rule settings; ``match`` is a glob over the request path
+                and query (``host:port`` for tunnels), ``*`` by default
+            index: Position in the scenario, used for the default name
+        """
+        unknown = set(spec) - RULE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown fault rule settings: {sorted(unknown)}")
+
+        self.match = str(spec.get("match", "*"))
+        self.name = str(spec.get("name") or f"rule {index + 1} ({self.match})")
+        self.methods = {m.upper() for m in spec.get("methods") or []}
+        self.latency_ms = float(spec.get("latency_ms", 0))
+        self.jitter_ms = float(spec.get("jitter_ms", 0))
+        self.bandwidth_kbps = float(spec.get("bandwidth_kbps", 0))
+        self.reset_rate = float(spec.get("reset_rate", 0))
+        self.error_rate = float(spec.get("error_rate", 0))
+        self.status = int(spec.get("status", 503))
+        self.retry_after = spec.get("retry_after")
+        burst = spec.get("burst") or {}
+        self.burst_every = int(burst.get("every", 0))
+        self.burst_length = int(burst.get("length", 0))
+
+        for rate in (self.reset_rate, self.error_rate):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{self.name}: rates must be between 0 and 1")
+        if self.burst_every and not 0 < self.burst_length <= self.burst_every:
+            raise ValueError(f"{self.name}: burst length must be 1..every")
+        if not 400 <= self.status <= 599:
+            raise ValueError(f"{self.name}: injected status must be 4xx or 5xx")
+
+        self.seen = 0
+
+    def matches(self, method: str, target: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return fnmatch.fnmatchcase(target, self.match)
+
+    def delay(self, rng: random.Random) -> float:
+        """Seconds to hold the request: latency plus uniform jitter"""
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def injected_status(self, rng: random.Random) -> Optional[int]:
+        """Status to answer with instead of forwarding, if any
+
+        Bursts fail the first ``length`` of every ``every`` matching
+        requests; ``error_rate`` fails the rest at random.
+        """
+        position = self.seen
+        self.seen += 1
+        if self.burst_every and position % self.burst_every < self.burst_length:
+            return self.status
+        if self.error_rate and rng.random() < self.error_rate:
+            return self.status
+        return None
+
+    def as_dict(self) -> Dict[str, Any]:
+        spec = {
+            "name": self.name,
+            "match": self.match,
+            "methods": sorted(self.methods),
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "bandwidth_kbps": self.bandwidth_kbps,
+            "reset_rate": self.reset_rate,
+            "error_rate": self.error_rate,
+            "status": self.status,
+            "retry_after": self.retry_after,
+        }
+        if self.burst_every:
+            spec["burst"] = {"every": self.burst_every, "length": self.burst_length}
+        return spec
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Read a scenario file; bare names are looked up in config/fault_scenarios
+
+    A scenario has an optional ``name``, ``description``, ``target`` and
+    ``seed``, and a ``rules`` list.
+    """
+    scenario_path = Path(path)
+    if not scenario_path.exists() and not scenario_path.suffix:
+        scenario_path = DEFAULT_SCENARIO_DIR / f"{path}.yaml"
+    with open(scenario_path, "r", encoding="utf-8") as f:
+        scenario = yaml.safe_load(f) or {}
+    if not isinstance(scenario.get("rules", []), list):
+        raise ValueError(f"{scenario_path}: 'rules' must be a list")
+    scenario.setdefault("name", scenario_path.stem)
+    return scenario
+
+
+def _reset(writer: asyncio.StreamWriter) -> None:
+    """Close with an RST instead of a FIN, like a dropped connection"""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    writer.transport.abort()
+
+
+def _parse_head(head: bytes) -> Tuple[str, List[Tuple[str, str]]]:
+    """First line and header list of a request or response head"""
+    lines = head.decode("latin-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+def _header(headers: List[Tuple[str, str]], name: str) -> str:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return ""
+
+
+def _connection_tokens(headers: List[Tuple[str, str]]) -> set:
+    return {
+        token.strip().lower() for token in _header(headers, "connection").split(",")
+    }
+
+
+async def _read_chunked(reader: asyncio.StreamReader):
+    """Yield the raw chunked encoding of a body, framing included"""
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if size == 0:
+            trailer = size_line
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                trailer += line
+                if line == b"\r\n":
+                    yield trailer
+                    return
+        yield size_line + await reader.readexactly(size + 2)
+
+
+def _dechunk(raw: bytes) -> bytes:
+    """Body of a complete chunked encoding"""
+    body = bytearray()
+    while raw:
+        size_line, _, raw = raw.partition(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if size == 0:
+            break
+        body += raw[:size]
+        raw = raw[size + 2 :]
+    return bytes(body)
+
+
+async def _read_length(reader: asyncio.StreamReader, length: int):
+    while length > 0:
+        chunk = await reader.read(min(READ_SIZE, length))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b"", length)
+        length -= len(chunk)
+        yield chunk
+
+
+async def _read_to_eof(reader: asyncio.StreamReader):
+    while True:
+        chunk = await reader.read(READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Upstream:
+    """An open connection to the target, reusable while framing allows"""
+
+    def __init__(self, key: Tuple[str, str, int], reader, writer):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+
+class FaultInjectionProxy:
+    """Asyncio proxy server applying fault rules, run on its own thread"""
+
+    def __init__(
+        self,
+        target: str = None,
+        rules: List[Dict[str, Any]] = None,
+        seed: int = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        verbose: bool = False,
+    ):
+        """Prepare the proxy; nothing listens until ``start``
+
+        Args:
+            target: Origin plain-path requests are forwarded to, e.g.
+                ``https://www.wordmate.es``; without it only forward-proxy
+                requests are served
+            rules: Fault rules, see ``FaultRule``
+            seed: Seed of the random faults, for repeatable runs
+            host: Listen address
+            port: Listen port; 0 picks a free one
+            verbose: Print one line per request
+        """
+        self.target = self._origin(target) if target else None
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.scenario_name = None
+        self._rng = random.Random(seed)
+        self._rules: List[FaultRule] = []
+        self._lock = threading.Lock()
+        self._pool: Dict[Tuple[str, str, int], List[_Upstream]] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset_stats()
+        self.set_rules(rules or [])
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"Proxy target must be an http(s) URL: {url}")
+        return f"{parts.scheme}://{parts.netloc}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def proxied_url(self, url: str) -> str:
+        """``url`` on the target, as reached through the proxy"""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.url}{parts.path}{query}"
+
+    def set_rules(self, rules: List[Dict[str, Any]]) -> None:
+        """Replace the rules; requests already in flight keep their rule"""
+        compiled = [FaultRule(spec, i) for i, spec in enumerate(rules)]
+        with self._lock:
+            self._rules = compiled
+            for rule in compiled:
+                self._rule_stats(rule)
+
+    def add_rule(self, spec: Dict[str, Any], first: bool = True) -> None:
+        """Add one rule, by default ahead of the existing ones"""
+        rule = FaultRule(spec, len(self._rules))
+        with self._lock:
+            self._rules = [rule] + self._rules if first else self._rules + [rule]
+            self._rule_stats(rule)
+
+    def load_scenario(self, scenario: Dict[str, Any], seed: int = None) -> None:
+        """Apply a scenario mapping as returned by ``load_scenario``
+
+        The random faults are reseeded with ``seed``, else the scenario's.
+        """
+        self.set_rules(scenario.get("rules") or [])
+        self.scenario_name = scenario.get("name")
+        if seed is None:
+            seed = scenario.get("seed")
+        if seed is not None:
+            self._rng.seed(seed)
+        if scenario.get("target") and not self.target:
+            self.target = self._origin(scenario["target"])
+
+    def rules(self) -> List[Dict[str, Any]]:
+        return [rule.as_dict() for rule in self._rules]
+
+    @staticmethod
+    def _rule_counters() -> Dict[str, Any]:
+        return {
+            "requests": 0,
+            "delayed": 0,
+            "delay_seconds": 0.0,
+            "throttled": 0,
+            "resets": 0,
+            "injected": {},
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {
+                "requests": 0,
+                "forwarded": 0,
+                "tunnels": 0,
+                "upstream_errors": 0,
+                "connections_reused": 0,
+                "rules": {},
+            }
+            for rule in self._rules:
+                rule.seen = 0
+                self._stats["rules"][rule.name] = self._rule_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the whole proxy and of each rule"""
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _rule_stats(self, rule: FaultRule) -> Dict[str, Any]:
+        # A rule replaced while its request was in flight still counts
+        return self._stats["rules"].setdefault(rule.name, self._rule_counters())
+
+    def _count(self, rule: Optional[FaultRule], field: str, amount: float = 1) -> None:
+        with self._lock:
+            if rule is None:
+                self._stats[field] += amount
+            else:
+                self._rule_stats(rule)[field] += amount
+
+    def _match(self, method: str, target: str) -> Optional[FaultRule]:
+        for rule in self._rules:
+            if rule.matches(method, target):
+                self._count(rule, "requests")
+                return rule
+        return None
+
+    def start(self, timeout: float = 10) -> str:
+        """Listen on a background thread; returns the proxy URL"""
+        if self._thread and self._thread.is_alive():
+            return self.url
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(
+                        self._handle_client, self.host, self.port, limit=MAX_HEAD_SIZE
+                    )
+                )
+            except OSError as e:
+                errors.append(e)
+                started.set()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            self._loop.run_forever()
+            self._server.close()
+            # Client connections still open, e.g. idle keep-alives
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(
+            target=run, name="wordmate-fault-proxy", daemon=True
+        )
+        self._thread.start()
+        started.wait(timeout)
+        if errors:
+            raise errors[0]
+        return self.url
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop listening and drop pooled upstream connections"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._loop.call_soon_threadsafe(self._close_pool)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+    def _close_pool(self) -> None:
+        for connections in self._pool.values():
+            for upstream in connections:
+                upstream.writer.close()
+        self._pool.clear()
+
+    def serve_forever(self) -> None:
+        """Run in the calling thread until interrupted"""
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                request_line, headers = _parse_head(head[:-4])
+                method, target, _ = request_line.split(" ", 2)
+
+                if method == "CONNECT":
+                    await self._tunnel(target, reader, writer)
+                    return
+
+                # Bodies are forwarded with a Content-Length
+                if _header(headers, "transfer-encoding").lower() == "chunked":
+                    body = _dechunk(b"".join([c async for c in _read_chunked(reader)]))
+                else:
+                    length = int(_header(headers, "content-length") or 0)
+                    body = await reader.readexactly(length)
+
+                keep_alive = "close" not in _connection_tokens(headers)
+                if target.startswith(CONTROL_PREFIX):
+                    await self._control(method, target, body, writer)
+                elif not await self._proxy(method, target, headers, body, writer):
+                    return
+                if not keep_alive:
+                    return
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            asyncio.CancelledError,  # proxy stopping
+        ):
+            pass
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        extra_headers: Dict[str, str] = None,
+    ) -> None:
+        body = json.dumps(payload).encode()
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _control(
+        self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        """``GET stats|rules``, ``PUT scenario`` (YAML or JSON), ``DELETE rules``"""
+        action = urlsplit(target).path[len(CONTROL_PREFIX) :].strip("/")
+        try:
+            if method == "GET" and action == "stats":
+                return await self._respond(writer, 200, self.stats())
+            if method == "GET" and action == "rules":
+                return await self._respond(writer, 200, {"rules": self.rules()})
+            if method == "PUT" and action == "scenario":
+                self.load_scenario(yaml.safe_load(body.decode("utf-8")) or {})
+                return await self._respond(writer, 200, {"rules": self.rules()})
+            if method == "DELETE" and action == "rules":
+                self.set_rules([])
+                return await self._respond(writer, 200, {"rules": []})
+            if method == "DELETE" and action == "stats":
+                self.reset_stats()
+                return await self._respond(writer, 200, self.stats())
+        except (ValueError, yaml.YAMLError) as e:
+            return await self._respond(writer, 400, {"error": str(e)})
+        await self._respond(
+            writer, 404, {"error": f"Unknown control {method} {action}"}
+        )
+
+    async def _apply_faults(
+        self, rule: Optional[FaultRule], writer: asyncio.StreamWriter
+    ) -> bool:
+        """Reset or delay per the rule; False when the connection was reset"""
+        if rule is None:
+            return True
+        if rule.reset_rate and self._rng.random() < rule.reset_rate:
+            self._count(rule, "resets")
+            _reset(writer)
+            return False
+        delay = rule.delay(self._rng)
+        if delay:
+            self._count(rule, "delayed")
+            self._count(rule, "delay_seconds", delay)
+            await asyncio.sleep(delay)
+        return True
+
+    async def _proxy(
+        self,
+        method: str,
+        target: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """Serve one request; False when the client connection must close"""
+        self._count(None, "requests")
+        if target.startswith("/"):
+            if not self.target:
+                await self._respond(writer, 502, {"error": "Proxy has no target"})
+                return True
+            url = self.target + target
+        else:
+            url = target
+        parts = urlsplit(url)
+        match_target = parts.path + (f"?{parts.query}" if parts.query else "")
+        rule = self._match(method, match_target)
+        if self.verbose:
+            print(f"{method} {url} -> {rule.name if rule else 'no rule'}")
+
+        if not await self._apply_faults(rule, writer):
+            return False
+        status = rule.injected_status(self._rng) if rule else None
+        if status:
+            with self._lock:
+                injected = self._rule_stats(rule)["injected"]
+                injected[str(status)] = injected.get(str(status), 0) + 1
+            extra = {}
+            if rule.retry_after is not None:
+                extra["Retry-After"] = str(rule.retry_after)
+            message = f"Injected by fault proxy ({rule.name})"
+            await self._respond(
+                writer, status, {"status": "error", "message": message}, extra
+            )
+            return True
+
+        try:
+            return await self._forward(method, parts, headers, body, writer, rule)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+            self._count(None, "upstream_errors")
+            if self.verbose:
+                print(f"   upstream error: {e!r}")
+            await self._respond(writer, 502, {"error": f"Upstream error: {e!r}"})
+            return True
+
+    async def _open(self, scheme: str, host: str, port: int) -> _Upstream:
+        key = (scheme, host, port)
+        idle = self._pool.get(key)
+        while idle:
+            upstream = idle.pop()
+            if not upstream.reader.at_eof() and not upstream.writer.is_closing():
+                upstream.reused = True
+                self._count(None, "connections_reused")
+                return upstream
+            upstream.writer.close()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host,
+                port,
+                ssl=self._ssl_context if scheme == "https" else None,
+                limit=MAX_HEAD_SIZE,
+            ),
+            UPSTREAM_TIMEOUT,
+        )
+        return _Upstream(key, reader, writer)
+
+    def _release(self, upstream: _Upstream) -> None:
+        idle = self._pool.setdefault(upstream.key, [])
+        if len(idle) < POOL_SIZE:
+            idle.append(upstream)
+        else:
+            upstream.writer.close()
+
+    async def _forward(
+        self,
+        method: str,
+        parts,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        writer: asyncio.StreamWriter,
+        rule: Optional[FaultRule],
+    ) -> bool:
+        scheme = parts.scheme or "http"
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        dropped = _connection_tokens(headers) | HOP_BY_HOP | {"host", "content-length"}
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{k}: {v}" for k, v in headers if k.lower() not in dropped]
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        upstream = await self._open(scheme, host, port)
+        try:
+            upstream.writer.write(request)
+            await upstream.writer.drain()
+            head = await asyncio.wait_for(
+                upstream.reader.readuntil(b"\r\n\r\n"), UPSTREAM_TIMEOUT
+            )
+        except (OSError, asyncio.IncompleteReadError):
+            upstream.writer.close()
+            if not upstream.reused:
+                raise
+            # A pooled connection the target had already closed; try afresh
+            upstream = await self._open(scheme, host, port)
+            upstream.writer.write(request)
+            await upstream.writer.drain()
+            head = await asyncio.wait_for(
+                upstream.reader.readuntil(b"\r\n\r\n"), UPSTREAM_TIMEOUT
+            )
+        self._count(None, "forwarded")
+
+        status_line, response_headers = _parse_head(head[:-4])
+        status = int(status_line.split(" ", 2)[1])
+        framing = _header(response_headers, "transfer-encoding").lower()
+        length = _header(response_headers, "content-length")
+        upstream_closes = "close" in _connection_tokens(response_headers)
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            chunks = None
+        elif "chunked" in framing:
+            chunks = _read_chunked(upstream.reader)
+        elif length:
+            chunks = _read_length(upstream.reader, int(length))
+        else:
+            chunks = _read_to_eof(upstream.reader)
+            upstream_closes = True
+        # Without a length or chunking the client can only see the end at EOF
+        keep_client = bool(chunks is None or "chunked" in framing or length)
+
+        dropped = _connection_tokens(response_headers) | HOP_BY_HOP
+        out = [status_line]
+        out += [f"{k}: {v}" for k, v in response_headers if k.lower() not in dropped]
+        if "chunked" in framing:
+            out.append("Transfer-Encoding: chunked")
+        out.append("Connection: " + ("keep-alive" if keep_client else "close"))
+        writer.write(("\r\n".join(out) + "\r\n\r\n").encode("latin-1"))
+
+        if chunks is not None:
+            rate = rule.bandwidth_kbps * 125 if rule and rule.bandwidth_kbps else 0
+            if rate:
+                self._count(rule, "throttled")
+            try:
+                await self._relay(chunks, writer, rate)
+            except (OSError, asyncio.IncompleteReadError):
+                # The head is out, so the client can only see a broken body
+                self._count(None, "upstream_errors")
+                upstream.writer.close()
+                writer.transport.abort()
+                return False
+        await writer.drain()
+
+        if upstream_closes:
+            upstream.writer.close()
+        else:
+            self._release(upstream)
+        return keep_client
+
+    async def _relay(self, chunks, writer: asyncio.StreamWriter, rate: float) -> None:
+        """Copy body pieces to the client, at most ``rate`` bytes per second"""
+        started = time.monotonic()
+        sent = 0
+        async for chunk in chunks:
+            if not rate:
+                writer.write(chunk)
+                await writer.drain()
+                continue
+            step = max(1, int(rate * THROTTLE_SLICE))
+            for offset in range(0, len(chunk), step):
+                piece = chunk[offset : offset + step]
+                writer.write(piece)
+                await writer.drain()
+                sent += len(piece)
+                ahead = sent / rate - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+    async def _tunnel(
+        self, target: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """CONNECT: pipe bytes both ways with the tunnel-level faults"""
+        self._count(None, "tunnels")
+        rule = self._match("CONNECT", target)
+        if not await self._apply_faults(rule, writer):
+            return
+        host, _, port = target.rpartition(":")
+        try:
+            up_reader, up_writer = await asyncio.wait_for(
+                asyncio.open_connection(host.strip("[]"), int(port)), UPSTREAM_TIMEOUT
+            )
+        except (OSError, ValueError, asyncio.TimeoutError):
+            self._count(None, "upstream_errors")
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            return
+        writer.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+        await writer.drain()
+
+        rate = rule.bandwidth_kbps * 125 if rule and rule.bandwidth_kbps else 0
+        if rate:
+            self._count(rule, "throttled")
+
+        async def pipe(source, sink, throttle: float) -> None:
+            try:
+                await self._relay(_read_to_eof(source), sink, throttle)
+            except ConnectionError:
+                pass
+            finally:
+                if not sink.is_closing():
+                    sink.close()
+
+        await asyncio.gather(pipe(reader, up_writer, 0), pipe(up_reader, writer, rate))
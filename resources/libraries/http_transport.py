@@ -0,0 +1,104 @@
+"""
+WordMate HTTP Transports
+
+Transports WordmateAPI can send its requests through, selected with
+``api.transport`` in the environment config:
+
+- ``http1`` (default): the library's ``requests`` session, one pooled
+  HTTP/1.1 connection per concurrent request.
+- ``http2``: an ``httpx`` client that multiplexes concurrent requests as
+  streams over a single HTTP/2 connection, negotiated through TLS ALPN
+  (servers without HTTP/2 are spoken to over HTTP/1.1). Requires
+  ``pip install httpx[http2]``.
+- ``h2c``: HTTP/2 with prior knowledge over plain ``http://``, for local
+  servers such as ``scripts/http2_stub_server.py``.
+
+Only the ``requests`` session retries 5xx answers at the connection
+level; with the HTTP/2 transports those are left to the circuit breaker.
+
+Both are called like ``requests.Session.request`` and raise ``requests``
+exceptions, so callers do not need to know which one is in use.
+"""
+
+from typing import Any, Dict, Optional
+
+import requests
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+TRANSPORTS = ("http1", "http2", "h2c")
+# Attempts httpx makes to establish a connection before giving up
+CONNECT_RETRIES = 3
+
+
+class Http2Transport:
+    """``requests``-compatible wrapper around an HTTP/2 ``httpx`` client"""
+
+    def __init__(self, timeout: float = 30, prior_knowledge: bool = False):
+        """Create the client
+
+        Args:
+            timeout: Default timeout for requests
+            prior_knowledge: Speak HTTP/2 to ``http://`` URLs without
+                upgrading (h2c), as the local stand-in server expects
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError(
+                "HTTP/2 transport requires httpx: pip install 'httpx[http2]'"
+            )
+        self.client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(
+                http1=not prior_knowledge, http2=True, retries=CONNECT_RETRIES
+            ),
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> "httpx.Response":
+        """Send a request; errors are raised as their ``requests`` counterparts
+
+        ``stream`` and other ``requests`` options are accepted and ignored:
+        the body is read in full, decoded while it downloads.
+        """
+        try:
+            return self.client.request(
+                method,
+                url,
+                json=json,
+                headers=dict(headers or {}),
+                timeout=timeout if timeout is not None else self.client.timeout,
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_transport(name: str, session: requests.Session, timeout: float = 30) -> Any:
+    """Return the transport called ``name``; ``http1`` is ``session`` itself"""
+    name = (name or "http1").lower()
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown API transport '{name}', use one of {TRANSPORTS}")
+    if name == "http1":
+        return session
+    return Http2Transport(timeout=timeout, prior_knowledge=name == "h2c")
@@ -0,0 +1,723 @@
+"""
+WordMate Load Engine
+
+Scenario-based load tests built from the same API operations as the
+WordmateAPI keywords. A scenario (``config/load_scenarios/*.yaml``) lists
+weighted user journeys, e.g. log in, browse vocabulario, add favorites,
+submit grammar answers, and a load profile: virtual users ramped up
+linearly, held steady, then ramped down.
+
+Each virtual user is an asyncio task with its own keep-alive HTTP/1.1
+connection and its own credentials from ``performance_users`` in
+config/test_data/users.yaml, so thousands of them run in one process.
+A user picks a journey by weight, runs its steps with think time in
+between, and starts over until the profile no longer needs it; a failed
+step ends the journey.
+
+Results hold a latency histogram per step and per journey, throughput
+over the whole run and the steady phase, a per-second timeline, and the
+outcome of the scenario's thresholds. ``LoadTest.py`` writes them next to
+``output.xml`` as ``load_results_*.json`` for the consolidated report.
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import os
+import random
+import ssl
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+from resources.libraries import api_operations
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+DEFAULT_SCENARIO_DIR = project_root / "config" / "load_scenarios"
+USERS_FILE = project_root / "config" / "test_data" / "users.yaml"
+RESULTS_FILE_PREFIX = "load_results_"
+RESULTS_SCHEMA_VERSION = 1
+REQUEST_TIMEOUT = 30
+# Seconds running users get to finish their step once the profile ends
+STOP_GRACE = 10
+SCHEDULER_TICK = 0.1
+# Histogram buckets grow by 5% from 0.1 ms to 2 minutes, so percentiles
+# are reported at most 5% high
+BUCKET_GROWTH = 1.05
+BUCKET_BOUNDS_MS = tuple(
+    0.1 * BUCKET_GROWTH**i
+    for i in range(math.ceil(math.log(120_000 / 0.1, BUCKET_GROWTH)) + 1)
+)
+PERCENTILES = (50, 90, 95, 99)
+THRESHOLD_METRICS = {"p50_ms", "p90_ms", "p95_ms", "p99_ms", "mean_ms", "error_rate"}
+
+
+class StepHistogram:
+    """Latencies of one step, in log-spaced buckets, plus failures"""
+
+    __slots__ = ("counts", "samples", "failures", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.samples = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float, ok: bool = True) -> None:
+        self.samples += 1
+        if not ok:
+            self.failures += 1
+            return
+        if elapsed_ms <= BUCKET_BOUNDS_MS[0]:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log(elapsed_ms / BUCKET_BOUNDS_MS[0], BUCKET_GROWTH)),
+                len(BUCKET_BOUNDS_MS) - 1,
+            )
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_ms += elapsed_ms
+        self.min_ms = min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound of the bucket holding the percentile, capped at the max"""
+        successes = self.samples - self.failures
+        if not successes:
+            return None
+        rank = math.ceil(successes * percent / 100)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(BUCKET_BOUNDS_MS[index], self.max_ms)
+        return self.max_ms
+
+    def to_dict(self, seconds: float) -> Dict[str, Any]:
+        """Summary with throughput over ``seconds``"""
+        successes = self.samples - self.failures
+        error_rate = 100 * self.failures / self.samples if self.samples else 0.0
+        summary = {
+            "requests": self.samples,
+            "failures": self.failures,
+            "error_rate": round(error_rate, 2),
+            "throughput": round(self.samples / seconds, 2) if seconds else 0.0,
+            "mean_ms": round(self.total_ms / successes, 1) if successes else None,
+            "min_ms": round(self.min_ms, 1) if successes else None,
+            "max_ms": round(self.max_ms, 1),
+        }
+        for percent in PERCENTILES:
+            value = self.percentile(percent)
+            summary[f"p{percent}_ms"] = round(value, 1) if value is not None else None
+        # Bucket upper bound (ms) -> count, for plotting
+        summary["histogram"] = {
+            f"{BUCKET_BOUNDS_MS[index]:.1f}": count
+            for index, count in sorted(self.counts.items())
+        }
+        return summary
+
+
+class LoadProfile:
+    """Virtual users over time: linear ramp up, steady, linear ramp down"""
+
+    def __init__(
+        self,
+        users: int,
+        ramp_up_s: float = 0,
+        steady_s: float = 60,
+        ramp_down_s: float = 0,
+    ):
+        if users < 1:
+            raise ValueError("A load profile needs at least one user")
+        self.users = int(users)
+        self.ramp_up_s = float(ramp_up_s)
+        self.steady_s = float(steady_s)
+        self.ramp_down_s = float(ramp_down_s)
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "LoadProfile":
+        return cls(
+            users=int(spec.get("users", 10)),
+            ramp_up_s=spec.get("ramp_up_s", 0),
+            steady_s=spec.get("steady_s", 60),
+            ramp_down_s=spec.get("ramp_down_s", 0),
+        )
+
+    @property
+    def duration(self) -> float:
+        return self.ramp_up_s + self.steady_s + self.ramp_down_s
+
+    def phase(self, elapsed: float) -> str:
+        if elapsed < self.ramp_up_s:
+            return "ramp_up"
+        if elapsed < self.ramp_up_s + self.steady_s:
+            return "steady"
+        return "ramp_down"
+
+    def target_users(self, elapsed: float) -> int:
+        if elapsed >= self.duration:
+            return 0
+        if elapsed < self.ramp_up_s:
+            return max(1, math.ceil(self.users * elapsed / self.ramp_up_s))
+        down_from = self.ramp_up_s + self.steady_s
+        if elapsed < down_from:
+            return self.users
+        left = 1 - (elapsed - down_from) / self.ramp_down_s
+        return math.ceil(self.users * left)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "users": self.users,
+            "ramp_up_s": self.ramp_up_s,
+            "steady_s": self.steady_s,
+            "ramp_down_s": self.ramp_down_s,
+        }
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Read and check a scenario file; bare names come from config/load_scenarios"""
+    scenario_path = Path(path)
+    if not scenario_path.exists() and not scenario_path.suffix:
+        scenario_path = DEFAULT_SCENARIO_DIR / f"{path}.yaml"
+    with open(scenario_path, "r", encoding="utf-8") as f:
+        scenario = yaml.safe_load(f) or {}
+    scenario.setdefault("name", scenario_path.stem)
+
+    journeys = scenario.get("journeys") or []
+    if not journeys:
+        raise ValueError(f"{scenario_path}: scenario has no journeys")
+    for journey in journeys:
+        journey["steps"] = [_step_spec(step) for step in journey.get("steps") or []]
+        if not journey["steps"]:
+            raise ValueError(f"{scenario_path}: journey {journey.get('name')} is empty")
+    for step, limits in (scenario.get("thresholds") or {}).items():
+        unknown = set(limits) - THRESHOLD_METRICS
+        if unknown:
+            raise ValueError(f"{scenario_path}: unknown thresholds {sorted(unknown)}")
+    return scenario
+
+
+def _step_spec(step: Any) -> Dict[str, Any]:
+    spec = {"step": step} if isinstance(step, str) else dict(step)
+    if spec.get("step") not in STEPS:
+        raise ValueError(
+            f"Unknown load test step {spec.get('step')!r}; one of {sorted(STEPS)}"
+        )
+    spec["repeat"] = int(spec.get("repeat", 1))
+    return spec
+
+
+def load_credentials(users_file: Path = USERS_FILE) -> List[Tuple[str, str]]:
+    """Credentials virtual users take in turn: the load test users"""
+    with open(users_file, "r", encoding="utf-8") as f:
+        users = yaml.safe_load(f) or {}
+    accounts = (users.get("performance_users") or {}).get("load_test_users") or []
+    return [(account["username"], account["password"]) for account in accounts]
+
+
+def raise_open_file_limit(wanted: int) -> int:
+    """Let the process hold one socket per virtual user; returns the limit"""
+    if resource is None:
+        return wanted
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        new_soft = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+        return new_soft
+    return soft
+
+
+class ApiConnection:
+    """One virtual user's keep-alive HTTP/1.1 connection to the API"""
+
+    def __init__(self, base_url: str, timeout: float = REQUEST_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.netloc = parts.netloc
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.token: Optional[str] = None
+        self._ssl = ssl.create_default_context() if self.https else None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(
+        self, method: str, endpoint: str, data: Dict[str, Any] = None
+    ) -> Tuple[int, Any]:
+        """Send one request; returns the status and the decoded JSON body"""
+        body = json.dumps(data).encode() if data is not None else b""
+        head = [
+            f"{method} {self.path}{endpoint} HTTP/1.1",
+            f"Host: {self.netloc}",
+            "Accept: application/json",
+            "Accept-Encoding: gzip, deflate",
+            "User-Agent: wordmate-load-engine",
+        ]
+        if self.token:
+            head.append(f"Authorization: Bearer {self.token}")
+        if data is not None:
+            head.append("Content-Type: application/json")
+        if data is not None or method in ("POST", "PUT", "PATCH"):
+            head.append(f"Content-Length: {len(body)}")
+        message = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        reused = self._writer is not None
+        try:
+            return await asyncio.wait_for(self._exchange(message), self.timeout)
+        except (OSError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+        # The server had closed the idle connection; once more on a new one
+        return await asyncio.wait_for(self._exchange(message), self.timeout)
+
+    async def _exchange(self, message: bytes) -> Tuple[int, Any]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self._ssl
+            )
+        self._writer.write(message)
+        await self._writer.drain()
+
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raw = await self._read_chunked()
+        elif "content-length" in headers:
+            raw = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            raw = await self._reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            raw = gzip.decompress(raw)
+        elif encoding == "deflate":
+            raw = zlib.decompress(raw)
+        try:
+            return status, json.loads(raw) if raw else None
+        except ValueError:
+            return status, None
+
+    async def _read_chunked(self) -> bytes:
+        body = bytearray()
+        while True:
+            size_line = await self._reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0], 16)
+            if size == 0:
+                while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return bytes(body)
+            body += (await self._reader.readexactly(size + 2))[:-2]
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class StepFailed(Exception):
+    """A step got an error status or an unusable answer"""
+
+
+class VirtualUser:
+    """State one simulated user carries from step to step"""
+
+    def __init__(
+        self,
+        engine: "LoadEngine",
+        user_id: int,
+        credentials: Tuple[str, str],
+    ):
+        self.engine = engine
+        self.user_id = user_id
+        self.username, self.password = credentials
+        self.rng = random.Random(engine.seed * 100_003 + user_id)
+        self.connection = ApiConnection(engine.base_url, engine.request_timeout)
+        self.stopping = False
+        self.words: List[Any] = []
+        self.total_pages = 1
+        self.favorites: List[Any] = []
+        self.exercises: List[Dict[str, Any]] = []
+
+    async def call(
+        self, step: str, operation: api_operations.Operation, accept: tuple = ()
+    ) -> Any:
+        """Time one request of ``step``; error statuses not in ``accept`` raise"""
+        method, endpoint, data = operation
+        started = time.perf_counter()
+        try:
+            status, body = await self.connection.request(method, endpoint, data)
+        except (
+            OSError,
+            ValueError,
+            zlib.error,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            asyncio.TimeoutError,
+        ) as e:
+            self.engine.record(step, time.perf_counter() - started, type(e).__name__)
+            raise StepFailed(type(e).__name__) from e
+        error = None if status < 400 or status in accept else str(status)
+        self.engine.record(step, time.perf_counter() - started, error)
+        if error:
+            raise StepFailed(error)
+        return body if isinstance(body, dict) else {}
+
+
+async def step_login(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    body = await user.call("login", api_operations.login(user.username, user.password))
+    token = body.get("token")
+    if not token:
+        raise StepFailed("no token")
+    user.connection.token = token
+    user.favorites = []
+
+
+async def step_profile(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    await user.call("profile", api_operations.user_profile())
+
+
+async def step_browse_vocabulary(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    page = user.rng.randint(1, max(1, min(user.total_pages, spec.get("max_page", 10))))
+    limit = spec.get("limit", 20)
+    body = await user.call(
+        "browse_vocabulary", api_operations.vocabulary_list(page, limit)
+    )
+    user.words = body.get("words") or body.get("data") or []
+    user.total_pages = (body.get("pagination") or {}).get("total_pages", 1)
+
+
+async def step_search_vocabulary(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    if user.words:
+        term = str(user.rng.choice(user.words).get("word", "a"))[:3]
+    else:
+        term = user.rng.choice("aeiou")
+    await user.call(
+        "search_vocabulary",
+        api_operations.vocabulary_list(1, spec.get("limit", 20), term),
+    )
+
+
+async def step_add_favorite(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    candidates = [
+        word["id"]
+        for word in user.words
+        if not word.get("isFavorite") and word.get("id") not in user.favorites
+    ]
+    if not candidates:
+        return
+    word_id = user.rng.choice(candidates)
+    # Users sharing an account may have favorited the word in the meantime
+    await user.call("add_favorite", api_operations.add_favorite(word_id), (409,))
+    user.favorites.append(word_id)
+
+
+async def step_remove_favorite(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    if not user.favorites:
+        return
+    word_id = user.favorites.pop(user.rng.randrange(len(user.favorites)))
+    await user.call("remove_favorite", api_operations.remove_favorite(word_id), (404,))
+
+
+async def step_grammar_exercises(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    body = await user.call(
+        "grammar_exercises", api_operations.grammar_exercises(spec.get("category"))
+    )
+    user.exercises = body.get("exercises") or body.get("data") or []
+
+
+async def step_submit_grammar_answer(user: VirtualUser, spec: Dict[str, Any]) -> None:
+    if not user.exercises:
+        return
+    exercise = user.rng.choice(user.exercises)
+    options = exercise.get("options") or ["answer"]
+    await user.call(
+        "submit_grammar_answer",
+        api_operations.submit_grammar_answer(exercise["id"], user.rng.choice(options)),
+    )
+
+
+# Step name in scenario files -> coroutine doing it for one virtual user
+STEPS: Dict[str, Callable] = {
+    "login": step_login,
+    "profile": step_profile,
+    "browse_vocabulary": step_browse_vocabulary,
+    "search_vocabulary": step_search_vocabulary,
+    "add_favorite": step_add_favorite,
+    "remove_favorite": step_remove_favorite,
+    "grammar_exercises": step_grammar_exercises,
+    "submit_grammar_answer": step_submit_grammar_answer,
+}
+
+
+class LoadEngine:
+    """Runs a scenario's journeys with virtual users following its profile"""
+
+    def __init__(
+        self,
+        scenario: Dict[str, Any],
+        base_url: str,
+        profile: LoadProfile = None,
+        credentials: List[Tuple[str, str]] = None,
+        seed: int = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        on_progress: Callable[[Dict[str, Any]], None] = None,
+    ):
+        """Prepare a run; nothing is sent until ``run``
+
+        Args:
+            scenario: Scenario as returned by ``load_scenario``
+            base_url: API base URL, e.g. ``https://www.wordmate.es/dev/php/api.php``
+            profile: Overrides the scenario's ``profile``
+            credentials: Accounts users take in turn; defaults to the load
+                test users, else the scenario's ``credentials``
+            seed: Seed for journey choice, pages, words and think times
+            request_timeout: Seconds before a request counts as failed
+            on_progress: Called about once a second with the latest timeline entry
+        """
+        self.scenario = scenario
+        self.base_url = base_url.rstrip("?")
+        self.profile = profile or LoadProfile.from_dict(scenario.get("profile") or {})
+        self.credentials = (
+            credentials
+            or [tuple(c) for c in scenario.get("credentials") or []]
+            or load_credentials()
+        )
+        if not self.credentials:
+            raise ValueError("No credentials for virtual users")
+        self.seed = seed if seed is not None else int(scenario.get("seed", 0))
+        self.request_timeout = request_timeout
+        self.on_progress = on_progress
+
+        self.journeys = scenario["journeys"]
+        self.weights = [float(j.get("weight", 1)) for j in self.journeys]
+        think = scenario.get("think_time_ms") or {}
+        self.think_min = float(think.get("min", 0)) / 1000
+        self.think_max = float(think.get("max", think.get("min", 0))) / 1000
+
+        self.steps: Dict[str, StepHistogram] = {}
+        self.steady_steps: Dict[str, StepHistogram] = {}
+        self.journey_stats: Dict[str, StepHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.timeline: List[Dict[str, Any]] = []
+        self._second: Dict[str, int] = {"requests": 0, "failures": 0}
+        self._started = 0.0
+        self._users: List[Tuple[VirtualUser, asyncio.Task]] = []
+        self._next_user_id = 0
+
+    def record(self, step: str, seconds: float, error: Optional[str]) -> None:
+        """Count one request of ``step``; ``error`` is None on success"""
+        elapsed_ms = seconds * 1000
+        ok = error is None
+        self.steps.setdefault(step, StepHistogram()).record(elapsed_ms, ok)
+        if self.profile.phase(time.monotonic() - self._started) == "steady":
+            self.steady_steps.setdefault(step, StepHistogram()).record(elapsed_ms, ok)
+        self._second["requests"] += 1
+        if not ok:
+            self._second["failures"] += 1
+            key = f"{step}: {error}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    async def _think(self, user: VirtualUser) -> None:
+        if self.think_max:
+            await asyncio.sleep(user.rng.uniform(self.think_min, self.think_max))
+
+    async def _run_user(self, user: VirtualUser) -> None:
+        try:
+            while not user.stopping:
+                journey = user.rng.choices(self.journeys, self.weights)[0]
+                name = journey.get("name", "journey")
+                started = time.perf_counter()
+                ok = True
+                try:
+                    for spec in journey["steps"]:
+                        for _ in range(spec["repeat"]):
+                            if user.stopping:
+                                return
+                            await STEPS[spec["step"]](user, spec)
+                            await self._think(user)
+                except StepFailed:
+                    ok = False
+                    # Start the next journey on a fresh connection and login
+                    user.connection.close()
+                    user.connection.token = None
+                    await self._think(user)
+                self.journey_stats.setdefault(name, StepHistogram()).record(
+                    (time.perf_counter() - started) * 1000, ok
+                )
+        finally:
+            user.connection.close()
+
+    def _scale(self, target: int) -> None:
+        """Start or stop users until ``target`` are running"""
+        self._users = [(u, t) for u, t in self._users if not t.done()]
+        running = [(u, t) for u, t in self._users if not u.stopping]
+        for user, _ in running[target:]:
+            user.stopping = True
+        for _ in range(target - len(running)):
+            user_id = self._next_user_id
+            self._next_user_id += 1
+            credentials = self.credentials[user_id % len(self.credentials)]
+            user = VirtualUser(self, user_id, credentials)
+            self._users.append((user, asyncio.ensure_future(self._run_user(user))))
+
+    def _tick_second(self, second: int, users: int) -> None:
+        entry = {"second": second, "users": users, **self._second}
+        self.timeline.append(entry)
+        self._second = {"requests": 0, "failures": 0}
+        if self.on_progress:
+            self.on_progress(entry)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the whole profile and return the results"""
+        raise_open_file_limit(self.profile.users + 256)
+        self._started = time.monotonic()
+        next_second = 1
+        while True:
+            elapsed = time.monotonic() - self._started
+            if elapsed >= next_second:
+                active = sum(1 for u, t in self._users if not t.done())
+                self._tick_second(next_second, active)
+                next_second += 1
+            if elapsed >= self.profile.duration:
+                break
+            self._scale(self.profile.target_users(elapsed))
+            await asyncio.sleep(SCHEDULER_TICK)
+
+        self._scale(0)
+        tasks = [task for _, task in self._users]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=STOP_GRACE)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return self.results(time.monotonic() - self._started)
+
+    def results(self, duration: float) -> Dict[str, Any]:
+        requests = sum(h.samples for h in self.steps.values())
+        failures = sum(h.failures for h in self.steps.values())
+        steady = self.profile.steady_s
+        steady_requests = sum(h.samples for h in self.steady_steps.values())
+        results = {
+            "version": RESULTS_SCHEMA_VERSION,
+            "scenario": self.scenario.get("name"),
+            "description": self.scenario.get("description", ""),
+            "base_url": self.base_url,
+            "started": time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - duration)
+            ),
+            "duration_s": round(duration, 1),
+            "profile": self.profile.to_dict(),
+            "seed": self.seed,
+            "virtual_users_started": self._next_user_id,
+            "requests": requests,
+            "failures": failures,
+            "error_rate": round(100 * failures / requests, 2) if requests else 0.0,
+            "throughput": round(requests / duration, 2) if duration else 0.0,
+            "steady_throughput": round(steady_requests / steady, 2) if steady else None,
+            "steps": {
+                name: histogram.to_dict(duration)
+                for name, histogram in sorted(self.steps.items())
+            },
+            "steady_steps": {
+                name: histogram.to_dict(steady)
+                for name, histogram in sorted(self.steady_steps.items())
+            },
+            "journeys": {
+                name: histogram.to_dict(duration)
+                for name, histogram in sorted(self.journey_stats.items())
+            },
+            "errors": dict(sorted(self.errors.items(), key=lambda e: -e[1])),
+            "timeline": self.timeline,
+        }
+        results["thresholds"] = evaluate_thresholds(
+            self.scenario.get("thresholds") or {}, results
+        )
+        results["passed"] = all(check["passed"] for check in results["thresholds"])
+        return results
+
+
+def evaluate_thresholds(
+    thresholds: Dict[str, Dict[str, float]], results: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Check step limits against steady-state figures (whole run without one)
+
+    ``thresholds`` maps a step name, or ``all`` for every request, to
+    limits such as ``p95_ms: 800`` or ``error_rate: 1`` (percent).
+    """
+    steps = results["steady_steps"] or results["steps"]
+    checks = []
+    for step, limits in thresholds.items():
+        for metric, limit in limits.items():
+            if step == "all":
+                if metric != "error_rate":
+                    raise ValueError("Only error_rate can be limited for 'all'")
+                actual = results["error_rate"]
+            else:
+                actual = (steps.get(step) or {}).get(metric)
+            checks.append(
+                {
+                    "step": step,
+                    "metric": metric,
+                    "limit": limit,
+                    "actual": actual,
+                    "passed": actual is not None and actual <= limit,
+                }
+            )
+    return checks
+
+
+def run_scenario(
+    scenario: Dict[str, Any], base_url: str, **engine_options: Any
+) -> Dict[str, Any]:
+    """Run a scenario on a new event loop; see ``LoadEngine`` for options"""
+    return asyncio.run(LoadEngine(scenario, base_url, **engine_options).run())
+
+
+def write_results(results: Dict[str, Any], output_dir: Path) -> Path:
+    """Write results as ``load_results_<scenario>_<pid>.json``"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / (
+        f"{RESULTS_FILE_PREFIX}{results['scenario']}_{os.getpid()}"
+        f"_{int(time.time())}.json"
+    )
+    path.write_text(json.dumps(results), encoding="utf-8")
+    return path
+
+
+def load_results(paths: Iterable[Path]) -> List[Dict[str, Any]]:
+    """Read ``load_results_*.json`` files, oldest run first"""
+    runs = []
+    for path in paths:
+        try:
+            document = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if document.get("version") == RESULTS_SCHEMA_VERSION:
+            runs.append(document)
+    return sorted(runs, key=lambda run: run["started"])
@@ -0,0 +1,207 @@
+"""
+WordMate Rate Limiter
+
+Token-bucket rate limiter shared by all processes of a test run, used by
+WordmateAPI so that pabot workers together stay under the API's rate
+limit instead of each bursting into 429 responses.
+
+Requests are grouped into budgets (``auth``, ``search`` and ``default``),
+each with a sustained rate and a burst size. Every bucket is kept as a
+single "theoretical arrival time" (the GCRA form of a token bucket), so
+taking a token is one locked read-modify-write of a shared state file and
+waiting callers are released in order, one interval apart.
+
+The server's answers adjust the shared rate for every worker at once:
+
+- 429 or ``Retry-After`` halves the group's rate (once per pause, however
+  many workers were refused) and holds all requests of the group until
+  the indicated time.
+- ``RateLimit-Remaining`` / ``RateLimit-Reset`` (or their ``X-`` forms)
+  spread the remaining budget over the time left until the reset.
+- Otherwise the rate climbs back linearly, by a share of the budget per
+  second, up to the configured budget.
+"""
+
+import os
+import tempfile
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from resources.libraries.shared_state import locked_json_file
+
+DEFAULT_STATE_FILE = Path(
+    os.getenv(
+        "WORDMATE_RATE_LIMIT_STATE_FILE",
+        Path(tempfile.gettempdir()) / "wordmate_rate_limits.json",
+    )
+)
+# Requests per second and burst size of each endpoint group
+DEFAULT_BUDGETS = {
+    "auth": {"rate": 1.0, "burst": 3},
+    "search": {"rate": 5.0, "burst": 5},
+    "default": {"rate": 10.0, "burst": 10},
+}
+AUTH_ENDPOINTS = {"login", "register", "refresh", "logout", "google-auth"}
+# Stay this far below a limit the server announces
+HEADROOM = 0.9
+MIN_RATE = 0.2
+# Share of the budget rate regained per second while no limit is signalled
+RECOVERY_STEP = 0.05
+# Longest single wait, so a bogus Retry-After cannot stall a run for hours
+MAX_WAIT_SECONDS = 60.0
+
+
+def endpoint_group(url: str) -> str:
+    """Budget a request to ``url`` is charged to"""
+    query = parse_qs(urlsplit(url).query)
+    endpoint = query.get("endpoint", [""])[0]
+    if endpoint in AUTH_ENDPOINTS:
+        return "auth"
+    if "search" in query or "search" in endpoint.lower():
+        return "search"
+    return "default"
+
+
+def _header_seconds(value: str, now: float) -> Optional[float]:
+    """Seconds from now given as a delay, epoch timestamp or HTTP date"""
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            return parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+    # Reset headers are either a delay or an epoch timestamp
+    return number - now if number > 1e9 else number
+
+
+def rate_limit_signals(
+    headers: Mapping[str, str], now: float
+) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Return ``(retry_after, remaining, reset_in)`` from response headers"""
+
+    def first(*names):
+        for name in names:
+            if name in headers:
+                return headers[name]
+        return None
+
+    retry_after = first("Retry-After")
+    remaining = first("RateLimit-Remaining", "X-RateLimit-Remaining")
+    reset = first("RateLimit-Reset", "X-RateLimit-Reset")
+
+    try:
+        remaining = float(remaining) if remaining is not None else None
+    except ValueError:
+        remaining = None
+    return (
+        _header_seconds(retry_after, now) if retry_after is not None else None,
+        remaining,
+        _header_seconds(reset, now) if reset is not None else None,
+    )
+
+
+class RateLimiter:
+    """Token buckets per endpoint group, shared through a state file"""
+
+    def __init__(
+        self,
+        state_file: Path = DEFAULT_STATE_FILE,
+        budgets: Optional[Dict[str, Dict[str, float]]] = None,
+        on_throttle: Optional[Callable[[str, str], None]] = None,
+    ):
+        """Create a limiter
+
+        Args:
+            state_file: JSON file shared by all processes of a run
+            budgets: ``{group: {"rate": per_second, "burst": size}}`` overrides
+            on_throttle: Called as ``(group, message)`` when the server pushes back
+        """
+        self.state_file = Path(state_file)
+        self.budgets = {
+            group: {**DEFAULT_BUDGETS.get(group, DEFAULT_BUDGETS["default"]), **budget}
+            for group, budget in {**DEFAULT_BUDGETS, **(budgets or {})}.items()
+        }
+        self.on_throttle = on_throttle
+
+    def _bucket(self, groups: Dict[str, dict], group: str) -> dict:
+        budget = self.budgets.get(group, self.budgets["default"])
+        bucket = groups.setdefault(group, {"tat": 0.0, "rate": budget["rate"]})
+        bucket["rate"] = min(max(bucket["rate"], MIN_RATE), budget["rate"])
+        return bucket
+
+    def _tolerance(self, group: str, rate: float) -> float:
+        burst = self.budgets.get(group, self.budgets["default"])["burst"]
+        return (burst - 1) / rate
+
+    def acquire(self, group: str) -> float:
+        """Take a token for ``group``, sleeping until one is due
+
+        Returns the seconds waited.
+        """
+        now = time.time()
+        with locked_json_file(self.state_file) as groups:
+            bucket = self._bucket(groups, group)
+            tat = max(bucket["tat"], now)
+            wait = max(0.0, tat - self._tolerance(group, bucket["rate"]) - now)
+            bucket["tat"] = tat + 1 / bucket["rate"]
+
+        wait = min(wait, MAX_WAIT_SECONDS)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def observe(self, group: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adjust the shared rate of ``group`` from a response"""
+        now = time.time()
+        retry_after, remaining, reset_in = rate_limit_signals(headers, now)
+        budget_rate = self.budgets.get(group, self.budgets["default"])["rate"]
+
+        with locked_json_file(self.state_file) as groups:
+            bucket = self._bucket(groups, group)
+            pause = None
+
+            if status_code == 429 or retry_after is not None:
+                # Workers hit by the same burst slow down once, not once each
+                if now >= bucket.get("backoff_until", 0.0):
+                    bucket["rate"] = max(MIN_RATE, bucket["rate"] / 2)
+                pause = retry_after if retry_after is not None else 1 / bucket["rate"]
+            elif remaining is not None and reset_in is not None and reset_in > 0:
+                if remaining < 1:
+                    pause = reset_in
+                else:
+                    bucket["rate"] = min(
+                        budget_rate, max(MIN_RATE, HEADROOM * remaining / reset_in)
+                    )
+            else:
+                # Per-response step scaled by the rate: regained linearly in time
+                step = RECOVERY_STEP * budget_rate / bucket["rate"]
+                bucket["rate"] = min(budget_rate, bucket["rate"] + step)
+
+            if pause is not None:
+                # Nobody sends before the pause ends, and no burst follows it
+                pause = min(max(pause, 0.0), MAX_WAIT_SECONDS)
+                tolerance = self._tolerance(group, bucket["rate"])
+                bucket["tat"] = max(bucket["tat"], now + pause + tolerance)
+                bucket["backoff_until"] = max(
+                    bucket.get("backoff_until", 0.0), now + pause
+                )
+                if self.on_throttle:
+                    self.on_throttle(
+                        group,
+                        f"HTTP {status_code}, pausing {pause:.1f}s, "
+                        f"rate now {bucket['rate']:.2f}/s",
+                    )
+
+    def reset(self) -> None:
+        """Forget all shared rates and reservations"""
+        with locked_json_file(self.state_file) as groups:
+            groups.clear()
+
+    def rates(self) -> Dict[str, float]:
+        """Current shared rate of every group, per second"""
+        with locked_json_file(self.state_file) as groups:
+            return {group: bucket["rate"] for group, bucket in groups.items()}
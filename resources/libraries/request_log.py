@@ -0,0 +1,151 @@
+"""
+WordMate Request Log
+
+Sampled, structured request logging for WordmateAPI. Every failed request
+and one in ``sample_every`` successful ones are written as full records
+(request and response headers and bodies, timing) to a gzip-compressed
+JSON Lines side file. A background thread does the truncating,
+serializing, compressing and writing, so the test thread only pays for
+putting the record on a queue; when the queue is full, records are
+dropped and counted rather than slowing the run down.
+
+Secrets are redacted before a record is queued: credential headers and
+body fields whose names look like passwords or tokens.
+"""
+
+import atexit
+import gzip
+import itertools
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_SAMPLE_EVERY = 100
+QUEUE_SIZE = 10000
+# Longest response body kept in a record, as serialized JSON characters
+MAX_BODY_CHARS = 64 * 1024
+REDACTED = "[REDACTED]"
+SENSITIVE_HEADERS = {"authorization", "cookie", "set-cookie", "x-api-key"}
+SENSITIVE_FIELDS = ("password", "token", "secret", "api_key", "apikey")
+
+_STOP = object()
+
+
+def redact_headers(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """Copy of ``headers`` with credentials replaced"""
+    return {
+        name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in (headers or {}).items()
+    }
+
+
+def redact_body(body: Any) -> Any:
+    """Copy of a JSON body with password and token fields replaced"""
+    if isinstance(body, dict):
+        return {
+            key: (
+                REDACTED
+                if any(field in str(key).lower() for field in SENSITIVE_FIELDS)
+                else redact_body(value)
+            )
+            for key, value in body.items()
+        }
+    if isinstance(body, list):
+        return [redact_body(item) for item in body]
+    return body
+
+
+def _truncate(body: Any) -> Any:
+    """Large bodies are kept as a prefix of their JSON text"""
+    serialized = json.dumps(body, default=str)
+    if len(serialized) <= MAX_BODY_CHARS:
+        return body
+    return {
+        "truncated_chars": len(serialized) - MAX_BODY_CHARS,
+        "preview": serialized[:MAX_BODY_CHARS],
+    }
+
+
+class RequestLog:
+    """Sampler and background writer of request records"""
+
+    def __init__(self, path: Path, sample_every: int = DEFAULT_SAMPLE_EVERY):
+        """Start the writer thread
+
+        Args:
+            path: ``.jsonl.gz`` file records are appended to
+            sample_every: Keep one in this many successful requests;
+                failures are always kept
+        """
+        self.path = Path(path)
+        self.sample_every = max(1, int(sample_every))
+        self.written = 0
+        self.dropped = 0
+        self._successes = itertools.count()
+        self._ids = itertools.count(1)
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(
+            target=self._write_loop, name="wordmate-request-log", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def sample(self, failed: bool) -> Optional[int]:
+        """Record id when this request should be logged, None otherwise"""
+        if not failed and next(self._successes) % self.sample_every:
+            return None
+        return next(self._ids)
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """Queue a record for writing; never blocks"""
+        record["request_body"] = redact_body(record.get("request_body"))
+        record["request_headers"] = redact_headers(record.get("request_headers"))
+        record["response_headers"] = redact_headers(record.get("response_headers"))
+        record["response_body"] = redact_body(record.get("response_body"))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is _STOP:
+                    break
+                record["response_body"] = _truncate(record["response_body"])
+                f.write(json.dumps(record, default=str) + "\n")
+                self.written += 1
+                # Let readers see complete records whenever the queue drains
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self, timeout: float = 10) -> None:
+        """Write the queued records and stop the thread"""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+def new_record(
+    record_id: int,
+    method: str,
+    url: str,
+    started: float,
+    elapsed: float,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """Record skeleton shared by successful and failed requests"""
+    return {
+        "id": record_id,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "method": method,
+        "url": url,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        **fields,
+    }
@@ -0,0 +1,111 @@
+"""
+WordMate Session Registry
+
+One pooled ``requests.Session`` per (base URL, identity), shared by every
+library in the process: WordmateAPI and the RequestsLibrary keywords
+(through the SessionRegistry library) get the same warm connections,
+cookies and auth headers instead of each building their own session.
+
+The identity separates users. Sessions carry cookies and an
+``Authorization`` header, so two users logged in at once need different
+keys; anonymous requests share ``DEFAULT_IDENTITY``.
+
+Sessions are where record/replay mode (see ``cassette``) plugs in: in
+those modes every session gets a cassette adapter instead of the plain
+pooled one.
+
+Import it as ``resources.libraries.session_registry`` everywhere, so the
+registry exists only once per process.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from resources.libraries.cassette import cassette_adapter
+
+DEFAULT_IDENTITY = "anonymous"
+# Connections kept per host, enough for threads sharing one session
+POOL_MAXSIZE = 32
+RETRY_STATUSES = [500, 502, 503, 504]
+RETRIES = 3
+# Seconds; doubled on each further retry
+RETRY_BACKOFF = 1
+
+
+def configure_session(
+    session: requests.Session,
+    retry_statuses: Optional[List[int]] = None,
+    retries: int = RETRIES,
+) -> None:
+    """Mount the pooled adapter sessions are created with
+
+    The adapter retries connection errors and ``retry_statuses`` up to
+    ``retries`` times. With ``retries=0`` every attempt reaches the caller,
+    which then does its own retrying (WordmateAPI with the circuit breaker).
+    """
+    retry_strategy = 0
+    if retries:
+        retry_strategy = Retry(
+            total=retries,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=retry_statuses or RETRY_STATUSES,
+        )
+    # In record and replay mode requests go through the cassettes
+    settings = {"max_retries": retry_strategy, "pool_maxsize": POOL_MAXSIZE}
+    adapter = cassette_adapter(**settings) or HTTPAdapter(**settings)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def _key(base_url: Optional[str], identity: Optional[str]) -> Tuple[str, str]:
+    return ((base_url or "").rstrip("/"), identity or DEFAULT_IDENTITY)
+
+
+class SessionRegistry:
+    """Thread-safe map of (base URL, identity) to a shared session"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, str], requests.Session] = {}
+
+    def get(
+        self,
+        base_url: Optional[str],
+        identity: Optional[str] = None,
+        configure: Optional[Callable[[requests.Session], None]] = None,
+    ) -> Tuple[requests.Session, bool]:
+        """Return ``(session, created)`` for a base URL and identity
+
+        ``configure`` is applied only when the session is created; an
+        existing session keeps the settings of whoever created it.
+        """
+        key = _key(base_url, identity)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                return session, False
+            session = requests.Session()
+            (configure or configure_session)(session)
+            # RequestsLibrary builds request URLs from this attribute
+            session.url = key[0]
+            self._sessions[key] = session
+            return session, True
+
+    def close(self) -> None:
+        """Close and forget every session"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def keys(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._sessions)
+
+
+# The process-wide registry
+REGISTRY = SessionRegistry()
@@ -0,0 +1,55 @@
+"""
+WordMate Shared State
+
+Small JSON state files shared by all processes of a test run (pabot
+workers), each read-modify-write done under an exclusive file lock.
+"""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def locked_json_file(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lock ``path`` and yield its contents; changes are written back
+
+    Nothing is written when the block raises or leaves the data unchanged.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+", encoding="utf-8") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            f.seek(0)
+            content = f.read()
+            try:
+                data = json.loads(content) if content else {}
+            except ValueError:
+                data = {}  # a torn or foreign file only costs the history
+            original = json.dumps(data, sort_keys=True)
+
+            yield data
+
+            updated = json.dumps(data, sort_keys=True)
+            if updated != original:
+                f.seek(0)
+                f.truncate()
+                f.write(updated)
+                f.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
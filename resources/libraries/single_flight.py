@@ -0,0 +1,84 @@
+"""
+WordMate Single Flight
+
+Collapses concurrent identical calls into one: the first caller for a key
+runs the call, callers arriving while it is in flight wait for it and
+receive the same outcome (a deep copy of the result, or the same
+exception). Nothing is cached once the call finishes.
+
+Used by WordmateAPI for idempotent GET requests issued from several
+threads at once.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key and count the calls saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.requests = 0
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` unless an identical call is in flight
+
+        Returns ``(result, shared)`` where ``shared`` tells whether the
+        result came from another caller's call.
+        """
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        # Waiters copy the original, so the leader must not be handed it
+        if call.waiters:
+            return copy.deepcopy(call.result), False
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since creation"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "network_calls": self.executed,
+                "deduplicated": self.shared,
+            }
@@ -0,0 +1,142 @@
+"""
+WordMate Transfer Statistics
+
+Bytes on the wire against decoded bytes per API endpoint. WordmateAPI
+records every response it reads and, at the end of the run, writes the
+totals of its process to ``transfer_stats_<pid>.json`` in Robot's output
+directory. generate_report.py merges those files into a per-endpoint
+summary, so pabot runs with one file per process add up.
+
+Endpoints are keyed by the ``endpoint`` query parameter of api.php plus
+the page size (``limit``) when one is requested, so the cost of large
+pages shows up on its own line.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qs, urlsplit
+
+STATS_FILE_PREFIX = "transfer_stats_"
+STATS_SCHEMA_VERSION = 1
+
+
+def endpoint_name(url: str) -> str:
+    """Key a request to ``url`` is summarized under"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    name = query.get("endpoint", [parts.path or "/"])[0]
+    if "limit" in query:
+        name += f" limit={query['limit'][0]}"
+    return name
+
+
+def _empty_entry() -> Dict:
+    return {
+        "responses": 0,
+        "wire_bytes": 0,
+        "decoded_bytes": 0,
+        "max_decoded_bytes": 0,
+        "seconds": 0.0,
+        "encodings": {},
+    }
+
+
+def _add(entry: Dict, other: Dict) -> None:
+    for field in ("responses", "wire_bytes", "decoded_bytes", "seconds"):
+        entry[field] += other[field]
+    entry["max_decoded_bytes"] = max(
+        entry["max_decoded_bytes"], other["max_decoded_bytes"]
+    )
+    for encoding, count in other["encodings"].items():
+        entry["encodings"][encoding] = entry["encodings"].get(encoding, 0) + count
+
+
+class TransferStats:
+    """Thread-safe per-endpoint byte and time totals"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Dict] = {}
+
+    def record(
+        self,
+        url: str,
+        encoding: str,
+        wire_bytes: int,
+        decoded_bytes: int,
+        seconds: float,
+    ) -> None:
+        """Count one response read from the network"""
+        name = endpoint_name(url)
+        with self._lock:
+            entry = self.endpoints.setdefault(name, _empty_entry())
+            _add(
+                entry,
+                {
+                    "responses": 1,
+                    "wire_bytes": wire_bytes,
+                    "decoded_bytes": decoded_bytes,
+                    "max_decoded_bytes": decoded_bytes,
+                    "seconds": seconds,
+                    "encodings": {encoding: 1},
+                },
+            )
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            return summarize(self.endpoints)
+
+    def write(self, output_dir: Path) -> Path:
+        """Write this process's totals into ``output_dir``"""
+        path = Path(output_dir) / f"{STATS_FILE_PREFIX}{os.getpid()}.json"
+        with self._lock:
+            document = {"version": STATS_SCHEMA_VERSION, "endpoints": self.endpoints}
+            path.write_text(json.dumps(document), encoding="utf-8")
+        return path
+
+
+def summarize(endpoints: Dict[str, Dict]) -> List[Dict]:
+    """Per-endpoint rows with ratios and averages, most wire bytes first"""
+    rows = []
+    for name, entry in endpoints.items():
+        responses = entry["responses"] or 1
+        compressed = sum(
+            count
+            for encoding, count in entry["encodings"].items()
+            if encoding != "identity"
+        )
+        rows.append(
+            {
+                "endpoint": name,
+                **entry,
+                "seconds": round(entry["seconds"], 3),
+                "encodings": dict(entry["encodings"]),
+                "avg_wire_bytes": round(entry["wire_bytes"] / responses),
+                "avg_decoded_bytes": round(entry["decoded_bytes"] / responses),
+                "compression_ratio": (
+                    round(entry["decoded_bytes"] / entry["wire_bytes"], 2)
+                    if entry["wire_bytes"]
+                    else None
+                ),
+                "compressed_share": round(compressed / responses, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["wire_bytes"], reverse=True)
+    return rows
+
+
+def load_transfer_stats(paths: Iterable[Path]) -> List[Dict]:
+    """Merge ``transfer_stats_*.json`` files into one summary"""
+    endpoints: Dict[str, Dict] = {}
+    for path in paths:
+        try:
+            document = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Skipping unreadable transfer stats {path}: {e}")
+            continue
+        for name, entry in document.get("endpoints", {}).items():
+            _add(endpoints.setdefault(name, _empty_entry()), entry)
+    return summarize(endpoints)
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+WordMate Report Generator Benchmark
+
+Synthesizes Robot Framework output.xml files of configurable size and
+times each stage of report generation: parse, aggregate, charts, HTML and
+JSON. Every size runs in a fresh subprocess so its peak RSS is not
+inflated by earlier runs. Results are written as JSON and can be compared
+against an earlier result file to catch regressions.
+
+Synthetic outputs are cached under the work directory, keyed by their
+parameters, so repeated runs only pay for generation once.
+
+Usage:
+    python scripts/benchmark_report.py --sizes 1k 100k
+    python scripts/benchmark_report.py --sizes 1m --keyword-depth 1 --files 8
+    python scripts/benchmark_report.py --sizes 100k --compare reports/benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.generate_report import WordMateReportGenerator
+from scripts.report_charts import CHART_BACKENDS, matplotlib_available
+from scripts.report_export import EXPORT_FORMATS
+from scripts.report_model import NUMPY_AVAILABLE
+
+RESULTS_SCHEMA_VERSION = 1
+DEFAULT_WORK_DIR = project_root / "reports" / "benchmarks"
+STAGES = ("parse", "aggregate", "charts", "html", "json")
+TESTS_PER_SUITE = 50
+# Changes smaller than this are timer noise, whatever their ratio
+MIN_COMPARABLE_SECONDS = 0.05
+
+_SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+_FAILURE_MESSAGES = (
+    "Expected status 200 but got {code} from /api/v1/words/{id}",
+    "Element 'css:#word-{id}' not visible after 10 seconds",
+    "TimeoutError: request to https://api.wordmate.example/{id} timed out",
+    "'{id}' != '{other}'",
+    "AssertionError: list length {code} should be {id}",
+)
+
+
+def parse_size(value: str) -> int:
+    """Parse a test count such as ``1000``, ``100k`` or ``1m``"""
+    value = value.strip().lower()
+    multiplier = _SIZE_SUFFIXES.get(value[-1:], 1)
+    number = value[:-1] if value[-1:] in _SIZE_SUFFIXES else value
+    try:
+        count = int(float(number) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    if count <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {value}")
+    return count
+
+
+def _format_time(moment: datetime, schema: int) -> str:
+    if schema >= 7:
+        return moment.isoformat(timespec="microseconds")
+    return moment.strftime("%Y%m%d %H:%M:%S.") + f"{moment.microsecond // 1000:03d}"
+
+
+def _status(status: str, start: datetime, elapsed: float, schema: int) -> str:
+    if schema >= 7:
+        return (
+            f'<status status="{status}" start="{_format_time(start, schema)}" '
+            f'elapsed="{elapsed:.6f}"'
+        )
+    end = start + timedelta(seconds=elapsed)
+    return (
+        f'<status status="{status}" starttime="{_format_time(start, schema)}" '
+        f'endtime="{_format_time(end, schema)}"'
+    )
+
+
+def _write_keywords(
+    f, rng, depth: int, per_level: int, start: datetime, budget: float, schema: int
+) -> None:
+    """Write a tree of passing keywords filling ``budget`` seconds"""
+    if depth <= 0:
+        return
+    elapsed = budget / per_level
+    for index in range(per_level):
+        kw_start = start + timedelta(seconds=index * elapsed)
+        f.write(f'<kw name="Benchmark Keyword {depth}.{index}"><arg>${{value}}</arg>')
+        _write_keywords(f, rng, depth - 1, per_level, kw_start, elapsed, schema)
+        f.write(f"{_status('PASS', kw_start, elapsed, schema)}/></kw>")
+
+
+def _write_test(
+    f,
+    rng,
+    test_id: str,
+    index: int,
+    start: datetime,
+    config: Dict[str, Any],
+) -> float:
+    """Write one test and return its duration"""
+    schema = config["schema"]
+    elapsed = round(rng.lognormvariate(0.0, 0.8), 3)
+    failed = rng.random() < config["failure_ratio"]
+
+    f.write(f'<test id="{test_id}" name="Benchmark Test {index}" line="{index + 1}">')
+    _write_keywords(
+        f,
+        rng,
+        config["keyword_depth"],
+        config["keywords_per_level"],
+        start,
+        elapsed,
+        schema,
+    )
+
+    environment = rng.choice(("dev", "staging"))
+    tags = ("api", "regression", f"priority-{index % 3}", environment)
+    tag_xml = "".join(f"<tag>{tag}</tag>" for tag in tags)
+    f.write(tag_xml if schema >= 7 else f"<tags>{tag_xml}</tags>")
+
+    status = _status("FAIL" if failed else "PASS", start, elapsed, schema)
+    if failed:
+        message = rng.choice(_FAILURE_MESSAGES).format(
+            code=rng.choice((400, 404, 500, 503)),
+            id=rng.randrange(100000),
+            other=rng.randrange(100000),
+        )
+        f.write(f"{status}>{message}</status></test>")
+    else:
+        f.write(f"{status}/></test>")
+    return elapsed
+
+
+def write_synthetic_outputs(data_dir: Path, test_count: int, config: Dict) -> None:
+    """Write ``config['files']`` output files holding ``test_count`` tests
+
+    Each file plays one pabot process: the files share a top-level suite
+    name, start at the same time and hold distinct child suites.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(config["seed"])
+    schema = config["schema"]
+    file_count = min(config["files"], test_count)
+    run_start = datetime(2024, 1, 1, 10, 0, 0)
+    version = "7.0" if schema >= 7 else "6.1"
+    generator = f"Robot {version} (Python 3.11)"
+    schema_attr = ' schemaversion="5"' if schema >= 7 else ' schemaversion="4"'
+
+    for file_index in range(file_count):
+        file_tests = test_count // file_count + (
+            1 if file_index < test_count % file_count else 0
+        )
+        generated = _format_time(
+            run_start + timedelta(milliseconds=file_index), schema
+        )
+        output_file = data_dir / f"output-{file_index:03d}.xml"
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write(
+                f'<robot generator="{generator}" generated="{generated}"{schema_attr}>'
+            )
+            f.write('<suite id="s1" name="Benchmark" source="/benchmark">')
+
+            moment = run_start
+            for suite_index, first in enumerate(range(0, file_tests, TESTS_PER_SUITE)):
+                suite_id = f"s1-s{suite_index + 1}"
+                suite_name = f"Worker {file_index} Suite {suite_index}"
+                suite_start = moment
+                f.write(
+                    f'<suite id="{suite_id}" name="{suite_name}" '
+                    f'source="/benchmark/{file_index}/{suite_index}.robot">'
+                )
+                for offset in range(min(TESTS_PER_SUITE, file_tests - first)):
+                    test_id = f"{suite_id}-t{offset + 1}"
+                    index = first + offset
+                    elapsed = _write_test(f, rng, test_id, index, moment, config)
+                    moment += timedelta(seconds=elapsed)
+                suite_elapsed = (moment - suite_start).total_seconds()
+                suite_status = _status("PASS", suite_start, suite_elapsed, schema)
+                f.write(f"{suite_status}/></suite>")
+
+            run_elapsed = (moment - run_start).total_seconds()
+            f.write(f"{_status('PASS', run_start, run_elapsed, schema)}/></suite>")
+            f.write("<statistics></statistics><errors></errors></robot>\n")
+
+
+def ensure_dataset(work_dir: Path, test_count: int, config: Dict) -> Path:
+    """Return a cached dataset directory, generating it when missing"""
+    key = "-".join(
+        str(part)
+        for part in (
+            test_count,
+            config["files"],
+            config["keyword_depth"],
+            config["keywords_per_level"],
+            config["failure_ratio"],
+            f"rf{config['schema']}",
+            config["seed"],
+        )
+    )
+    data_dir = work_dir / "data" / key
+    marker = data_dir / ".complete"
+    if not marker.exists():
+        shutil.rmtree(data_dir, ignore_errors=True)
+        print(f"🧪 Generating {test_count} synthetic tests in {data_dir}...")
+        started = time.perf_counter()
+        write_synthetic_outputs(data_dir, test_count, config)
+        marker.write_text(f"{time.perf_counter() - started:.3f}\n")
+    return data_dir
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its children, in MB"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return round(max(self_peak, children_peak) / (1024 * 1024), 1)
+
+
+def run_stages(
+    data_dir: Path, output_dir: Path, chart_backend: str, export_format: str
+) -> Dict[str, Any]:
+    """Run every report stage once and time it"""
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir(parents=True)
+    generator = WordMateReportGenerator()
+
+    stage_calls = {
+        "parse": lambda: generator.load_robot_output_files(data_dir),
+        "aggregate": generator._calculate_summary_statistics,
+        "charts": lambda: generator.generate_charts(output_dir, chart_backend),
+        "html": lambda: generator.generate_html_report(output_dir, "benchmark"),
+        "json": lambda: generator.generate_json_report(output_dir, export_format),
+    }
+
+    stages = {}
+    for stage in STAGES:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            stage_calls[stage]()
+        stages[stage] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    return {
+        "tests": len(generator.model),
+        "input_bytes": sum(path.stat().st_size for path in data_dir.glob("*.xml")),
+        "output_bytes": sum(
+            path.stat().st_size for path in output_dir.rglob("*") if path.is_file()
+        ),
+        "total_seconds": round(sum(stage["seconds"] for stage in stages.values()), 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def run_size_in_subprocess(
+    data_dir: Path, output_dir: Path, chart_backend: str, export_format: str
+) -> Dict[str, Any]:
+    """Benchmark one dataset in a fresh interpreter"""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--run-one",
+            str(data_dir),
+            "--output-dir",
+            str(output_dir),
+            "--chart-backend",
+            chart_backend,
+            "--json-format",
+            export_format,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip() or "benchmark run failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _environment_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": NUMPY_AVAILABLE,
+        "matplotlib": matplotlib_available(),
+    }
+
+
+def compare_results(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print stage timings against a baseline and return the regressions"""
+    baseline_runs = {run["tests"]: run for run in baseline.get("runs", [])}
+    regressions = []
+
+    for run in results["runs"]:
+        previous = baseline_runs.get(run["tests"])
+        if previous is None:
+            print(f"  {run['tests']} tests: no baseline run to compare with")
+            continue
+        print(f"\n  {run['tests']} tests:")
+        rows = [
+            (
+                stage,
+                run["stages"][stage]["seconds"],
+                previous["stages"][stage]["seconds"],
+            )
+            for stage in STAGES
+            if stage in previous["stages"]
+        ]
+        rows.append(("peak_rss_mb", run["peak_rss_mb"], previous["peak_rss_mb"]))
+        for metric, current, before in rows:
+            if current is None or not before:
+                continue
+            change = current / before - 1
+            marker = ""
+            noise_floor = 0 if metric == "peak_rss_mb" else MIN_COMPARABLE_SECONDS
+            if change > threshold and current - before > noise_floor:
+                marker = " ⚠️"
+                regressions.append(f"{run['tests']} tests {metric}: {change:+.0%}")
+            print(
+                f"    {metric:<12} {before:>10.3f} -> {current:>10.3f} "
+                f"({change:+.0%}){marker}"
+            )
+
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark WordMate report generation on synthetic Robot outputs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --sizes 1k 100k
+  %(prog)s --sizes 1m --keyword-depth 1 --files 8
+  %(prog)s --sizes 100k --compare reports/benchmarks/baseline.json
+        """,
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[1_000, 100_000],
+        help="Test counts to benchmark, e.g. 1k 100k 1m (default: 1k 100k)",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=4,
+        help="Output files per run, like pabot processes (default: 4)",
+    )
+    parser.add_argument(
+        "--keyword-depth",
+        type=int,
+        default=2,
+        help="Nesting depth of keywords per test (default: 2)",
+    )
+    parser.add_argument(
+        "--keywords-per-level",
+        type=int,
+        default=3,
+        help="Keywords at each nesting level (default: 3)",
+    )
+    parser.add_argument(
+        "--failure-ratio",
+        type=float,
+        default=0.05,
+        help="Share of failing tests (default: 0.05)",
+    )
+    parser.add_argument(
+        "--schema",
+        type=int,
+        choices=[6, 7],
+        default=7,
+        help="Robot Framework output format (default: 7)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Random seed for synthetic data"
+    )
+    parser.add_argument(
+        "--chart-backend",
+        choices=CHART_BACKENDS,
+        default="auto",
+        help="Chart renderer to benchmark",
+    )
+    parser.add_argument(
+        "--json-format",
+        choices=EXPORT_FORMATS,
+        default="json",
+        help="Result export format to benchmark",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=DEFAULT_WORK_DIR,
+        help="Directory for datasets and results",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Results JSON file (default: timestamped in --work-dir)",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Earlier results JSON to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown counted as a regression when comparing (default: 0.2)",
+    )
+    parser.add_argument("--run-one", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        result = run_stages(
+            args.run_one, args.output_dir, args.chart_backend, args.json_format
+        )
+        print(json.dumps(result))
+        return 0
+
+    config = {
+        "files": args.files,
+        "keyword_depth": args.keyword_depth,
+        "keywords_per_level": args.keywords_per_level,
+        "failure_ratio": args.failure_ratio,
+        "schema": args.schema,
+        "seed": args.seed,
+        "chart_backend": args.chart_backend,
+        "json_format": args.json_format,
+    }
+    results = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "environment": _environment_info(),
+        "config": config,
+        "runs": [],
+    }
+
+    for test_count in args.sizes:
+        data_dir = ensure_dataset(args.work_dir, test_count, config)
+        print(f"⏱️  Benchmarking {test_count} tests...")
+        try:
+            run = run_size_in_subprocess(
+                data_dir, args.work_dir / "output", args.chart_backend, args.json_format
+            )
+        except RuntimeError as e:
+            print(f"❌ Benchmark failed for {test_count} tests: {e}")
+            return 1
+        results["runs"].append(run)
+
+        stage_summary = ", ".join(
+            f"{stage} {run['stages'][stage]['seconds']:.2f}s" for stage in STAGES
+        )
+        print(f"   {stage_summary} | peak RSS {run['peak_rss_mb']} MB")
+
+    output_file = args.output or (
+        args.work_dir / f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Results written to {output_file}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n📊 Comparison with {args.compare}:")
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print("\n⚠️  Regressions:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print("\n✅ No regressions above threshold")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+WordMate API Transport Benchmark
+
+Compares the two WordmateAPI transports under concurrent load: the
+``requests`` HTTP/1.1 connection pool and the multiplexed HTTP/2 client.
+For each concurrency level the same number of GET requests is sent from
+that many threads, and throughput, p50/p95 latency and the connections
+the server saw are reported.
+
+Without ``--url`` a local ``http2_stub_server.py`` is started for the
+run (HTTP/2 over h2c); against a real ``https://`` environment HTTP/2 is
+negotiated through ALPN and connection counts are not available.
+
+Requires ``httpx[http2]`` (and ``h2`` for the local stub server).
+
+Usage:
+    python scripts/benchmark_transport.py
+    python scripts/benchmark_transport.py --concurrency 1 16 64 --requests 2000
+    python scripts/benchmark_transport.py --url https://dev.wordmate.es/api.php
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.http_transport import HTTPX_AVAILABLE, create_transport
+from scripts.http2_stub_server import STATS_PATH
+
+DEFAULT_CONCURRENCY = [1, 16, 64]
+DEFAULT_REQUESTS = 1000
+DEFAULT_ENDPOINT = "?endpoint=vocabulario"
+STUB_STARTUP_SECONDS = 10
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of ``values``"""
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered) + 0.5)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _server_stats(session: requests.Session, url: str) -> Optional[Dict]:
+    """Connection counters of the stub server, None for other servers"""
+    parts = urlsplit(url)
+    try:
+        response = session.get(
+            f"{parts.scheme}://{parts.netloc}{STATS_PATH}",
+            headers={"Connection": "close"},
+            timeout=5,
+        )
+        return response.json()["connections"]
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        return None
+
+
+def _http1_transport(concurrency: int) -> requests.Session:
+    """Session pooled like WordmateAPI's, sized so no thread waits for a slot"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def run_level(
+    transport_name: str, url: str, concurrency: int, total: int, timeout: float
+) -> Dict[str, Any]:
+    """Send ``total`` GETs from ``concurrency`` threads over one transport"""
+    if transport_name == "http1":
+        transport = _http1_transport(concurrency)
+    else:
+        transport = create_transport(transport_name, requests.Session(), timeout)
+
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one_request(_):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = transport.request("GET", url, timeout=timeout)
+            ok = response.status_code < 500
+        except requests.exceptions.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    # Warm up one connection so setup is not billed to the first level only
+    one_request(None)
+    latencies.clear()
+    errors = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one_request, range(total)))
+    wall = time.perf_counter() - started
+    transport.close()
+
+    result = {
+        "transport": transport_name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(wall, 3),
+        "requests_per_second": round(len(latencies) / wall, 1) if wall else 0.0,
+    }
+    if latencies:
+        result["p50_ms"] = round(_percentile(latencies, 50) * 1000, 2)
+        result["p95_ms"] = round(_percentile(latencies, 95) * 1000, 2)
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_server(delay_ms: float) -> Tuple[subprocess.Popen, str]:
+    """Start http2_stub_server.py on a free port and wait until it accepts"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(project_root / "scripts" / "http2_stub_server.py"),
+            "--port",
+            str(port),
+            "--delay-ms",
+            str(delay_ms),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + STUB_STARTUP_SECONDS
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}/api.php"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Stub server did not start")
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(
+        f"\n{'Transport':<10} {'Conc':>5} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'Conns':>6} {'Errors':>7}"
+    )
+    print("-" * 59)
+    for result in results:
+        connections = result.get("connections")
+        print(
+            f"{result['transport']:<10} {result['concurrency']:>5} "
+            f"{result['requests_per_second']:>9.1f} "
+            f"{result.get('p50_ms', float('nan')):>8.2f} "
+            f"{result.get('p95_ms', float('nan')):>8.2f} "
+            f"{connections if connections is not None else '-':>6} "
+            f"{result['errors']:>7}"
+        )
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Compare the HTTP/1.1 pool and HTTP/2 transports of WordmateAPI",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s
+  %(prog)s --concurrency 1 16 64 --requests 2000 --delay-ms 20
+  %(prog)s --url https://dev.wordmate.es/api.php --requests 200
+        """,
+    )
+    parser.add_argument(
+        "--url", help="API URL to load (default: a local stub server is started)"
+    )
+    parser.add_argument(
+        "--endpoint",
+        default=DEFAULT_ENDPOINT,
+        help=f"Query appended to the URL (default: {DEFAULT_ENDPOINT})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Concurrent requests per level (default: 1 16 64)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=DEFAULT_REQUESTS,
+        help=f"Requests per level and transport (default: {DEFAULT_REQUESTS})",
+    )
+    parser.add_argument(
+        "--delay-ms",
+        type=float,
+        default=10,
+        help="Simulated server time of the local stub (default: 10)",
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    if not HTTPX_AVAILABLE:
+        print("❌ HTTP/2 transport requires httpx: pip install 'httpx[http2]'")
+        return 1
+
+    stub = None
+    if args.url:
+        base_url = args.url
+    else:
+        stub, base_url = start_stub_server(args.delay_ms)
+    http2_name = "http2" if base_url.startswith("https://") else "h2c"
+    url = f"{base_url}{args.endpoint}"
+    stats_session = requests.Session()
+
+    print(f"🏁 Benchmarking {url}")
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            for transport_name in ("http1", http2_name):
+                before = _server_stats(stats_session, url)
+                result = run_level(
+                    transport_name, url, concurrency, args.requests, args.timeout
+                )
+                after = _server_stats(stats_session, url)
+                if before is not None and after is not None:
+                    protocol = "http1" if transport_name == "http1" else "h2"
+                    result["connections"] = after[protocol] - before[protocol]
+                results.append(result)
+                print(
+                    f"  {transport_name:<6} x{concurrency:<3} "
+                    f"{result['requests_per_second']:.1f} req/s"
+                )
+    finally:
+        if stub:
+            stub.terminate()
+            stub.wait()
+
+    print_results(results)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "generated": datetime.now().isoformat(),
+            "url": url,
+            "requests_per_level": args.requests,
+            "stub_delay_ms": None if args.url else args.delay_ms,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"\n💾 Results written to {args.output}")
+
+    return 0 if all(result["errors"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,25 @@ Environment Configuration Script
 
 This script helps configure and validate the test environments
 for WordMate application without exposing sensitive data.
+
+With --monitor it keeps probing the API (health, vocabulary, grammar
+exercises and login) at a fixed interval, recording latency histograms
+under reports/monitoring and flagging SLO breaches:
+
+    python scripts/configure_environments.py --monitor -e production --interval 60
 """
 
+import math
 import os
+import statistics
 import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 import yaml
@@ -19,6 +31,38 @@ import yaml
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.endpoint_monitor import (
+    DEFAULT_MONITOR_DIR,
+    MONITOR_CHECKS,
+    RETENTION_DAYS,
+    MonitorStore,
+    evaluate_slo,
+)
+
+# Connectivity probing: every endpoint is sampled PROBE_SAMPLES times and
+# all samples of all environments run concurrently, so a host that is down
+# costs one timeout rather than one per check
+PROBE_SAMPLES = 5
+PROBE_TIMEOUT = 10
+MAX_PROBE_WORKERS = 32
+# Share of samples that must succeed for an endpoint to count as up
+MIN_AVAILABILITY_PERCENT = 80
+# The runner's preflight only asks whether an environment is reachable at
+# all, so it takes few samples with a short timeout
+PREFLIGHT_SAMPLES = 3
+PREFLIGHT_TIMEOUT = 5
+PREFLIGHT_LABELS = {
+    "base_url_check": "Base URL",
+    "api_health_check": "API health",
+    "login": "Login",
+}
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
 
 class EnvironmentConfigurator:
     """Manages environment configuration and validation"""
@@ -40,7 +84,14 @@ class EnvironmentConfigurator:
                 "api_base_url": "https://www.wordmate.es/php/api.php",
                 "config_file": "production.yaml",
             },
+            "local": {
+                "name": "Local mock server",
+                "base_url": "http://127.0.0.1:8765",
+                "api_base_url": "http://127.0.0.1:8765/php/api.php",
+                "config_file": "local.yaml",
+            },
         }
+        self._local = threading.local()
 
     def load_environment_config(self, env_name: str) -> Optional[Dict[str, Any]]:
         """Load environment configuration"""
@@ -68,7 +119,7 @@ class EnvironmentConfigurator:
 
                 # Replace ${VAR:-default} patterns
                 content = re.sub(
-                    r"\$\{([^}:]+)(?::(-[^}]*))?\}", replace_env_var, content
+                    r"\$\{([^}:]+)(?::-([^}]*))?\}", replace_env_var, content
                 )
                 # Replace ${VAR} patterns
                 content = re.sub(
@@ -82,104 +133,245 @@ class EnvironmentConfigurator:
             print(f"❌ Error loading config: {e}")
             return None
 
-    def check_url_accessibility(self, url: str, timeout: int = 30) -> Dict[str, Any]:
-        """Check if URL is accessible"""
-        result = {
-            "accessible": False,
-            "status_code": None,
-            "response_time": None,
-            "error": None,
-        }
+    def _session(self) -> requests.Session:
+        """Per-thread session so repeated samples reuse their connection"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
 
-        try:
-            start_time = time.time()
-            response = requests.get(url, timeout=timeout, allow_redirects=True)
-            end_time = time.time()
+    def _probe_once(self, target: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Take one timed sample of an endpoint
 
-            result["accessible"] = True
-            result["status_code"] = response.status_code
-            result["response_time"] = round(end_time - start_time, 2)
+        A sample succeeds on ``expect_status`` when the target sets one,
+        otherwise on any response below 500.
+        """
+        sample = {"ok": False, "status_code": None, "elapsed": None, "error": None}
+        check = target["check"]
+
+        try:
+            start_time = time.perf_counter()
+            response = self._session().request(
+                target.get("method", "GET"),
+                target["url"],
+                json=target.get("json"),
+                timeout=timeout,
+                allow_redirects=True,
+            )
+            sample["elapsed"] = time.perf_counter() - start_time
+            sample["status_code"] = response.status_code
 
-            # Check if it's a WordMate page
-            if "wordmate" in response.text.lower():
-                result["is_wordmate"] = True
+            expected = target.get("expect_status")
+            if expected:
+                sample["ok"] = response.status_code == expected
             else:
-                result["is_wordmate"] = False
-                result["warning"] = "Page doesn't appear to be WordMate"
+                sample["ok"] = response.status_code < 500
+
+            if check == "api_health_check" and sample["ok"]:
+                try:
+                    sample["api_data"] = response.json()
+                except ValueError:
+                    pass  # 200 is good enough
+            elif check == "base_url_check":
+                sample["is_wordmate"] = "wordmate" in response.text.lower()
 
         except requests.exceptions.Timeout:
-            result["error"] = "Timeout"
+            sample["error"] = "Timeout"
         except requests.exceptions.ConnectionError:
-            result["error"] = "Connection failed"
+            sample["error"] = "Connection failed"
         except requests.exceptions.RequestException as e:
-            result["error"] = str(e)
+            sample["error"] = str(e)
         except Exception as e:
-            result["error"] = f"Unexpected error: {e}"
+            sample["error"] = f"Unexpected error: {e}"
 
-        return result
+        return sample
 
-    def check_api_health(self, api_url: str) -> Dict[str, Any]:
-        """Check API health endpoint"""
-        health_url = f"{api_url}?endpoint=health"
+    def _summarize_samples(
+        self, check: str, samples: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Reduce the samples of one endpoint to availability and latency"""
+        latencies = sorted(
+            sample["elapsed"] * 1000 for sample in samples if sample["ok"]
+        )
+        statuses = Counter(
+            sample["status_code"] for sample in samples if sample["status_code"]
+        )
+        errors = Counter(sample["error"] for sample in samples if sample["error"])
+        availability = round(100 * len(latencies) / len(samples), 1)
+        up = availability >= MIN_AVAILABILITY_PERCENT
 
         result = {
-            "healthy": False,
-            "status_code": None,
+            "samples": len(samples),
+            "availability": availability,
+            "status_code": statuses.most_common(1)[0][0] if statuses else None,
             "response_time": None,
-            "error": None,
+            "latency_ms": None,
+            "error": errors.most_common(1)[0][0] if errors else None,
+            "up": up,
         }
-
-        try:
-            start_time = time.time()
-            response = requests.get(health_url, timeout=10)
-            end_time = time.time()
-
-            result["status_code"] = response.status_code
-            result["response_time"] = round(end_time - start_time, 2)
-
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    result["healthy"] = True
-                    result["api_data"] = data
-                except:
-                    result["healthy"] = True  # 200 is good enough
-
-        except Exception as e:
-            result["error"] = str(e)
+        if latencies:
+            result["response_time"] = round(statistics.median(latencies) / 1000, 3)
+            result["latency_ms"] = {
+                "min": round(latencies[0], 1),
+                "median": round(statistics.median(latencies), 1),
+                "p95": round(_percentile(latencies, 95), 1),
+            }
+
+        if check == "api_health_check":
+            result["healthy"] = up
+            api_data = [
+                sample["api_data"] for sample in samples if "api_data" in sample
+            ]
+            if api_data:
+                result["api_data"] = api_data[-1]
+        else:
+            result["accessible"] = up
+            result["is_wordmate"] = any(sample.get("is_wordmate") for sample in samples)
+            if latencies and not result["is_wordmate"]:
+                result["warning"] = "Page doesn't appear to be WordMate"
 
         return result
 
-    def test_environment_connectivity(self, env_name: str) -> Dict[str, Any]:
-        """Test connectivity to environment"""
-        if env_name not in self.environments:
-            return {"error": f"Unknown environment: {env_name}"}
+    def sample_endpoints(
+        self,
+        targets: List[Dict[str, Any]],
+        samples: int = PROBE_SAMPLES,
+        timeout: float = PROBE_TIMEOUT,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Take ``samples`` samples of every target concurrently
+
+        Each target is a dict with a ``check`` name and ``url``, and
+        optionally ``method``, ``json`` and ``expect_status``. Samples are
+        submitted round-robin so every endpoint gets its first answer early.
+        A long-running caller can pass its own ``executor`` to keep threads
+        and their connections alive between calls.
+        """
+        collected: List[List[Dict[str, Any]]] = [[] for _ in targets]
+        jobs = [
+            (index, target)
+            for _ in range(samples)
+            for index, target in enumerate(targets)
+        ]
+        if not jobs:
+            return collected
 
-        env_info = self.environments[env_name]
-        config = self.load_environment_config(env_name)
+        pool = executor or ThreadPoolExecutor(
+            max_workers=min(MAX_PROBE_WORKERS, len(jobs))
+        )
+        try:
+            futures = {
+                pool.submit(self._probe_once, target, timeout): index
+                for index, target in jobs
+            }
+            for future in as_completed(futures):
+                collected[futures[future]].append(future.result())
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        return collected
+
+    def probe_endpoints(
+        self,
+        targets: List[Dict[str, Any]],
+        samples: int = PROBE_SAMPLES,
+        timeout: float = PROBE_TIMEOUT,
+    ) -> List[Dict[str, Any]]:
+        """Sample every target concurrently and summarise each one"""
+        collected = self.sample_endpoints(targets, samples, timeout)
+        return [
+            self._summarize_samples(target["check"], target_samples)
+            for target, target_samples in zip(targets, collected)
+        ]
 
-        if not config:
-            return {"error": "Could not load environment configuration"}
+    def check_url_accessibility(
+        self, url: str, timeout: int = PROBE_TIMEOUT, samples: int = PROBE_SAMPLES
+    ) -> Dict[str, Any]:
+        """Check if URL is accessible"""
+        target = {"check": "base_url_check", "url": url}
+        return self.probe_endpoints([target], samples, timeout)[0]
 
-        results = {
-            "environment": env_name,
-            "name": env_info["name"],
-            "base_url_check": {},
-            "api_health_check": {},
+    def check_api_health(
+        self, api_url: str, timeout: int = PROBE_TIMEOUT, samples: int = PROBE_SAMPLES
+    ) -> Dict[str, Any]:
+        """Check API health endpoint"""
+        target = {
+            "check": "api_health_check",
+            "url": f"{api_url}?endpoint=health",
+            "expect_status": 200,
         }
+        return self.probe_endpoints([target], samples, timeout)[0]
+
+    def connectivity_targets(
+        self, env_name: str, config: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """Endpoints probed for one environment"""
+        return [
+            {
+                "environment": env_name,
+                "check": "base_url_check",
+                "url": config["environment"]["base_url"],
+            },
+            {
+                "environment": env_name,
+                "check": "api_health_check",
+                "url": f"{config['environment']['api_base_url']}?endpoint=health",
+                "expect_status": 200,
+            },
+        ]
 
-        # Check base URL
-        base_url = config["environment"]["base_url"]
-        print(f"🌐 Checking {env_info['name']} base URL: {base_url}")
-        results["base_url_check"] = self.check_url_accessibility(base_url)
+    def test_connectivity(
+        self,
+        env_names: List[str],
+        samples: int = PROBE_SAMPLES,
+        timeout: float = PROBE_TIMEOUT,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Probe all endpoints of several environments at once"""
+        results: Dict[str, Dict[str, Any]] = {}
+        targets: List[Dict[str, str]] = []
+
+        for env_name in env_names:
+            if env_name not in self.environments:
+                results[env_name] = {"error": f"Unknown environment: {env_name}"}
+                continue
+            config = self.load_environment_config(env_name)
+            if not config:
+                results[env_name] = {
+                    "error": "Could not load environment configuration"
+                }
+                continue
 
-        # Check API health
-        api_url = config["environment"]["api_base_url"]
-        print(f"🔗 Checking {env_info['name']} API: {api_url}")
-        results["api_health_check"] = self.check_api_health(api_url)
+            results[env_name] = {
+                "environment": env_name,
+                "name": self.environments[env_name]["name"],
+                "base_url_check": {},
+                "api_health_check": {},
+            }
+            display_name = self.environments[env_name]["name"]
+            for target in self.connectivity_targets(env_name, config):
+                print(f"🔗 Probing {display_name}: {target['url']}")
+                targets.append(target)
+
+        started = time.perf_counter()
+        for target, summary in zip(
+            targets, self.probe_endpoints(targets, samples, timeout)
+        ):
+            results[target["environment"]][target["check"]] = summary
+        if targets:
+            print(
+                f"⏱️  Probed {len(targets)} endpoints x {samples} samples "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
 
         return results
 
+    def test_environment_connectivity(
+        self, env_name: str, samples: int = PROBE_SAMPLES
+    ) -> Dict[str, Any]:
+        """Test connectivity to environment"""
+        return self.test_connectivity([env_name], samples)[env_name]
+
     def validate_environment_config(self, env_name: str) -> Dict[str, Any]:
         """Validate environment configuration"""
         config = self.load_environment_config(env_name)
@@ -236,6 +428,19 @@ class EnvironmentConfigurator:
 
         return validation_result
 
+    def _print_probe_stats(self, check: Dict[str, Any]) -> None:
+        """Print availability and latency of a probed endpoint"""
+        print(
+            f"  📶 Availability: {check['availability']}% "
+            f"of {check['samples']} samples"
+        )
+        latency = check.get("latency_ms")
+        if latency:
+            print(
+                f"  ⏱️  Latency: min {latency['min']}ms, "
+                f"median {latency['median']}ms, p95 {latency['p95']}ms"
+            )
+
     def print_environment_status(self, results: Dict[str, Any]) -> None:
         """Print environment status in a readable format"""
         env_name = results["environment"]
@@ -250,21 +455,21 @@ class EnvironmentConfigurator:
         print(f"\n🌐 Base URL Accessibility:")
         if base_check.get("accessible"):
             print(f"  ✅ Status: Accessible ({base_check['status_code']})")
-            print(f"  ⏱️  Response Time: {base_check['response_time']}s")
             if base_check.get("is_wordmate"):
                 print(f"  ✅ WordMate Detection: Confirmed")
             else:
                 print(f"  ⚠️  WordMate Detection: Not detected")
         else:
             print(f"  ❌ Status: Not accessible")
-            print(f"  🚫 Error: {base_check.get('error', 'Unknown error')}")
+            error = base_check.get("error") or "Too many failed samples"
+            print(f"  🚫 Error: {error}")
+        self._print_probe_stats(base_check)
 
         # API health check
         api_check = results["api_health_check"]
         print(f"\n🔗 API Health:")
         if api_check.get("healthy"):
             print(f"  ✅ Status: Healthy ({api_check['status_code']})")
-            print(f"  ⏱️  Response Time: {api_check['response_time']}s")
             if api_check.get("api_data"):
                 print(f"  📊 API Data: Available")
         else:
@@ -273,13 +478,17 @@ class EnvironmentConfigurator:
                 print(f"  📟 HTTP Status: {api_check['status_code']}")
             if api_check.get("error"):
                 print(f"  🚫 Error: {api_check['error']}")
+        self._print_probe_stats(api_check)
 
-    def run_full_validation(self, env_name: str = None) -> bool:
+    def run_full_validation(
+        self, env_name: str = None, samples: int = PROBE_SAMPLES
+    ) -> bool:
         """Run full validation for environment(s)"""
         environments_to_check = (
             [env_name] if env_name else list(self.environments.keys())
         )
         all_healthy = True
+        valid_environments = []
 
         print("🔍 WordMate Environment Validation")
         print("=" * 60)
@@ -301,8 +510,14 @@ class EnvironmentConfigurator:
                 for warning in config_validation["warnings"]:
                     print(f"   • {warning}")
 
-            # Test connectivity
-            connectivity_results = self.test_environment_connectivity(env)
+            valid_environments.append(env)
+
+        # Test connectivity of all valid environments concurrently
+        print()
+        connectivity = self.test_connectivity(valid_environments, samples)
+
+        for env in valid_environments:
+            connectivity_results = connectivity[env]
             if "error" in connectivity_results:
                 print(
                     f"❌ Connectivity test failed for {env}: {connectivity_results['error']}"
@@ -338,6 +553,201 @@ class EnvironmentConfigurator:
 
         return all_healthy
 
+    def _login_body(self, config: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Credentials probes log in with, if any
+
+        The environment's ``test_data.default_users.valid_user`` (from
+        ``DEV_TEST_USER``/``PROD_TEST_USER``...), unless ``MONITOR_USERNAME``
+        and ``MONITOR_PASSWORD`` name a dedicated probe account.
+        """
+        users = (config.get("test_data") or {}).get("default_users") or {}
+        valid_user = users.get("valid_user") or {}
+        username = os.getenv("MONITOR_USERNAME") or valid_user.get("username")
+        password = os.getenv("MONITOR_PASSWORD") or valid_user.get("password")
+        if not (username and password):
+            return None
+        return {"username": username, "password": password}
+
+    def run_preflight(
+        self,
+        env_name: str,
+        config: Dict[str, Any],
+        samples: int = PREFLIGHT_SAMPLES,
+        timeout: float = PREFLIGHT_TIMEOUT,
+    ) -> List[str]:
+        """Probe base URL, API health and login at once; return the failures
+
+        A check fails only when none of its samples succeed: the preflight
+        catches an environment that is down, not one that is merely slow.
+        Login is checked when the environment has test user credentials;
+        without them the check is skipped with a warning.
+        """
+        targets = self.connectivity_targets(env_name, config)
+        body = self._login_body(config)
+        if body is None:
+            print(
+                f"⚠️  Preflight login check skipped for {env_name}: no "
+                "test_data.default_users.valid_user credentials"
+            )
+        else:
+            targets.append(
+                {
+                    "environment": env_name,
+                    "check": "login",
+                    "method": "POST",
+                    "url": f"{config['environment']['api_base_url']}?endpoint=login",
+                    "json": body,
+                    "expect_status": 200,
+                }
+            )
+
+        failures = []
+        for target, summary in zip(
+            targets, self.probe_endpoints(targets, samples, timeout)
+        ):
+            if summary["availability"] > 0:
+                continue
+            reason = summary["error"] or f"HTTP {summary['status_code']}"
+            failures.append(
+                f"{PREFLIGHT_LABELS[target['check']]}: {reason} "
+                f"({target['url'].split('?')[0]}, {summary['samples']} samples)"
+            )
+        return failures
+
+    def monitor_targets(
+        self, env_name: str, config: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Endpoints sampled by the monitor, with their SLOs
+
+        SLO targets can be overridden per check under ``monitoring.slo`` in
+        the environment config. The login check needs the environment's
+        test user credentials (or ``MONITOR_USERNAME``/``MONITOR_PASSWORD``).
+        """
+        api_url = config["environment"]["api_base_url"]
+        slo_overrides = (config.get("monitoring") or {}).get("slo") or {}
+
+        targets = []
+        for check, spec in MONITOR_CHECKS.items():
+            body = None
+            if check == "login":
+                body = self._login_body(config)
+                if body is None:
+                    print(f"⚠️  No login credentials for {env_name}, skipping")
+                    continue
+
+            targets.append(
+                {
+                    "environment": env_name,
+                    "check": check,
+                    "method": spec["method"],
+                    "url": f"{api_url}{spec['endpoint']}",
+                    "json": body,
+                    "expect_status": spec.get("expect_status"),
+                    "slo": {**spec["slo"], **slo_overrides.get(check, {})},
+                }
+            )
+        return targets
+
+    def _monitor_tick(
+        self,
+        targets: List[Dict[str, Any]],
+        stores: Dict[str, MonitorStore],
+        timeout: float,
+        pool: ThreadPoolExecutor,
+    ) -> int:
+        """Sample every monitored endpoint once; return the new SLO breaches"""
+        when = datetime.now()
+        collected = self.sample_endpoints(targets, 1, timeout, pool)
+        breaches = 0
+        status = []
+
+        for target, (sample,) in zip(targets, collected):
+            check = target["check"]
+            label = f"{target['environment']}/{check}"
+            store = stores[target["environment"]]
+
+            elapsed_ms = sample["elapsed"] * 1000 if sample["ok"] else None
+            histogram = store.record(check, elapsed_ms, when)
+            outcome = f"{elapsed_ms:.0f}ms" if sample["ok"] else "✗"
+            status.append(f"{label} {outcome}")
+
+            reasons = evaluate_slo(
+                histogram, target["slo"], store.consecutive_failures[check]
+            )
+            if reasons and store.flag_breach(check, reasons, when):
+                breaches += 1
+                print(f"🚨 SLO breach {label}: " + "; ".join(reasons))
+
+        for store in stores.values():
+            store.flush()
+        print(f"[{when:%H:%M:%S}] " + ", ".join(status))
+        return breaches
+
+    def run_monitor(
+        self,
+        env_name: str = None,
+        interval: float = 60,
+        duration_minutes: float = 0,
+        monitor_dir: Path = None,
+        retention_days: int = RETENTION_DAYS,
+    ) -> bool:
+        """Probe the API at a fixed interval until stopped or ``duration_minutes``
+
+        Every tick takes one sample of each endpoint on a small, reused
+        thread pool, folds it into the hourly histograms and flags SLO
+        breaches. Returns False if any SLO was breached.
+        """
+        environments = [env_name] if env_name else list(self.environments.keys())
+        monitor_dir = monitor_dir or self.project_root / DEFAULT_MONITOR_DIR
+
+        targets: List[Dict[str, Any]] = []
+        stores: Dict[str, MonitorStore] = {}
+        for env in environments:
+            config = self.load_environment_config(env)
+            if not config:
+                continue
+            targets.extend(self.monitor_targets(env, config))
+            stores[env] = MonitorStore(monitor_dir, env, retention_days)
+
+        if not targets:
+            print("❌ Nothing to monitor")
+            return False
+
+        # A tick must finish before the next one is due
+        timeout = min(PROBE_TIMEOUT, interval)
+        deadline = (
+            time.monotonic() + duration_minutes * 60 if duration_minutes else math.inf
+        )
+        breaches = 0
+        ticks = 0
+
+        print(f"📡 Monitoring {len(targets)} endpoints every {interval}s")
+        print(f"   Histograms: {monitor_dir}")
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PROBE_WORKERS, len(targets))
+        ) as pool:
+            next_tick = time.monotonic()
+            try:
+                while time.monotonic() < deadline:
+                    breaches += self._monitor_tick(targets, stores, timeout, pool)
+                    ticks += 1
+
+                    # Fixed-rate schedule; ticks missed while probing are skipped
+                    # rather than run back to back
+                    now = time.monotonic()
+                    missed = max(1, math.ceil((now - next_tick) / interval))
+                    next_tick += interval * missed
+                    time.sleep(max(0.0, min(next_tick, deadline) - now))
+            except KeyboardInterrupt:
+                print("\n⏹️  Monitoring stopped")
+            finally:
+                for store in stores.values():
+                    store.flush()
+
+        print(f"\n📊 {ticks} ticks, {breaches} SLO breaches")
+        return breaches == 0
+
     def list_environments(self) -> None:
         """List available environments"""
         print("🌍 Available Environments:")
@@ -359,7 +769,7 @@ def main():
     parser.add_argument(
         "--environment",
         "-e",
-        choices=["dev", "production"],
+        choices=["dev", "production", "local"],
         help="Specific environment to validate",
     )
     parser.add_argument(
@@ -370,6 +780,41 @@ def main():
         action="store_true",
         help="Test connectivity only, skip config validation",
     )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=PROBE_SAMPLES,
+        help=f"Requests per endpoint (default: {PROBE_SAMPLES})",
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="Probe the API continuously, recording latency histograms",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=60,
+        help="Seconds between monitor probes (default: 60)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0,
+        help="Minutes to monitor for; 0 runs until interrupted (default: 0)",
+    )
+    parser.add_argument(
+        "--monitor-dir",
+        type=Path,
+        default=project_root / DEFAULT_MONITOR_DIR,
+        help=f"Where monitor histograms are kept (default: {DEFAULT_MONITOR_DIR})",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=RETENTION_DAYS,
+        help=f"Days of monitor files to keep (default: {RETENTION_DAYS})",
+    )
 
     args = parser.parse_args()
 
@@ -379,8 +824,18 @@ def main():
         configurator.list_environments()
         return 0
 
+    if args.monitor:
+        success = configurator.run_monitor(
+            args.environment,
+            args.interval,
+            args.duration,
+            args.monitor_dir,
+            args.retention_days,
+        )
+        return 0 if success else 1
+
     try:
-        success = configurator.run_full_validation(args.environment)
+        success = configurator.run_full_validation(args.environment, args.samples)
         return 0 if success else 1
     except KeyboardInterrupt:
         print("\n⚠️  Validation interrupted by user")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+WordMate Endpoint Monitoring
+
+Latency histograms, rotating storage and SLO evaluation behind
+``configure_environments.py --monitor``.
+
+Samples are folded into fixed latency buckets per check and hourly window,
+so memory use and file size stay constant however long the monitor runs.
+Each environment gets one JSON file per day under ``reports/monitoring``;
+files older than the retention period are deleted as new days start.
+
+A check breaches its SLO when, within the current window, its p95 latency
+or availability misses the target once enough samples were taken, or
+immediately after several consecutive failed samples.
+"""
+
+import json
+import math
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MONITOR_DIR = Path("reports") / "monitoring"
+RETENTION_DAYS = 7
+WINDOW_MINUTES = 60
+# Upper bounds of the latency buckets; slower samples land in an overflow bucket
+LATENCY_BUCKETS_MS = (
+    10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000
+)  # fmt: skip
+# Samples needed in a window before p95 and availability are judged
+MIN_WINDOW_SAMPLES = 20
+# Consecutive failed samples that flag a check as down straight away
+MAX_CONSECUTIVE_FAILURES = 3
+
+MONITOR_CHECKS = {
+    "health": {
+        "method": "GET",
+        "endpoint": "?endpoint=health",
+        "expect_status": 200,
+        "slo": {"p95_ms": 500, "availability": 99.0},
+    },
+    "vocabulario": {
+        "method": "GET",
+        "endpoint": "?endpoint=vocabulario&page=1&limit=20",
+        "slo": {"p95_ms": 1000, "availability": 99.0},
+    },
+    "grammarExercises": {
+        "method": "GET",
+        "endpoint": "?endpoint=grammarExercises",
+        "slo": {"p95_ms": 1000, "availability": 99.0},
+    },
+    "login": {
+        "method": "POST",
+        "endpoint": "?endpoint=login",
+        "expect_status": 200,
+        "slo": {"p95_ms": 1500, "availability": 99.0},
+    },
+}
+
+
+class LatencyHistogram:
+    """Bucketed latencies plus failure counts of one check and window"""
+
+    __slots__ = ("counts", "samples", "failures", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: Optional[float]) -> None:
+        """Add one sample; ``None`` marks a failed request"""
+        self.samples += 1
+        if elapsed_ms is None:
+            self.failures += 1
+            return
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound),
+            len(LATENCY_BUCKETS_MS),
+        )
+        self.counts[index] += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def availability(self) -> Optional[float]:
+        if not self.samples:
+            return None
+        return 100 * (self.samples - self.failures) / self.samples
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound of the bucket holding the percentile (max if overflowing)"""
+        successes = self.samples - self.failures
+        if not successes:
+            return None
+        rank = math.ceil(successes * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        successes = self.samples - self.failures
+        p95 = self.percentile(95)
+        return {
+            "samples": self.samples,
+            "failures": self.failures,
+            "mean_ms": round(self.total_ms / successes, 1) if successes else None,
+            "max_ms": round(self.max_ms, 1),
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "counts": self.counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        if len(data["counts"]) == len(histogram.counts):
+            histogram.counts = list(data["counts"])
+            histogram.samples = data["samples"]
+            histogram.failures = data["failures"]
+            histogram.max_ms = data["max_ms"]
+            histogram.total_ms = (data["mean_ms"] or 0) * (
+                data["samples"] - data["failures"]
+            )
+        return histogram
+
+
+def window_key(when: datetime) -> str:
+    """Start time (``HH:MM``) of the window ``when`` falls into"""
+    minute = when.minute - when.minute % WINDOW_MINUTES
+    return when.replace(minute=minute, second=0, microsecond=0).strftime("%H:%M")
+
+
+def evaluate_slo(
+    histogram: LatencyHistogram, slo: Dict[str, float], consecutive_failures: int
+) -> List[str]:
+    """Return the reasons a check currently misses its SLO"""
+    reasons = []
+    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+        reasons.append(f"{consecutive_failures} consecutive failed samples")
+    if histogram.samples < MIN_WINDOW_SAMPLES:
+        return reasons
+
+    availability = histogram.availability
+    if availability < slo["availability"]:
+        reasons.append(f"availability {availability:.1f}% < {slo['availability']}%")
+    p95 = histogram.percentile(95)
+    if p95 is not None and p95 > slo["p95_ms"]:
+        reasons.append(f"p95 {p95:.0f}ms > {slo['p95_ms']}ms")
+    return reasons
+
+
+class MonitorStore:
+    """Hourly histograms of one environment, persisted in daily files"""
+
+    def __init__(
+        self,
+        directory: Path,
+        environment: str,
+        retention_days: int = RETENTION_DAYS,
+    ):
+        self.directory = Path(directory)
+        self.environment = environment
+        self.retention_days = retention_days
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.day: Optional[str] = None
+        self.windows: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.breaches: List[Dict[str, Any]] = []
+        self.consecutive_failures: Dict[str, int] = {}
+
+    def _path(self, day: str) -> Path:
+        return self.directory / f"monitor_{self.environment}_{day}.json"
+
+    def _open_day(self, day: str) -> None:
+        """Switch to the file of ``day``, resuming it if it already exists"""
+        self.day = day
+        self.windows = {}
+        self.breaches = []
+        path = self._path(day)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    document = json.load(f)
+                self.windows = {
+                    window: {
+                        check: LatencyHistogram.from_dict(data)
+                        for check, data in checks.items()
+                    }
+                    for window, checks in document.get("windows", {}).items()
+                }
+                self.breaches = document.get("breaches", [])
+            except (OSError, ValueError, KeyError):
+                pass  # start the day afresh rather than stop monitoring
+        self.rotate()
+
+    def rotate(self) -> None:
+        """Delete daily files that fell out of the retention period"""
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime(
+            "%Y%m%d"
+        )
+        for path in self.directory.glob(f"monitor_{self.environment}_*.json"):
+            day = path.stem.rsplit("_", 1)[-1]
+            if day < cutoff:
+                path.unlink(missing_ok=True)
+
+    def record(
+        self, check: str, elapsed_ms: Optional[float], when: datetime
+    ) -> LatencyHistogram:
+        """Add a sample to the current window and return that window's histogram"""
+        day = when.strftime("%Y%m%d")
+        if day != self.day:
+            self.flush()
+            self._open_day(day)
+
+        histogram = self.windows.setdefault(window_key(when), {}).setdefault(
+            check, LatencyHistogram()
+        )
+        histogram.record(elapsed_ms)
+
+        failures = self.consecutive_failures.get(check, 0)
+        self.consecutive_failures[check] = failures + 1 if elapsed_ms is None else 0
+        return histogram
+
+    def flag_breach(self, check: str, reasons: List[str], when: datetime) -> bool:
+        """Record an SLO breach once per check and window; True if it is new"""
+        window = window_key(when)
+        if any(
+            breach["check"] == check and breach["window"] == window
+            for breach in self.breaches
+        ):
+            return False
+        self.breaches.append(
+            {
+                "check": check,
+                "window": window,
+                "time": when.isoformat(timespec="seconds"),
+                "reasons": reasons,
+            }
+        )
+        return True
+
+    def flush(self) -> None:
+        """Write the current day atomically"""
+        if self.day is None:
+            return
+        document = {
+            "environment": self.environment,
+            "day": self.day,
+            "window_minutes": WINDOW_MINUTES,
+            "bucket_bounds_ms": list(LATENCY_BUCKETS_MS),
+            "windows": {
+                window: {
+                    check: histogram.to_dict() for check, histogram in checks.items()
+                }
+                for window, checks in sorted(self.windows.items())
+            },
+            "breaches": self.breaches,
+        }
+        path = self._path(self.day)
+        temp_path = path.with_suffix(".json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(temp_path, path)
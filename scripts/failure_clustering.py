@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+WordMate Failure Clustering
+
+Groups failed tests that fail for the same reason. Messages are first
+normalized (IDs, timestamps, URLs and numbers stripped) and grouped by an
+exact signature hash; the resulting groups are then merged with
+MinHash/LSH so near-duplicate messages end up together while the cost
+stays close to linear in the number of distinct signatures.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+SIMILARITY_THRESHOLD = 0.7
+SHINGLE_SIZE = 3
+MAX_MESSAGE_LENGTH = 1000
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_NORMALIZERS = [
+    (re.compile(r"https?://\S+|www\.\S+"), "<URL>"),
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "<EMAIL>"),
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+            re.IGNORECASE,
+        ),
+        "<UUID>",
+    ),
+    (
+        re.compile(
+            r"\b\d{4}-?\d{2}-?\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?\b"
+        ),
+        "<TIMESTAMP>",
+    ),
+    (re.compile(r"\b\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?\b"), "<TIME>"),
+    (re.compile(r"\b\d{4}[-/]\d{2}[-/]\d{2}\b"), "<DATE>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE), "<HEX>"),
+    (re.compile(r"\b(?=[0-9a-f]*\d)[0-9a-f]{16,}\b", re.IGNORECASE), "<ID>"),
+    (re.compile(r"\b(?=\w*\d)[A-Za-z0-9_-]{24,}\b"), "<TOKEN>"),
+    (re.compile(r"(?<!\w)[-+]?\d+(?:\.\d+)?"), "<N>"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Deterministic permutation coefficients shared by every run
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.sha256(f"a{i}".encode()).digest()[:8], "big")
+        % (_MERSENNE_PRIME - 1)
+        + 1,
+        int.from_bytes(hashlib.sha256(f"b{i}".encode()).digest()[:8], "big")
+        % _MERSENNE_PRIME,
+    )
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+
+def normalize_message(message: str) -> str:
+    """Strip volatile values from a failure message"""
+    normalized = (message or "")[:MAX_MESSAGE_LENGTH]
+    for pattern, replacement in _NORMALIZERS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.strip()
+
+
+def message_signature(normalized: str) -> str:
+    """Exact signature of a normalized message"""
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def _shingles(normalized: str) -> set:
+    tokens = normalized.lower().split()
+    if len(tokens) <= SHINGLE_SIZE:
+        return {" ".join(tokens)}
+    return {
+        " ".join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(normalized: str) -> List[int]:
+    """MinHash signature over the word shingles of a message"""
+    hashes = [
+        int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for shingle in _shingles(normalized)
+    ]
+    return [
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def _estimated_similarity(left: List[int], right: List[int]) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left_root, right_root = self.find(left), self.find(right)
+        if left_root != right_root:
+            self.parent[max(left_root, right_root)] = min(left_root, right_root)
+
+
+def cluster_failures(
+    failed_tests: Iterable[Dict[str, Any]],
+    threshold: float = SIMILARITY_THRESHOLD,
+    max_examples: int = 5,
+) -> List[Dict[str, Any]]:
+    """Cluster failed tests by message and return clusters ranked by size
+
+    Each failed test dict needs ``name``, ``suite`` and ``message``.
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for test in failed_tests:
+        normalized = normalize_message(test.get("message", ""))
+        signature = message_signature(normalized)
+        group = groups.get(signature)
+        if group is None:
+            group = groups[signature] = {
+                "signature": signature,
+                "normalized": normalized,
+                "representative": test.get("message", ""),
+                "tests": [],
+            }
+        group["tests"].append(test)
+
+    signatures = list(groups)
+    union_find = _UnionFind(len(signatures))
+    sketches = [minhash(groups[signature]["normalized"]) for signature in signatures]
+
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    for band in range(LSH_BANDS):
+        buckets: Dict[tuple, int] = {}
+        for index, sketch in enumerate(sketches):
+            key = tuple(sketch[band * rows : (band + 1) * rows])
+            other = buckets.setdefault(key, index)
+            if other != index and (
+                _estimated_similarity(sketch, sketches[other]) >= threshold
+            ):
+                union_find.union(index, other)
+
+    merged: Dict[int, List[Dict[str, Any]]] = {}
+    for index, signature in enumerate(signatures):
+        merged.setdefault(union_find.find(index), []).append(groups[signature])
+
+    clusters = []
+    for members in merged.values():
+        members.sort(key=lambda group: len(group["tests"]), reverse=True)
+        tests = [test for group in members for test in group["tests"]]
+        suites = Counter(test.get("suite", "Unknown") for test in tests)
+        clusters.append(
+            {
+                "signature": members[0]["signature"],
+                "size": len(tests),
+                "representative": members[0]["representative"],
+                "normalized": members[0]["normalized"],
+                "variants": [group["normalized"] for group in members[1:max_examples]],
+                "suites": [
+                    {"name": name, "count": count}
+                    for name, count in suites.most_common()
+                ],
+                "examples": [test.get("name", "Unknown") for test in tests[:max_examples]],
+            }
+        )
+
+    clusters.sort(key=lambda cluster: (-cluster["size"], cluster["signature"]))
+    return clusters
+
+
+def largest_cluster_share(clusters: List[Dict[str, Any]]) -> Optional[float]:
+    """Fraction of all failures that belong to the largest cluster"""
+    total = sum(cluster["size"] for cluster in clusters)
+    if not total:
+        return None
+    return clusters[0]["size"] / total
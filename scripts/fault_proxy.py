@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+WordMate Fault-Injection Proxy
+
+Runs the fault-injection proxy of resources/libraries/fault_proxy.py on
+its own, in front of a WordMate environment or the local mock server.
+Point ``api_base_url`` (or a browser's ``--proxy-server``) at the proxy
+to see how timeouts, retries and waits cope with a degraded network.
+
+Scenarios are YAML files in config/fault_scenarios/: an ordered list of
+rules, each matching requests by a glob over path and query and adding
+latency, jitter, a bandwidth cap, connection resets, or 429/5xx answers
+at random or in bursts. While the proxy runs it can be controlled over
+HTTP:
+
+    GET    /__proxy/stats      counters per rule
+    GET    /__proxy/rules      active rules
+    PUT    /__proxy/scenario   replace the rules (YAML or JSON body)
+    DELETE /__proxy/rules      forward everything untouched
+    DELETE /__proxy/stats      zero the counters
+
+Usage:
+    python scripts/fault_proxy.py --target https://www.wordmate.es
+    python scripts/fault_proxy.py --scenario degraded_network --port 8888
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.fault_proxy import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    FaultInjectionProxy,
+    load_scenario,
+)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Latency and fault-injection proxy for WordMate",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --target https://www.wordmate.es --scenario degraded_network
+  %(prog)s --target http://127.0.0.1:8765 --scenario server_errors --seed 7
+  %(prog)s --port 8888 --scenario flaky_connections   # forward proxy only
+        """,
+    )
+    parser.add_argument(
+        "--target",
+        help="Origin plain-path requests are forwarded to; defaults to the "
+        "scenario's target",
+    )
+    parser.add_argument(
+        "--scenario",
+        help="Scenario file, or the name of one in config/fault_scenarios/",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for random faults")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    try:
+        scenario = load_scenario(args.scenario) if args.scenario else {}
+        proxy = FaultInjectionProxy(
+            target=args.target, host=args.host, port=args.port, verbose=args.verbose
+        )
+        proxy.load_scenario(scenario, args.seed)
+        proxy.start()
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"❌ Could not start fault proxy: {e}")
+        return 1
+
+    print(f"🚀 Fault proxy on {proxy.url} -> {proxy.target or 'forward proxy only'}")
+    if scenario:
+        print(f"   Scenario '{proxy.scenario_name}': {len(proxy.rules())} rules")
+    proxy.serve_forever()
+
+    print("📊 Fault proxy stats:")
+    print(json.dumps(proxy.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ Usage:
 import argparse
 import base64
 import json
+import math
 import os
 import shutil
 import sys
@@ -22,24 +23,32 @@ import webbrowser
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Dict, List, Optional
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-try:
-    import matplotlib
-
-    matplotlib.use("Agg")  # Use non-interactive backend
-    import matplotlib.dates as mdates
-    import matplotlib.pyplot as plt
-    from matplotlib.patches import Wedge
-
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Warning: matplotlib not available. Charts will not be generated.")
+from resources.libraries.load_engine import RESULTS_FILE_PREFIX, load_results
+from resources.libraries.transfer_stats import STATS_FILE_PREFIX, load_transfer_stats
+from scripts.failure_clustering import cluster_failures, largest_cluster_share
+from scripts.report_charts import CHART_BACKENDS, render_charts
+from scripts.report_export import EXPORT_FORMATS, export_results
+from scripts.report_history import (
+    DEFAULT_HISTORY_DB,
+    DEFAULT_QUARANTINE_FILE,
+    ResultsHistory,
+)
+from scripts.report_html import (
+    VIRTUAL_TABLE_CSS,
+    VIRTUAL_TABLE_JS,
+    escape,
+    virtual_table,
+    write_data_chunks,
+)
+from scripts.report_merge import deduplicate_attempts, select_output_files
+from scripts.report_model import ReportModel, SuiteRecord, parse_status_times
+from scripts.report_timeline import analyze_timeline
 
 try:
     from jinja2 import Environment, FileSystemLoader, Template
@@ -50,6 +59,35 @@ except ImportError:
     print("Warning: jinja2 not available. Using basic HTML generation.")
 
 
+MAX_HTML_CLUSTERS = 50
+# Endpoints averaging more than this per response are worth a look
+LARGE_RESPONSE_BYTES = 256 * 1024
+
+
+def _status_start(status_element: Optional[ET.Element]) -> Optional[str]:
+    """Raw start timestamp of a status element (RF < 7 and RF 7+ formats)"""
+    if status_element is None:
+        return None
+    return status_element.get("start") or status_element.get("starttime")
+
+
+def _status_end(status_element: Optional[ET.Element]) -> Optional[str]:
+    """End timestamp of a status element
+
+    RF < 7 records ``endtime``; RF 7+ only has ``start`` and ``elapsed``, so
+    the end is derived from them in the same ISO format.
+    """
+    if status_element is None:
+        return None
+    end_time = status_element.get("endtime")
+    if end_time:
+        return end_time
+    _, end, _ = parse_status_times(status_element)
+    if math.isnan(end):
+        return None
+    return datetime.fromtimestamp(end).isoformat(timespec="microseconds")
+
+
 class WordMateReportGenerator:
     """Enhanced test report generator for WordMate test results"""
 
@@ -58,6 +96,11 @@ class WordMateReportGenerator:
         self.templates_dir = self.project_root / "templates" / "reports"
         self.charts_dir = Path("charts")
 
+        # Column store holding every parsed test
+        self.model = ReportModel()
+        # Output file path -> run it belongs to (see report_merge)
+        self.output_runs: Dict[str, str] = {}
+
         # Report data structure
         self.report_data = {
             "meta": {
@@ -71,6 +114,8 @@ class WordMateReportGenerator:
                 "failed_tests": 0,
                 "skipped_tests": 0,
                 "error_tests": 0,
+                "retried_tests": 0,
+                "passed_on_rerun": 0,
                 "success_rate": 0.0,
                 "execution_time_seconds": 0,
                 "environments": [],
@@ -80,7 +125,16 @@ class WordMateReportGenerator:
             "details": {
                 "test_suites": [],
                 "failed_tests": [],
+                "failure_clusters": [],
+                "duration_regressions": [],
+                "retried_tests": [],
+                "runs": {},
+                "flaky_tests": [],
+                "skipped_files": [],
+                "timeline": None,
                 "performance_metrics": {},
+                "transfer_stats": [],
+                "load_tests": [],
                 "trends": [],
                 "coverage": {},
             },
@@ -101,22 +155,54 @@ class WordMateReportGenerator:
 
     def parse_robot_output_files(self, input_dir: Path) -> None:
         """Parse Robot Framework output XML files"""
+        if self.load_robot_output_files(input_dir):
+            self._calculate_summary_statistics()
+
+    def load_robot_output_files(self, input_dir: Path) -> bool:
+        """Parse output files into the model, keeping each test's last attempt
+
+        Returns False when the directory holds no XML files.
+        """
         xml_files = list(input_dir.rglob("*.xml"))
 
         if not xml_files:
             print(f"No XML files found in {input_dir}")
-            return
+            return False
 
-        print(f"Processing {len(xml_files)} XML files...")
+        # Skip merged copies and non-Robot XML before paying for a full parse
+        output_files, skipped = select_output_files(xml_files)
+        self.report_data["details"]["skipped_files"] = [
+            {"file": str(path), "reason": reason} for path, reason in skipped
+        ]
+        if skipped:
+            print(f"Skipping {len(skipped)} redundant or non-Robot XML files")
+
+        print(f"Processing {len(output_files)} XML files...")
+        self.output_runs = {
+            str(output_file.path): output_file.run for output_file in output_files
+        }
+        runs = self.report_data["details"]["runs"]
+        for output_file in output_files:
+            runs.setdefault(output_file.run, []).append(str(output_file.path))
+        if len(runs) > 1:
+            print(f"Found {len(runs)} separate runs, kept as separate results")
 
-        for xml_file in xml_files:
+        for output_file in output_files:
             try:
-                self._parse_single_xml_file(xml_file)
+                self._parse_single_xml_file(output_file.path)
             except Exception as e:
-                print(f"Error parsing {xml_file}: {e}")
+                print(f"Error parsing {output_file.path}: {e}")
                 continue
 
-        self._calculate_summary_statistics()
+        # Keep only the last attempt of tests that were run more than once
+        self.model, retried_tests = deduplicate_attempts(
+            self.model, self.output_runs
+        )
+        self.report_data["details"]["retried_tests"] = retried_tests
+        if retried_tests:
+            print(f"Merged {len(retried_tests)} re-executed tests into their last attempt")
+
+        return True
 
     def _parse_single_xml_file(self, xml_file: Path) -> None:
         """Parse single Robot Framework XML file"""
@@ -124,16 +210,8 @@ class WordMateReportGenerator:
             tree = ET.parse(xml_file)
             root = tree.getroot()
 
-            # Extract suite information
-            suite_info = self._extract_suite_info(root, xml_file)
-            if suite_info:
-                self.report_data["details"]["test_suites"].append(suite_info)
-
-            # Extract test statistics
-            self._extract_test_statistics(root)
-
-            # Extract failed tests
-            self._extract_failed_tests(root, xml_file)
+            # Extract suite information and tests into the column model
+            self._extract_suite_info(root, xml_file)
 
             # Extract performance metrics
             self._extract_performance_metrics(root, xml_file)
@@ -143,357 +221,229 @@ class WordMateReportGenerator:
         except Exception as e:
             print(f"Unexpected error parsing {xml_file}: {e}")
 
-    def _extract_suite_info(self, root: ET.Element, xml_file: Path) -> Dict[str, Any]:
+    def _extract_suite_info(
+        self, root: ET.Element, xml_file: Path
+    ) -> Optional[SuiteRecord]:
         """Extract test suite information"""
-        suite_element = root.find(".//suite")
+        suite_element = root.find("suite")
+        if suite_element is None:
+            suite_element = root.find(".//suite")
         if suite_element is None:
             return None
 
-        suite_info = {
-            "name": suite_element.get("name", "Unknown"),
-            "source": suite_element.get("source", str(xml_file)),
-            "file": str(xml_file),
-            "tests": [],
-            "statistics": {"total": 0, "passed": 0, "failed": 0, "skipped": 0},
-            "execution_time": 0,
-            "start_time": None,
-            "end_time": None,
-        }
-
-        # Extract suite timing
-        status_element = suite_element.find(".//status")
+        status_element = suite_element.find("status")
+        _, _, elapsed = parse_status_times(status_element)
+
+        suite_record = SuiteRecord(
+            name=suite_element.get("name", "Unknown"),
+            source=suite_element.get("source", str(xml_file)),
+            file=str(xml_file),
+            start_time=_status_start(status_element),
+            end_time=_status_end(status_element),
+            execution_time=elapsed,
+            first_test=len(self.model),
+        )
+        self.model.add_suite(suite_record)
+
+        # Extract individual tests, keeping the innermost suite of each test
+        self._extract_suite_tests(suite_element, suite_record.name, xml_file)
+        self.model.close_suite(suite_record)
+
+        return suite_record
+
+    def _extract_suite_tests(
+        self, suite_element: ET.Element, suite_name: str, xml_file: Path
+    ) -> None:
+        """Add the tests of a suite and its child suites to the model"""
+        for test_element in suite_element.findall("test"):
+            self._extract_test_info(test_element, suite_name, xml_file)
+
+        for child_suite in suite_element.findall("suite"):
+            child_name = f"{suite_name}.{child_suite.get('name', 'Unknown')}"
+            self._extract_suite_tests(child_suite, child_name, xml_file)
+
+    def _extract_test_info(
+        self, test_element: ET.Element, suite_name: str, xml_file: Path
+    ) -> int:
+        """Extract individual test information into the model"""
+        # The test's own status is a direct child; nested ones belong to keywords
+        status_element = test_element.find("status")
+        start, end, elapsed = parse_status_times(status_element)
+        status = "UNKNOWN"
+        message = ""
         if status_element is not None:
-            suite_info["start_time"] = status_element.get("starttime")
-            suite_info["end_time"] = status_element.get("endtime")
-            elapsed = status_element.get("elapsed")
-            if elapsed:
-                suite_info["execution_time"] = (
-                    int(elapsed) / 1000.0
-                )  # Convert to seconds
-
-        # Extract individual tests
-        for test_element in suite_element.findall(".//test"):
-            test_info = self._extract_test_info(test_element)
-            if test_info:
-                suite_info["tests"].append(test_info)
-                suite_info["statistics"]["total"] += 1
-                if test_info["status"] == "PASS":
-                    suite_info["statistics"]["passed"] += 1
-                elif test_info["status"] == "FAIL":
-                    suite_info["statistics"]["failed"] += 1
-                else:
-                    suite_info["statistics"]["skipped"] += 1
-
-        return suite_info
-
-    def _extract_test_info(self, test_element: ET.Element) -> Dict[str, Any]:
-        """Extract individual test information"""
-        test_info = {
-            "name": test_element.get("name", "Unknown"),
-            "status": "UNKNOWN",
-            "message": "",
-            "tags": [],
-            "keywords": [],
-            "execution_time": 0,
-            "start_time": None,
-            "end_time": None,
-        }
+            status = status_element.get("status", "UNKNOWN")
+            message = status_element.text or ""
 
-        # Extract test status
-        status_element = test_element.find(".//status")
-        if status_element is not None:
-            test_info["status"] = status_element.get("status", "UNKNOWN")
-            test_info["message"] = status_element.text or ""
-            test_info["start_time"] = status_element.get("starttime")
-            test_info["end_time"] = status_element.get("endtime")
-            elapsed = status_element.get("elapsed")
-            if elapsed:
-                test_info["execution_time"] = int(elapsed) / 1000.0
-
-        # Extract tags
-        tags_element = test_element.find(".//tags")
-        if tags_element is not None:
-            for tag in tags_element.findall("tag"):
-                test_info["tags"].append(tag.text)
+        # Extract tags (RF 7 writes them directly under <test>)
+        tags_parent = test_element.find("tags")
+        if tags_parent is None:
+            tags_parent = test_element
+        tags = [tag.text for tag in tags_parent.findall("tag") if tag.text]
 
         # Extract keywords (simplified)
-        for kw_element in test_element.findall(".//kw"):
-            kw_name = kw_element.get("name", "Unknown")
-            kw_status = kw_element.find(".//status")
-            kw_status_text = (
-                kw_status.get("status") if kw_status is not None else "UNKNOWN"
+        keywords = []
+        for kw_element in test_element.iter("kw"):
+            kw_status = kw_element.find("status")
+            keywords.append(
+                (
+                    kw_element.get("name", "Unknown"),
+                    kw_status.get("status") if kw_status is not None else "UNKNOWN",
+                )
             )
-            test_info["keywords"].append({"name": kw_name, "status": kw_status_text})
-
-        return test_info
-
-    def _extract_test_statistics(self, root: ET.Element) -> None:
-        """Extract overall test statistics"""
-        stats_element = root.find(".//statistics/total/stat")
-        if stats_element is not None:
-            passed = int(stats_element.get("pass", 0))
-            failed = int(stats_element.get("fail", 0))
 
-            self.report_data["summary"]["passed_tests"] += passed
-            self.report_data["summary"]["failed_tests"] += failed
-            self.report_data["summary"]["total_tests"] += passed + failed
+        return self.model.add_test(
+            suite=suite_name,
+            name=test_element.get("name", "Unknown"),
+            status=status,
+            duration=elapsed,
+            start_time=start,
+            end_time=end,
+            tags=tags,
+            keywords=keywords,
+            message=message,
+            file=str(xml_file),
+        )
 
-    def _extract_failed_tests(self, root: ET.Element, xml_file: Path) -> None:
+    def _extract_failed_tests(self) -> None:
         """Extract information about failed tests"""
-        for test_element in root.findall(".//test"):
-            status_element = test_element.find(".//status")
-            if status_element is not None and status_element.get("status") == "FAIL":
-                failed_test = {
-                    "name": test_element.get("name", "Unknown"),
-                    "suite": root.find(".//suite").get("name", "Unknown"),
-                    "message": status_element.text or "No error message",
-                    "file": str(xml_file),
-                    "tags": [],
+        failed_tests = []
+        for index in self.model.indices_with_status("FAIL"):
+            test = self.model.test(index)
+            failed_tests.append(
+                {
+                    "name": test.name,
+                    "suite": test.suite,
+                    "message": test.message or "No error message",
+                    "file": test.file,
+                    "tags": test.tags,
                 }
+            )
 
-                # Extract tags
-                tags_element = test_element.find(".//tags")
-                if tags_element is not None:
-                    for tag in tags_element.findall("tag"):
-                        failed_test["tags"].append(tag.text)
-
-                self.report_data["details"]["failed_tests"].append(failed_test)
+        self.report_data["details"]["failed_tests"] = failed_tests
+        self.report_data["details"]["failure_clusters"] = cluster_failures(
+            failed_tests
+        )
 
     def _extract_performance_metrics(self, root: ET.Element, xml_file: Path) -> None:
         """Extract performance metrics from test results"""
-        suite_element = root.find(".//suite")
+        suite_element = root.find("suite")
         if suite_element is not None:
-            status_element = suite_element.find(".//status")
+            status_element = suite_element.find("status")
             if status_element is not None:
-                elapsed = status_element.get("elapsed")
-                if elapsed:
-                    execution_time = int(elapsed) / 1000.0
-                    self.report_data["summary"][
-                        "execution_time_seconds"
-                    ] += execution_time
-
-                    # Store per-file metrics
-                    file_key = str(xml_file.name)
-                    self.report_data["details"]["performance_metrics"][file_key] = {
-                        "execution_time": execution_time,
-                        "test_count": len(list(root.findall(".//test"))),
-                    }
-
-    def _calculate_summary_statistics(self) -> None:
-        """Calculate summary statistics"""
-        total = self.report_data["summary"]["total_tests"]
-        passed = self.report_data["summary"]["passed_tests"]
-
-        if total > 0:
-            self.report_data["summary"]["success_rate"] = (passed / total) * 100
-
-        # Extract unique environments and browsers from test data
-        environments = set()
-        browsers = set()
-        test_suites = set()
-
-        for suite in self.report_data["details"]["test_suites"]:
-            test_suites.add(suite["name"])
-            for test in suite["tests"]:
-                for tag in test["tags"]:
-                    if tag in ["dev", "production", "staging"]:
-                        environments.add(tag)
-                    elif tag in ["chrome", "firefox", "edge", "safari"]:
-                        browsers.add(tag)
-
-        self.report_data["summary"]["environments"] = list(environments)
-        self.report_data["summary"]["browsers"] = list(browsers)
-        self.report_data["summary"]["test_suites"] = list(test_suites)
-
-    def generate_charts(self, output_dir: Path) -> None:
-        """Generate charts and visualizations"""
-        if not MATPLOTLIB_AVAILABLE:
-            print("Skipping chart generation - matplotlib not available")
-            return
-
-        charts_output_dir = output_dir / self.charts_dir
-        charts_output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate pie chart for test results
-        self._generate_test_results_pie_chart(charts_output_dir)
-
-        # Generate execution time chart
-        self._generate_execution_time_chart(charts_output_dir)
-
-        # Generate test suite comparison chart
-        self._generate_test_suite_chart(charts_output_dir)
-
-        print(f"Charts generated in {charts_output_dir}")
-
-    def _generate_test_results_pie_chart(self, charts_dir: Path) -> None:
-        """Generate pie chart for test results"""
-        try:
-            passed = self.report_data["summary"]["passed_tests"]
-            failed = self.report_data["summary"]["failed_tests"]
-
-            if passed == 0 and failed == 0:
-                return
-
-            fig, ax = plt.subplots(figsize=(8, 6))
-
-            labels = []
-            sizes = []
-            colors = []
-
-            if passed > 0:
-                labels.append(f"Passed ({passed})")
-                sizes.append(passed)
-                colors.append("#28a745")
-
-            if failed > 0:
-                labels.append(f"Failed ({failed})")
-                sizes.append(failed)
-                colors.append("#dc3545")
-
-            ax.pie(
-                sizes, labels=labels, colors=colors, autopct="%1.1f%%", startangle=90
-            )
-            ax.set_title("Test Results Distribution", fontsize=16, fontweight="bold")
-
-            plt.tight_layout()
-            chart_path = charts_dir / "test_results_pie.png"
-            plt.savefig(chart_path, dpi=150, bbox_inches="tight")
-            plt.close()
-
-            self.report_data["charts"].append(
-                {
-                    "name": "Test Results Distribution",
-                    "file": str(chart_path.name),
-                    "type": "pie",
+                _, _, execution_time = parse_status_times(status_element)
+                self.report_data["summary"]["execution_time_seconds"] += execution_time
+
+                # Store per-file metrics
+                file_key = str(xml_file.name)
+                self.report_data["details"]["performance_metrics"][file_key] = {
+                    "execution_time": execution_time,
+                    "test_count": sum(1 for _ in suite_element.iter("test")),
                 }
-            )
-
-        except Exception as e:
-            print(f"Error generating pie chart: {e}")
-
-    def _generate_execution_time_chart(self, charts_dir: Path) -> None:
-        """Generate execution time chart"""
-        try:
-            performance_data = self.report_data["details"]["performance_metrics"]
-
-            if not performance_data:
-                return
-
-            files = list(performance_data.keys())
-            times = [performance_data[f]["execution_time"] for f in files]
-
-            fig, ax = plt.subplots(figsize=(12, 6))
 
-            bars = ax.bar(range(len(files)), times, color="#007bff", alpha=0.7)
-            ax.set_xlabel("Test Files")
-            ax.set_ylabel("Execution Time (seconds)")
-            ax.set_title("Execution Time by Test File", fontsize=16, fontweight="bold")
-            ax.set_xticks(range(len(files)))
-            ax.set_xticklabels(
-                [f[:20] + "..." if len(f) > 20 else f for f in files],
-                rotation=45,
-                ha="right",
+    def load_transfer_stats(self, input_dir: Path) -> None:
+        """Merge the per-process API transfer stats written by WordmateAPI"""
+        stats_files = sorted(input_dir.rglob(f"{STATS_FILE_PREFIX}*.json"))
+        if stats_files:
+            self.report_data["details"]["transfer_stats"] = load_transfer_stats(
+                stats_files
             )
 
-            # Add value labels on bars
-            for bar, time in zip(bars, times):
-                height = bar.get_height()
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + 0.1,
-                    f"{time:.1f}s",
-                    ha="center",
-                    va="bottom",
-                )
-
-            plt.tight_layout()
-            chart_path = charts_dir / "execution_time_chart.png"
-            plt.savefig(chart_path, dpi=150, bbox_inches="tight")
-            plt.close()
-
-            self.report_data["charts"].append(
-                {
-                    "name": "Execution Time by Test File",
-                    "file": str(chart_path.name),
-                    "type": "bar",
-                }
-            )
-
-        except Exception as e:
-            print(f"Error generating execution time chart: {e}")
+    def load_load_test_results(self, input_dir: Path) -> None:
+        """Collect the load test results written by LoadTest and load_test.py"""
+        results_files = sorted(input_dir.rglob(f"{RESULTS_FILE_PREFIX}*.json"))
+        if results_files:
+            self.report_data["details"]["load_tests"] = load_results(results_files)
 
-    def _generate_test_suite_chart(self, charts_dir: Path) -> None:
-        """Generate test suite comparison chart"""
-        try:
-            suites = self.report_data["details"]["test_suites"]
-
-            if not suites:
-                return
+    def _calculate_summary_statistics(self) -> None:
+        """Calculate summary statistics"""
+        summary = self.report_data["summary"]
+        counts = self.model.status_counts()
+
+        summary["passed_tests"] = counts["PASS"]
+        summary["failed_tests"] = counts["FAIL"]
+        summary["skipped_tests"] = counts["SKIP"] + counts["NOT RUN"]
+        summary["error_tests"] = counts["UNKNOWN"]
+        retried_tests = self.report_data["details"]["retried_tests"]
+        summary["retried_tests"] = len(retried_tests)
+        summary["passed_on_rerun"] = sum(
+            1 for test in retried_tests if test["passed_on_rerun"]
+        )
+        summary["total_tests"] = len(self.model)
 
-            suite_names = [
-                suite["name"][:15] + "..." if len(suite["name"]) > 15 else suite["name"]
-                for suite in suites
-            ]
-            passed_counts = [suite["statistics"]["passed"] for suite in suites]
-            failed_counts = [suite["statistics"]["failed"] for suite in suites]
+        total = summary["total_tests"]
+        passed = summary["passed_tests"]
 
-            fig, ax = plt.subplots(figsize=(12, 8))
+        if total > 0:
+            summary["success_rate"] = (passed / total) * 100
+
+        self.report_data["details"]["test_suites"] = [
+            suite.to_dict() for suite in self.model.suite_records
+        ]
+        self._extract_failed_tests()
+        self.report_data["details"]["timeline"] = analyze_timeline(self.model)
+
+        # Extract unique environments and browsers from the interned tags
+        tags = set(self.model.used_tags())
+        summary["environments"] = sorted(tags & {"dev", "production", "staging"})
+        summary["browsers"] = sorted(tags & {"chrome", "firefox", "edge", "safari"})
+        summary["test_suites"] = sorted(
+            {suite.name for suite in self.model.suite_records}
+        )
 
-            x = range(len(suite_names))
-            width = 0.35
+    def update_history(
+        self,
+        history_db: Path,
+        environment: str = None,
+        report_type: str = None,
+        quarantine_file: Optional[Path] = None,
+    ) -> None:
+        """Record each run in the history and score regressions and flakiness
+
+        Separate runs found in the input are recorded as separate history
+        runs, oldest first, each with only its own re-executions.
+        """
+        run_rows: Dict[str, List[int]] = {}
+        for index in range(len(self.model)):
+            run = self.output_runs.get(self.model.test(index).file, "")
+            run_rows.setdefault(run, []).append(index)
+
+        with ResultsHistory(history_db) as history:
+            for run, rows in sorted(run_rows.items(), key=lambda item: item[1][0]):
+                attempts = {
+                    test["test_id"]: [attempt["status"] for attempt in test["attempts"]]
+                    for test in self.report_data["details"]["retried_tests"]
+                    if test["run"] == run
+                }
+                model = self.model if len(run_rows) == 1 else self.model.subset(rows)
+                run_id = history.ingest_run(
+                    model, environment, report_type, attempts=attempts
+                )
+                if run_id is None:
+                    print(f"Run already recorded in {history_db}")
+                else:
+                    print(f"Run {run_id} recorded in {history_db}")
 
-            bars1 = ax.bar(
-                [i - width / 2 for i in x],
-                passed_counts,
-                width,
-                label="Passed",
-                color="#28a745",
-                alpha=0.8,
+            self.report_data["details"]["duration_regressions"] = (
+                history.duration_regressions()
             )
-            bars2 = ax.bar(
-                [i + width / 2 for i in x],
-                failed_counts,
-                width,
-                label="Failed",
-                color="#dc3545",
-                alpha=0.8,
+            self.report_data["details"]["flaky_tests"] = history.flaky_tests(
+                min_flip_rate=0.0, limit=50
             )
+            if quarantine_file:
+                quarantined = history.write_quarantine_file(quarantine_file)
+                print(f"{len(quarantined)} flaky tests quarantined in {quarantine_file}")
 
-            ax.set_xlabel("Test Suites")
-            ax.set_ylabel("Number of Tests")
-            ax.set_title("Test Results by Suite", fontsize=16, fontweight="bold")
-            ax.set_xticks(x)
-            ax.set_xticklabels(suite_names, rotation=45, ha="right")
-            ax.legend()
-
-            # Add value labels on bars
-            for bars in [bars1, bars2]:
-                for bar in bars:
-                    height = bar.get_height()
-                    if height > 0:
-                        ax.text(
-                            bar.get_x() + bar.get_width() / 2.0,
-                            height + 0.1,
-                            f"{int(height)}",
-                            ha="center",
-                            va="bottom",
-                        )
-
-            plt.tight_layout()
-            chart_path = charts_dir / "test_suite_comparison.png"
-            plt.savefig(chart_path, dpi=150, bbox_inches="tight")
-            plt.close()
-
-            self.report_data["charts"].append(
-                {
-                    "name": "Test Results by Suite",
-                    "file": str(chart_path.name),
-                    "type": "bar",
-                }
-            )
+    def generate_charts(self, output_dir: Path, backend: str = "auto") -> None:
+        """Generate charts and visualizations"""
+        if backend == "none":
+            print("Skipping chart generation")
+            return
 
-        except Exception as e:
-            print(f"Error generating test suite chart: {e}")
+        charts_output_dir = output_dir / self.charts_dir
+        self.report_data["charts"] = render_charts(
+            self.report_data, charts_output_dir, backend
+        )
 
     def generate_recommendations(self) -> None:
         """Generate recommendations based on test results"""
@@ -532,6 +482,96 @@ class WordMateReportGenerator:
                 }
             )
 
+        # Parallel execution recommendations
+        timeline = self.report_data["details"]["timeline"]
+        if timeline and timeline["workers"] > 1:
+            efficiency = timeline["parallel_efficiency_percent"]
+            critical_path = timeline["critical_path"]
+            wall_clock = timeline["wall_clock_seconds"]
+            if critical_path["longest_unit_seconds"] >= 0.8 * wall_clock:
+                recommendations.append(
+                    {
+                        "type": "info",
+                        "title": "Run Bound by One Suite",
+                        "message": f"{critical_path['longest_unit']} alone takes {critical_path['longest_unit_seconds']:.0f}s "
+                        f"of the {timeline['wall_clock_seconds']:.0f}s wall-clock; more processes will not help.",
+                        "action": "Split the suite or run pabot with --testlevelsplit",
+                    }
+                )
+            elif efficiency < 70:
+                recommendations.append(
+                    {
+                        "type": "warning",
+                        "title": "Unbalanced Parallel Run",
+                        "message": f"Parallel efficiency is {efficiency:.1f}% across {timeline['workers']} workers; "
+                        f"{timeline['idle_seconds']:.0f}s of worker time was idle.",
+                        "action": "Rebalance suites (pabot --ordering) or reduce the number of processes",
+                    }
+                )
+
+        # Duration regression recommendations
+        regressions = self.report_data["details"]["duration_regressions"]
+        if regressions:
+            slowest = regressions[0]
+            recommendations.append(
+                {
+                    "type": "warning",
+                    "title": "Tests Got Slower",
+                    "message": f"{len(regressions)} tests or suites slowed down compared to their history. "
+                    f"Largest: {slowest['name']} (+{slowest['added_seconds']:.1f}s since run {slowest['change_run']}).",
+                    "action": "Review recent changes to the slowed-down tests, waits and environments",
+                }
+            )
+
+        # API transfer recommendations
+        large_endpoints = [
+            row
+            for row in self.report_data["details"]["transfer_stats"]
+            if row["avg_decoded_bytes"] >= LARGE_RESPONSE_BYTES
+        ]
+        if large_endpoints:
+            largest = large_endpoints[0]
+            uncompressed = [
+                row["endpoint"]
+                for row in large_endpoints
+                if row["compressed_share"] < 0.5
+            ]
+            recommendations.append(
+                {
+                    "type": "info",
+                    "title": "Large API Responses",
+                    "message": f"{len(large_endpoints)} endpoints average over {LARGE_RESPONSE_BYTES // 1024} KB per response; "
+                    f"{largest['endpoint']} moved {largest['wire_bytes'] / 1e6:.1f} MB on the wire "
+                    f"({largest['decoded_bytes'] / 1e6:.1f} MB decoded)."
+                    + (
+                        f" Mostly uncompressed: {', '.join(uncompressed)}."
+                        if uncompressed
+                        else ""
+                    ),
+                    "action": "Enable response compression on the server or request smaller pages (limit)",
+                }
+            )
+
+        # Load test recommendations
+        missed = [
+            (run["scenario"], check)
+            for run in self.report_data["details"]["load_tests"]
+            for check in run["thresholds"]
+            if not check["passed"]
+        ]
+        if missed:
+            recommendations.append(
+                {
+                    "type": "warning",
+                    "title": "Load Test Thresholds Missed",
+                    "message": "; ".join(
+                        f"{scenario}: {check['step']} {check['metric']} {check['actual']} (limit {check['limit']})"
+                        for scenario, check in missed[:5]
+                    ),
+                    "action": "Compare the steps' latency histograms with earlier runs and check the environment under load",
+                }
+            )
+
         # Failed test recommendations
         failed_count = len(self.report_data["details"]["failed_tests"])
         if failed_count > 10:
@@ -544,6 +584,48 @@ class WordMateReportGenerator:
                 }
             )
 
+        # Flakiness recommendations
+        quarantined = [
+            test
+            for test in self.report_data["details"]["flaky_tests"]
+            if test["quarantined_since"] is not None
+        ]
+        if quarantined:
+            recommendations.append(
+                {
+                    "type": "warning",
+                    "title": "Flaky Tests Quarantined",
+                    "message": f"{len(quarantined)} tests flip between pass and fail; the flakiest is "
+                    f"{quarantined[0]['test']} ({quarantined[0]['flip_rate']:.0%} of attempts flip).",
+                    "action": "Fix and release quarantined tests; run_tests.py runs them separately with retries",
+                }
+            )
+
+        # Rerun recommendations
+        passed_on_rerun = self.report_data["summary"]["passed_on_rerun"]
+        if passed_on_rerun:
+            recommendations.append(
+                {
+                    "type": "warning",
+                    "title": "Tests Passed Only on Rerun",
+                    "message": f"{passed_on_rerun} tests failed first and passed when re-executed.",
+                    "action": "Treat these tests as flaky and stabilize them before they hide real failures",
+                }
+            )
+
+        # Common failure cause recommendations
+        clusters = self.report_data["details"]["failure_clusters"]
+        top_share = largest_cluster_share(clusters)
+        if failed_count > 10 and top_share and top_share >= 0.5:
+            recommendations.append(
+                {
+                    "type": "critical",
+                    "title": "Common Failure Cause",
+                    "message": f"{clusters[0]['size']} of {failed_count} failures share one cause: {clusters[0]['representative'][:200]}",
+                    "action": "Fix the shared root cause before triaging individual failures",
+                }
+            )
+
         # Coverage recommendations
         total_tests = self.report_data["summary"]["total_tests"]
         if total_tests < 50:
@@ -561,32 +643,150 @@ class WordMateReportGenerator:
     def generate_html_report(
         self, output_dir: Path, environment: str = None, report_type: str = "standard"
     ) -> Path:
-        """Generate comprehensive HTML report"""
+        """Generate comprehensive HTML report
+
+        The page is streamed straight to disk; per-test and failure rows are
+        written as compressed data shards loaded on demand by the page.
+        """
         # Generate recommendations
         self.generate_recommendations()
 
+        # Write test and failure rows as sharded data files
+        tables = {
+            "tests": write_data_chunks(
+                output_dir,
+                "tests",
+                ["Test", "Suite", "Status", "Time (s)", "Tags", "Message"],
+                self._iter_test_rows(),
+            ),
+            "failures": write_data_chunks(
+                output_dir,
+                "failures",
+                ["Test", "Suite", "Error", "Tags"],
+                self._iter_failure_rows(),
+            ),
+        }
+
         # Prepare template data
         template_data = {
             "report": self.report_data,
             "environment": environment or "unknown",
             "report_type": report_type,
             "charts_dir": str(self.charts_dir),
+            "tables": tables,
         }
 
         # Generate HTML content
         if self.jinja_env and self._template_exists("report_template.html"):
-            html_content = self._generate_html_with_template(template_data)
+            html_parts = self._iter_html_with_template(template_data)
         else:
-            html_content = self._generate_html_fallback(template_data)
+            html_parts = self._iter_html_fallback(template_data)
 
         # Write HTML file
         report_file = output_dir / f"wordmate_test_report_{report_type}.html"
         with open(report_file, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            for part in html_parts:
+                f.write(part)
 
         print(f"HTML report generated: {report_file}")
         return report_file
 
+    def _iter_test_rows(self):
+        """Yield compact per-test rows for the tests table"""
+        for test in self.model.iter_tests():
+            yield [
+                test.name,
+                test.suite,
+                test.status,
+                round(test.execution_time, 3),
+                ", ".join(test.tags),
+                test.message[:500],
+            ]
+
+    def _iter_failure_rows(self):
+        """Yield compact rows for the failed tests table"""
+        for failed_test in self.report_data["details"]["failed_tests"]:
+            yield [
+                failed_test["name"],
+                failed_test["suite"],
+                failed_test["message"],
+                ", ".join(failed_test["tags"]) if failed_test["tags"] else "None",
+            ]
+
+    def _iter_timeline_html(self, timeline: Dict):
+        """Stream the worker timeline and utilization figures"""
+        wall_clock = timeline["wall_clock_seconds"] or 1.0
+        critical_path = timeline["critical_path"]
+        speedup = timeline["speedup"]
+        yield f"""
+        <div class="section">
+            <h2>⏱️ Execution Timeline</h2>
+            <div class="timeline-stats">
+                <div><strong>{timeline['wall_clock_seconds']:.1f}s</strong> wall-clock</div>
+                <div><strong>{timeline['test_seconds']:.1f}s</strong> summed test time</div>
+                <div><strong>{f'{speedup:.2f}x' if speedup else 'n/a'}</strong> speedup</div>
+                <div><strong>{timeline['workers']}</strong> workers ({escape(timeline['unit'])} split)</div>
+                <div><strong>{timeline['parallel_efficiency_percent']:.1f}%</strong> parallel efficiency</div>
+            </div>
+"""
+        lanes: Dict[int, List] = {}
+        for bar in timeline["bars"]:
+            lanes.setdefault(bar[0], []).append(bar)
+        for worker in timeline["worker_summary"]:
+            yield f"""
+            <div class="timeline-lane">
+                <div class="timeline-label">Worker {worker['worker'] + 1} · {worker['utilization_percent']:.0f}%</div>
+                <div class="timeline-track">"""
+            for _, start, duration, name, failed in lanes.get(worker["worker"], []):
+                classes = "timeline-bar"
+                if failed:
+                    classes += " fail"
+                if name == critical_path["last_unit"]:
+                    classes += " critical"
+                yield (
+                    f'<div class="{classes}" '
+                    f'style="left:{start / wall_clock * 100:.3f}%;'
+                    f'width:{duration / wall_clock * 100:.3f}%" '
+                    f'title="{escape(name)} ({duration:.1f}s at +{start:.1f}s)"></div>'
+                )
+            yield """</div>
+            </div>
+"""
+        if not timeline["bars"]:
+            yield f"""
+            <p>{timeline['units']} units are too many to draw; see the per-worker figures above.</p>
+"""
+
+        what_if = ", ".join(
+            f"{estimate['workers']} workers ≈ {estimate['estimated_wall_clock']:.0f}s"
+            for estimate in timeline["what_if"]
+        )
+        yield f"""
+            <p><strong>Critical path:</strong> worker {critical_path['worker'] + 1} finished last with
+            {escape(critical_path['last_unit'])} ({critical_path['worker_busy_seconds']:.1f}s busy).
+            Longest single unit: {escape(critical_path['longest_unit'])}
+            ({critical_path['longest_unit_seconds']:.1f}s), the floor for any number of workers.</p>
+            <p><strong>Estimated wall-clock with longest-first scheduling:</strong> {what_if}</p>
+"""
+        if timeline["idle_gaps"]:
+            yield """
+            <p><strong>Largest idle gaps:</strong></p>
+            <ul>
+"""
+            for gap in timeline["idle_gaps"][:5]:
+                waiting = (
+                    f"before {escape(gap['before'])}" if gap["before"] else "until the end"
+                )
+                yield f"""
+                <li>Worker {gap['worker'] + 1}: {gap['duration']:.1f}s idle from +{gap['start']:.1f}s {waiting}</li>
+"""
+            yield """
+            </ul>
+"""
+        yield """
+        </div>
+"""
+
     def _template_exists(self, template_name: str) -> bool:
         """Check if template file exists"""
         try:
@@ -595,22 +795,22 @@ class WordMateReportGenerator:
         except Exception:
             return False
 
-    def _generate_html_with_template(self, template_data: Dict) -> str:
-        """Generate HTML using Jinja2 template"""
+    def _iter_html_with_template(self, template_data: Dict):
+        """Stream HTML using Jinja2 template"""
         try:
             template = self.jinja_env.get_template("report_template.html")
-            return template.render(**template_data)
+            return template.generate(**template_data)
         except Exception as e:
             print(f"Template rendering error: {e}")
-            return self._generate_html_fallback(template_data)
+            return self._iter_html_fallback(template_data)
 
-    def _generate_html_fallback(self, template_data: Dict) -> str:
-        """Generate HTML using fallback method"""
+    def _iter_html_fallback(self, template_data: Dict):
+        """Stream HTML using fallback method"""
         report = template_data["report"]
-        environment = template_data["environment"]
-        report_type = template_data["report_type"]
-
-        html = f"""
+        environment = escape(template_data["environment"])
+        report_type = escape(template_data["report_type"])
+        tables = template_data["tables"]
+        yield f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -634,8 +834,6 @@ class WordMateReportGenerator:
         .charts {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; }}
         .chart {{ text-align: center; background: #f8f9fa; padding: 20px; border-radius: 8px; }}
         .chart img {{ max-width: 100%; height: auto; }}
-        .failed-tests {{ background: #fff5f5; border: 1px solid #fed7d7; border-radius: 8px; padding: 20px; }}
-        .failed-test {{ margin-bottom: 15px; padding: 15px; background: white; border-radius: 4px; border-left: 4px solid #dc3545; }}
         .recommendations {{ background: #f0f9ff; border: 1px solid #bfdbfe; border-radius: 8px; padding: 20px; }}
         .recommendation {{ margin-bottom: 15px; padding: 15px; background: white; border-radius: 4px; }}
         .recommendation.critical {{ border-left: 4px solid #dc3545; }}
@@ -647,6 +845,17 @@ class WordMateReportGenerator:
         .test-suites th {{ background: #f8f9fa; font-weight: 600; }}
         .status-pass {{ color: #28a745; font-weight: bold; }}
         .status-fail {{ color: #dc3545; font-weight: bold; }}
+        .timeline-stats {{ display: flex; flex-wrap: wrap; gap: 30px; margin-bottom: 20px; }}
+        .timeline-lane {{ display: flex; align-items: center; margin-bottom: 4px; }}
+        .timeline-label {{ width: 90px; flex: none; color: #6c757d; font-size: 0.85em; }}
+        .timeline-track {{ position: relative; flex: 1; height: 22px; background: #f1f3f5; border-radius: 3px; }}
+        .timeline-bar {{ position: absolute; top: 2px; bottom: 2px; min-width: 1px; background: #007bff; border-right: 1px solid white; box-sizing: border-box; }}
+        .timeline-bar.fail {{ background: #dc3545; }}
+        .timeline-bar.critical {{ outline: 2px solid #ffc107; }}
+        .cluster {{ margin-bottom: 10px; padding: 12px 15px; background: #fff5f5; border-left: 4px solid #dc3545; border-radius: 4px; }}
+        .cluster summary {{ cursor: pointer; }}
+        .cluster-size {{ display: inline-block; min-width: 40px; margin-right: 10px; padding: 2px 8px; background: #dc3545; color: white; border-radius: 10px; text-align: center; font-weight: bold; }}
+{VIRTUAL_TABLE_CSS}
     </style>
 </head>
 <body>
@@ -685,26 +894,26 @@ class WordMateReportGenerator:
 
         # Add charts section if charts exist
         if report["charts"]:
-            html += f"""
+            yield """
         <div class="section">
             <h2>📊 Test Analytics</h2>
             <div class="charts">
 """
             for chart in report["charts"]:
-                html += f"""
+                yield f"""
                 <div class="chart">
-                    <h3>{chart['name']}</h3>
-                    <img src="{template_data['charts_dir']}/{chart['file']}" alt="{chart['name']}">
+                    <h3>{escape(chart['name'])}</h3>
+                    <img src="{escape(template_data['charts_dir'])}/{escape(chart['file'])}" alt="{escape(chart['name'])}">
                 </div>
 """
-            html += """
+            yield """
             </div>
         </div>
 """
 
         # Add test suites section
         if report["details"]["test_suites"]:
-            html += """
+            yield """
         <div class="section">
             <h2>📋 Test Suites</h2>
             <div class="test-suites">
@@ -726,9 +935,9 @@ class WordMateReportGenerator:
                 passed = suite["statistics"]["passed"]
                 success_rate = (passed / total * 100) if total > 0 else 0
 
-                html += f"""
+                yield f"""
                         <tr>
-                            <td>{suite['name']}</td>
+                            <td>{escape(suite['name'])}</td>
                             <td>{total}</td>
                             <td class="status-pass">{passed}</td>
                             <td class="status-fail">{suite['statistics']['failed']}</td>
@@ -736,60 +945,220 @@ class WordMateReportGenerator:
                             <td>{suite['execution_time']:.1f}s</td>
                         </tr>
 """
-            html += """
+            yield """
                     </tbody>
                 </table>
             </div>
         </div>
 """
 
-        # Add failed tests section
-        if report["details"]["failed_tests"]:
-            html += """
+        # Add execution timeline section
+        timeline = report["details"].get("timeline")
+        if timeline:
+            yield from self._iter_timeline_html(timeline)
+
+        # Add duration regressions section
+        regressions = report["details"].get("duration_regressions", [])
+        if regressions:
+            yield """
         <div class="section">
-            <h2>❌ Failed Tests</h2>
-            <div class="failed-tests">
-"""
-            for failed_test in report["details"]["failed_tests"]:
-                html += f"""
-                <div class="failed-test">
-                    <h4>{failed_test['name']}</h4>
-                    <p><strong>Suite:</strong> {failed_test['suite']}</p>
-                    <p><strong>Error:</strong> {failed_test['message']}</p>
-                    <p><strong>Tags:</strong> {', '.join(failed_test['tags']) if failed_test['tags'] else 'None'}</p>
-                </div>
+            <h2>🐢 Got Slower</h2>
+            <div class="test-suites">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Test / Suite</th>
+                            <th>Kind</th>
+                            <th>Baseline</th>
+                            <th>Now</th>
+                            <th>Slowdown</th>
+                            <th>Since Run</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+            for regression in regressions:
+                slowdown = regression["slowdown_percent"]
+                yield f"""
+                        <tr>
+                            <td>{escape(regression['name'])}</td>
+                            <td>{escape(regression['kind'])}</td>
+                            <td>{regression['baseline_seconds']:.2f}s</td>
+                            <td class="status-fail">{regression['current_seconds']:.2f}s</td>
+                            <td>{'+' + format(slowdown, '.1f') + '%' if slowdown is not None else 'new'}</td>
+                            <td>#{regression['change_run']}</td>
+                        </tr>
 """
-            html += """
+            yield """
+                    </tbody>
+                </table>
             </div>
         </div>
 """
 
+        # Add API transfer section
+        transfer_stats = report["details"].get("transfer_stats", [])
+        if transfer_stats:
+            yield """
+        <div class="section">
+            <h2>📦 API Transfer by Endpoint</h2>
+            <div class="test-suites">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Endpoint</th>
+                            <th>Responses</th>
+                            <th>Wire</th>
+                            <th>Decoded</th>
+                            <th>Ratio</th>
+                            <th>Avg Decoded</th>
+                            <th>Encodings</th>
+                            <th>Time</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+            for row in transfer_stats:
+                ratio = row["compression_ratio"]
+                encodings = ", ".join(
+                    f"{encoding} ({count})"
+                    for encoding, count in sorted(row["encodings"].items())
+                )
+                yield f"""
+                        <tr>
+                            <td>{escape(row['endpoint'])}</td>
+                            <td>{row['responses']}</td>
+                            <td>{row['wire_bytes'] / 1024:.1f} KB</td>
+                            <td>{row['decoded_bytes'] / 1024:.1f} KB</td>
+                            <td>{f"{ratio:.1f}x" if ratio else "-"}</td>
+                            <td>{row['avg_decoded_bytes'] / 1024:.1f} KB</td>
+                            <td>{escape(encodings)}</td>
+                            <td>{row['seconds']:.1f}s</td>
+                        </tr>
+"""
+            yield """
+                    </tbody>
+                </table>
+            </div>
+        </div>
+"""
+
+        # Add load test section, steady-state figures per step
+        for run in report["details"].get("load_tests", []):
+            profile = run["profile"]
+            verdict = "✅" if run["passed"] else "❌"
+            yield f"""
+        <div class="section">
+            <h2>🚦 Load Test: {escape(run['scenario'])} {verdict}</h2>
+            <p>{run['started']} against {escape(run['base_url'])}:
+            {profile['users']} users ({profile['ramp_up_s']:.0f}s ramp up,
+            {profile['steady_s']:.0f}s steady, {profile['ramp_down_s']:.0f}s ramp down),
+            {run['requests']} requests, {run['throughput']} req/s
+            ({run['steady_throughput']} req/s steady), {run['error_rate']}% errors</p>
+            <div class="test-suites">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Step</th>
+                            <th>Requests</th>
+                            <th>Errors</th>
+                            <th>Req/s</th>
+                            <th>p50</th>
+                            <th>p90</th>
+                            <th>p95</th>
+                            <th>p99</th>
+                            <th>Max</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+            for name, step in (run["steady_steps"] or run["steps"]).items():
+                latencies = "".join(
+                    f"<td>{'-' if step[key] is None else f'{step[key]:.0f} ms'}</td>"
+                    for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+                )
+                yield f"""
+                        <tr>
+                            <td>{escape(name)}</td>
+                            <td>{step['requests']}</td>
+                            <td>{step['error_rate']}%</td>
+                            <td>{step['throughput']}</td>
+                            {latencies}
+                        </tr>
+"""
+            yield """
+                    </tbody>
+                </table>
+            </div>
+        </div>
+"""
+
+        # Add failure clusters section
+        clusters = report["details"].get("failure_clusters", [])
+        if clusters:
+            yield f"""
+        <div class="section">
+            <h2>🧩 Failure Clusters ({len(clusters)})</h2>
+            <div class="clusters">
+"""
+            for cluster in clusters[:MAX_HTML_CLUSTERS]:
+                suites = ", ".join(
+                    f"{suite['name']} ({suite['count']})"
+                    for suite in cluster["suites"][:5]
+                )
+                variants = "".join(
+                    f"<li><code>{escape(variant)}</code></li>"
+                    for variant in cluster["variants"]
+                )
+                yield f"""
+                <details class="cluster">
+                    <summary><span class="cluster-size">{cluster['size']}</span> {escape(cluster['representative'][:300])}</summary>
+                    <p><strong>Signature:</strong> <code>{escape(cluster['normalized'][:300])}</code></p>
+                    <p><strong>Affected suites:</strong> {escape(suites)}</p>
+                    <p><strong>Example tests:</strong> {escape(', '.join(cluster['examples']))}</p>
+                    {f"<p><strong>Similar variants:</strong></p><ul>{variants}</ul>" if variants else ""}
+                </details>
+"""
+            yield """
+            </div>
+        </div>
+"""
+
+        # Add failed tests and per-test tables, loaded on demand
+        if tables["failures"]["rows"]:
+            yield virtual_table("failures", "❌ Failed Tests", tables["failures"])
+
+        if tables["tests"]["rows"]:
+            yield virtual_table("tests", "🧪 All Tests", tables["tests"])
+
         # Add recommendations section
         if report["recommendations"]:
-            html += """
+            yield """
         <div class="section">
             <h2>💡 Recommendations</h2>
             <div class="recommendations">
 """
             for rec in report["recommendations"]:
-                html += f"""
-                <div class="recommendation {rec['type']}">
-                    <h4>{rec['title']}</h4>
-                    <p>{rec['message']}</p>
-                    <p><strong>Action:</strong> {rec['action']}</p>
+                yield f"""
+                <div class="recommendation {escape(rec['type'])}">
+                    <h4>{escape(rec['title'])}</h4>
+                    <p>{escape(rec['message'])}</p>
+                    <p><strong>Action:</strong> {escape(rec['action'])}</p>
                 </div>
 """
-            html += """
+            yield """
             </div>
         </div>
 """
 
-        html += """
+        manifest = json.dumps(tables).replace("</", "<\\/")
+        yield f"""
     </div>
+    <script type="application/json" id="wm-manifest">{manifest}</script>
+    <script>{VIRTUAL_TABLE_JS}</script>
 </body>
 </html>
 """
-        return html
 
     def copy_assets(self, output_dir: Path) -> None:
         """Copy static assets to output directory"""
@@ -798,11 +1167,11 @@ class WordMateReportGenerator:
         if charts_src.exists():
             print(f"Charts available in {charts_src}")
 
-    def generate_json_report(self, output_dir: Path) -> Path:
+    def generate_json_report(self, output_dir: Path, export_format: str = "json") -> Path:
         """Generate JSON report for programmatic access"""
-        json_file = output_dir / "test_results.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(self.report_data, f, indent=2, ensure_ascii=False)
+        json_file = export_results(
+            output_dir, self.report_data, self.model, export_format
+        )
 
         print(f"JSON report generated: {json_file}")
         return json_file
@@ -814,6 +1183,10 @@ class WordMateReportGenerator:
         environment: str = None,
         report_type: str = "standard",
         open_report: bool = False,
+        export_format: str = "json",
+        chart_backend: str = "auto",
+        history_db: Optional[Path] = None,
+        quarantine_file: Optional[Path] = None,
     ) -> Dict[str, Path]:
         """Generate complete test report with all components"""
         print(
@@ -825,13 +1198,21 @@ class WordMateReportGenerator:
 
         # Parse test results
         self.parse_robot_output_files(input_dir)
+        self.load_transfer_stats(input_dir)
+        self.load_load_test_results(input_dir)
+
+        # Update results history
+        if history_db:
+            self.update_history(
+                history_db, environment, report_type, quarantine_file
+            )
 
         # Generate charts
-        self.generate_charts(output_dir)
+        self.generate_charts(output_dir, chart_backend)
 
         # Generate reports
         html_report = self.generate_html_report(output_dir, environment, report_type)
-        json_report = self.generate_json_report(output_dir)
+        json_report = self.generate_json_report(output_dir, export_format)
 
         # Copy assets
         self.copy_assets(output_dir)
@@ -864,6 +1245,8 @@ Examples:
   %(prog)s --input-dir reports/ --output-dir final-reports/
   %(prog)s --environment dev --report-type nightly
   %(prog)s --input-dir reports/ --open
+  %(prog)s --input-dir reports/ --json-format jsonl.gz
+  %(prog)s --input-dir reports/ --history-db reports/history/results.db
         """,
     )
 
@@ -890,6 +1273,36 @@ Examples:
         help="Type of report to generate",
     )
 
+    parser.add_argument(
+        "--json-format",
+        default="json",
+        choices=EXPORT_FORMATS,
+        help="Format of the machine-readable results (parquet requires pyarrow)",
+    )
+
+    parser.add_argument(
+        "--chart-backend",
+        default="auto",
+        choices=CHART_BACKENDS,
+        help="Chart renderer: matplotlib PNGs, dependency-free SVG, or none "
+        "(auto picks matplotlib when installed)",
+    )
+
+    parser.add_argument(
+        "--history-db",
+        type=Path,
+        help="SQLite results history to record this run in and compare against "
+        f"(e.g. {DEFAULT_HISTORY_DB})",
+    )
+
+    parser.add_argument(
+        "--quarantine-file",
+        type=Path,
+        default=project_root / DEFAULT_QUARANTINE_FILE,
+        help="Where to write the flaky-test quarantine list when --history-db is "
+        f"set (default: {DEFAULT_QUARANTINE_FILE})",
+    )
+
     parser.add_argument(
         "--open",
         action="store_true",
@@ -921,6 +1334,10 @@ def main():
             environment=args.environment,
             report_type=args.report_type,
             open_report=args.open,
+            export_format=args.json_format,
+            chart_backend=args.chart_backend,
+            history_db=args.history_db,
+            quarantine_file=args.quarantine_file,
         )
 
         return 0
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+WordMate HTTP/2 Stub Server
+
+Local stand-in for ``api.php`` that speaks HTTP/2 with prior knowledge
+(h2c) and HTTP/1.1 on the same port, so both WordmateAPI transports can be
+exercised and compared without touching a real environment. Every request
+answers with a small JSON document after an optional delay; the delay is
+awaited per request, so requests multiplexed on one HTTP/2 connection
+overlap instead of queueing.
+
+``GET /__stats`` returns the connections and requests served so far per
+protocol, which is how benchmark_transport.py counts connections; stats
+requests are not counted themselves.
+
+HTTP/2 needs the ``h2`` package (``pip install h2``); without it only
+HTTP/1.1 is served.
+
+Usage:
+    python scripts/http2_stub_server.py
+    python scripts/http2_stub_server.py --port 8443 --delay-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+DEFAULT_PORT = 8443
+READ_SIZE = 65536
+STATS_PATH = "/__stats"
+HTTP1_REASONS = {200: "OK", 404: "Not Found", 505: "HTTP Version Not Supported"}
+
+
+class StubServer:
+    """Answers api.php-style requests over HTTP/2 and HTTP/1.1"""
+
+    def __init__(self, delay_ms: float = 0):
+        self.delay = delay_ms / 1000
+        self.stats = {
+            "connections": {"h2": 0, "http1": 0},
+            "requests": {"h2": 0, "http1": 0},
+        }
+
+    async def respond(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        """Status and JSON body for one request"""
+        parts = urlsplit(target)
+        if parts.path == STATS_PATH:
+            return 200, json.dumps(self.stats).encode()
+
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        endpoint = parse_qs(parts.query).get("endpoint", [parts.path])[0]
+        try:
+            received = json.loads(body) if body else None
+        except ValueError:
+            received = None
+        payload = {
+            "success": True,
+            "endpoint": endpoint,
+            "method": method,
+            "received": received,
+            "data": [],
+        }
+        return 200, json.dumps(payload).encode()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                first = await reader.readexactly(len(H2_PREFACE))
+            except asyncio.IncompleteReadError as e:
+                first = e.partial
+            if first == H2_PREFACE:
+                await self._serve_h2(reader, writer, first)
+            else:
+                await self._serve_http1(reader, writer, first)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http1(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, buffer: bytes
+    ) -> None:
+        counted = False
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = await reader.read(READ_SIZE)
+                if not chunk:
+                    return
+                buffer += chunk
+
+            head, _, buffer = buffer.partition(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers: Dict[str, str] = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            while len(buffer) < length:
+                chunk = await reader.read(READ_SIZE)
+                if not chunk:
+                    return
+                buffer += chunk
+            body, buffer = buffer[:length], buffer[length:]
+
+            if urlsplit(target).path != STATS_PATH:
+                if not counted:
+                    self.stats["connections"]["http1"] += 1
+                    counted = True
+                self.stats["requests"]["http1"] += 1
+            status, payload = await self.respond(method, target, body)
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP1_REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1")
+                + payload
+            )
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                return
+
+    async def _serve_h2(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, data: bytes
+    ) -> None:
+        if not H2_AVAILABLE:
+            print("⚠️  HTTP/2 connection refused: pip install h2")
+            return
+
+        self.stats["connections"]["h2"] += 1
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        streams: Dict[int, dict] = {}
+        tasks = set()
+
+        async def answer(stream_id: int) -> None:
+            stream = streams.pop(stream_id)
+            self.stats["requests"]["h2"] += 1
+            status, payload = await self.respond(
+                stream["method"], stream["path"], bytes(stream["body"])
+            )
+            try:
+                # Payloads are far below the initial 64 KiB flow-control window
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", str(status)),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(payload))),
+                    ],
+                )
+                conn.send_data(stream_id, payload, end_stream=True)
+            except h2.exceptions.StreamClosedError:
+                return  # reset by the client while the answer was delayed
+            writer.write(conn.data_to_send())
+
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    headers = dict(event.headers)
+                    streams[event.stream_id] = {
+                        "method": headers.get(":method", "GET"),
+                        "path": headers.get(":path", "/"),
+                        "body": bytearray(),
+                    }
+                elif isinstance(event, h2.events.DataReceived):
+                    streams[event.stream_id]["body"] += event.data
+                    conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.ensure_future(answer(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.StreamReset):
+                    streams.pop(event.stream_id, None)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    data = b""
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            if data:
+                data = await reader.read(READ_SIZE)
+
+        for task in tasks:
+            task.cancel()
+
+
+async def serve(host: str, port: int, delay_ms: float) -> None:
+    stub = StubServer(delay_ms)
+    server = await asyncio.start_server(stub.handle_connection, host, port)
+    protocols = "h2c + HTTP/1.1" if H2_AVAILABLE else "HTTP/1.1 only (pip install h2)"
+    print(f"🚀 Stub API on http://{host}:{port}/api.php ({protocols})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Local HTTP/2 (h2c) and HTTP/1.1 stand-in for the WordMate API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s
+  %(prog)s --port 8443 --delay-ms 20
+  robot --variable API_BASE_URL:http://127.0.0.1:8443/api.php \\
+        --variable API_TRANSPORT:h2c tests/api
+        """,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--delay-ms",
+        type=float,
+        default=0,
+        help="Simulated server time per request (default: 0)",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.delay_ms))
+    except KeyboardInterrupt:
+        print("\n🛑 Stub server stopped")
+
+
+if __name__ == "__main__":
+    main()
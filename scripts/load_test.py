@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+WordMate Load Test
+
+Runs a load scenario from config/load_scenarios/ outside Robot Framework,
+with the engine of resources/libraries/load_engine.py: weighted user
+journeys (login, browse vocabulario, favorites, grammar answers, ...) on
+thousands of async virtual users following a ramp-up, steady and
+ramp-down profile. Prints per-step latency percentiles and throughput and
+writes the full results, histograms and timeline included, as JSON.
+
+Against the local mock server, start it without its per-client rate
+limit, since all virtual users share the few load test accounts.
+
+Usage:
+    python scripts/load_test.py --env local --scenario smoke_load
+    python scripts/load_test.py --env dev --scenario learning_journeys --users 2000
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from resources.libraries.load_engine import (
+    PERCENTILES,
+    LoadProfile,
+    load_scenario,
+    run_scenario,
+    write_results,
+)
+from scripts.mock_server import load_yaml
+
+DEFAULT_OUTPUT_DIR = project_root / "reports" / "load"
+
+
+def api_base_url(env: str) -> str:
+    """``api_base_url`` of an environment config, env overrides applied"""
+    override = os.environ.get(f"{env.upper()}_API_BASE_URL")
+    if override:
+        return override
+    config = load_yaml(project_root / "config" / "environments" / f"{env}.yaml")
+    return config["environment"]["api_base_url"]
+
+
+def print_summary(results: dict) -> None:
+    steps = results["steady_steps"] or results["steps"]
+    width = max([len(name) for name in steps] + [4])
+    header = f"{'Step':<{width}}  {'Requests':>8}  {'Err %':>6}  {'Req/s':>7}"
+    header += "".join(f"  {f'p{p}':>8}" for p in PERCENTILES) + f"  {'Max':>8}"
+    print(header)
+    for name, step in steps.items():
+        line = f"{name:<{width}}  {step['requests']:>8}  {step['error_rate']:>6}"
+        line += f"  {step['throughput']:>7}"
+        for key in [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]:
+            value = step[key]
+            line += f"  {'-' if value is None else f'{value:.1f}':>8}"
+        print(line)
+
+    print(
+        f"\n📊 {results['requests']} requests from "
+        f"{results['virtual_users_started']} virtual users in "
+        f"{results['duration_s']}s: {results['throughput']} req/s "
+        f"({results['steady_throughput']} req/s steady), "
+        f"{results['error_rate']}% errors"
+    )
+    for error, count in list(results["errors"].items())[:10]:
+        print(f"   ⚠️  {error}: {count}")
+    for check in results["thresholds"]:
+        mark = "✅" if check["passed"] else "❌"
+        print(
+            f"{mark} {check['step']} {check['metric']}: {check['actual']} "
+            f"(limit {check['limit']})"
+        )
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Scenario-based load tests of the WordMate API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --env local --scenario smoke_load
+  %(prog)s --env dev --scenario learning_journeys --users 2000 --steady 900
+  %(prog)s --base-url http://127.0.0.1:8765/php/api.php --scenario smoke_load
+        """,
+    )
+    parser.add_argument(
+        "--scenario",
+        default="smoke_load",
+        help="Scenario file, or the name of one in config/load_scenarios/",
+    )
+    parser.add_argument(
+        "--env",
+        default="dev",
+        help="Environment whose api_base_url is loaded (default: dev)",
+    )
+    parser.add_argument("--base-url", help="API base URL, instead of --env")
+    parser.add_argument("--users", type=int, help="Virtual users when steady")
+    parser.add_argument("--ramp-up", type=float, help="Seconds to start all users")
+    parser.add_argument("--steady", type=float, help="Seconds all users run")
+    parser.add_argument("--ramp-down", type=float, help="Seconds to stop them")
+    parser.add_argument("--seed", type=int, help="Seed for journeys and think times")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Where the results JSON goes (default: reports/load)",
+    )
+    args = parser.parse_args()
+
+    try:
+        scenario = load_scenario(args.scenario)
+        base_url = args.base_url or api_base_url(args.env)
+    except (OSError, KeyError, ValueError, yaml.YAMLError) as e:
+        print(f"❌ Could not load scenario: {e}")
+        return 1
+
+    spec = dict(scenario.get("profile") or {})
+    overrides = {
+        "users": args.users,
+        "ramp_up_s": args.ramp_up,
+        "steady_s": args.steady,
+        "ramp_down_s": args.ramp_down,
+    }
+    spec.update({k: v for k, v in overrides.items() if v is not None})
+    profile = LoadProfile.from_dict(spec)
+
+    print(
+        f"🚀 {scenario['name']} against {base_url}: {profile.users} users, "
+        f"{profile.ramp_up_s:.0f}s/{profile.steady_s:.0f}s/"
+        f"{profile.ramp_down_s:.0f}s ramp up/steady/ramp down"
+    )
+
+    def progress(entry: dict) -> None:
+        if entry["second"] % 10 == 0:
+            print(
+                f"  {entry['second']:>5}s  {entry['users']:>6} users  "
+                f"{entry['requests']:>6} req/s  {entry['failures']} failed"
+            )
+
+    try:
+        results = run_scenario(
+            scenario, base_url, profile=profile, seed=args.seed, on_progress=progress
+        )
+    except KeyboardInterrupt:
+        print("\n⚠️  Load test interrupted")
+        return 130
+
+    print()
+    print_summary(results)
+    path = write_results(results, args.output_dir)
+    print(f"\n📄 Results: {path}")
+    return 0 if results["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1036 @@
+#!/usr/bin/env python3
+"""
+WordMate Mock API Server
+
+Local stand-in for ``api.php`` implementing the endpoint catalogue of
+resources/variables/api_endpoints.robot that the API suites exercise:
+login with JWTs, token refresh, profile, vocabulario with pagination,
+search and filters, favoritos, aprendidas, folders, customVocabulary and
+grammar. Users, words and exercises are seeded from config/test_data/*.yaml;
+favorites, folders and custom entries live in memory while the server runs.
+
+Server behaviour is configured under ``mock_server`` in
+config/environments/local.yaml so load tests and profiling runs are
+reproducible:
+
+- ``latency``: per-endpoint distribution of response delays in
+  milliseconds (fixed, uniform, normal, lognormal or exponential),
+  optionally capped with ``max_ms``
+- ``errors``: per-endpoint probability of answering with a 5xx status
+- ``rate_limit``: per-client token bucket answering 429 with
+  ``Retry-After``, plus a cap on failed logins per username
+
+Random draws come from one generator seeded with ``seed``. ``GET /__stats``
+returns the requests served per endpoint and status.
+
+``run_tests.py --env local`` starts the server for the duration of the run.
+
+Usage:
+    python scripts/mock_server.py
+    python scripts/mock_server.py --port 8765 --seed 7
+    python scripts/mock_server.py --no-latency --no-rate-limit
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+
+DEFAULT_CONFIG = project_root / "config" / "environments" / "local.yaml"
+TEST_DATA_DIR = project_root / "config" / "test_data"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SECRET = "wordmate-local-mock-secret"
+DEFAULT_TOKEN_EXPIRY = 3600
+DEFAULT_VOCABULARY_SIZE = 500
+STATS_PATH = "/__stats"
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+MAX_FIELD_LENGTH = 100
+USER_SECTIONS = (
+    "valid_users",
+    "language_users",
+    "subscription_users",
+    "progress_users",
+    "account_state_users",
+)
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+COLOR_PATTERN = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def _expand_env(text: str) -> str:
+    """Substitute ``${VAR:-default}`` and ``${VAR}`` like run_tests.py"""
+    text = re.sub(
+        r"\$\{([^}:]+)(?::-([^}]*))?\}",
+        lambda m: os.getenv(m.group(1), m.group(2) or ""),
+        text,
+    )
+    return re.sub(r"\$\{([^}]+)\}", lambda m: os.getenv(m.group(1), ""), text)
+
+
+def load_yaml(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(_expand_env(f.read())) or {}
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_jwt(claims: Dict[str, Any], secret: str) -> str:
+    """HS256 JWT, the format WordmateAPI's ``Validate JWT Token`` decodes"""
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+    signing_input = f"{header}.{payload}".encode()
+    signature = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def decode_jwt(token: str, secret: str) -> Optional[Dict[str, Any]]:
+    """Claims of a token signed with ``secret`` and not expired, else None"""
+    try:
+        header, payload, signature = token.split(".")
+        signing_input = f"{header}.{payload}".encode()
+        expected = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(signature)):
+            return None
+        claims = json.loads(_unb64(payload))
+    except (ValueError, TypeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def load_seed(
+    test_data_dir: Path, vocabulary_size: int, rng: random.Random
+) -> Dict[str, Any]:
+    """Users, words, grammar exercises and API limits from the test data"""
+    users_data = load_yaml(test_data_dir / "users.yaml")
+    vocabulary_data = load_yaml(test_data_dir / "vocabulary.yaml")
+    grammar_data = load_yaml(test_data_dir / "grammar.yaml")
+
+    users = []
+    for section in USER_SECTIONS:
+        users.extend((users_data.get(section) or {}).values())
+    performance = users_data.get("performance_users") or {}
+    users.extend(performance.get("load_test_users") or [])
+    users = [user for user in users if user.get("username") and user.get("password")]
+
+    words = []
+    for group in (vocabulary_data.get("sample_words") or {}).values():
+        words.extend(dict(word) for word in group)
+    difficulties = list(vocabulary_data.get("difficulty_levels") or {}) or [
+        "beginner",
+        "intermediate",
+        "advanced",
+    ]
+    categories = list(vocabulary_data.get("categories") or {}) or ["general"]
+    # Filler words never contain the search terms the suites look for
+    for number in range(len(words), vocabulary_size):
+        words.append(
+            {
+                "word": f"mockword{number:05d}",
+                "definition": f"Generated filler word number {number}",
+                "difficulty": rng.choice(difficulties),
+                "category": rng.choice(categories),
+                "part_of_speech": rng.choice(["noun", "verb", "adjective"]),
+            }
+        )
+    for word_id, word in enumerate(words, 1):
+        word["id"] = word_id
+
+    exercises = []
+    for category, items in (grammar_data.get("sample_exercises") or {}).items():
+        exercises.extend(dict(item, category=category) for item in items)
+
+    pagination = (vocabulary_data.get("api_test_data") or {}).get("pagination") or {}
+    return {
+        "users": users,
+        "words": words,
+        "exercises": exercises,
+        "categories": grammar_data.get("exercise_categories") or {},
+        "default_page_size": pagination.get("default_page_size", 50),
+        "max_page_size": pagination.get("max_page_size", 200),
+    }
+
+
+class Behaviour:
+    """Configured delays, injected errors and rate limits"""
+
+    def __init__(self, config: Dict[str, Any], seed: Optional[int] = None):
+        self._lock = threading.Lock()
+        self.rng = random.Random(seed)
+
+        latency = config.get("latency") or {}
+        self.latency = {"default": latency.get("default")}
+        self.latency.update(latency.get("endpoints") or {})
+        for endpoint, spec in self.latency.items():
+            if spec and spec.get("distribution", "fixed") not in DISTRIBUTIONS:
+                raise ValueError(
+                    f"Unknown latency distribution for {endpoint}: "
+                    f"{spec['distribution']} (use {', '.join(DISTRIBUTIONS)})"
+                )
+
+        errors = config.get("errors") or {}
+        self.errors = {"default": errors.get("default")}
+        self.errors.update(errors.get("endpoints") or {})
+
+        rate_limit = config.get("rate_limit") or {}
+        self.requests_per_minute = rate_limit.get("requests_per_minute", 0)
+        self.burst = rate_limit.get("burst", self.requests_per_minute)
+        self.login_failures_per_minute = rate_limit.get("login_failures_per_minute", 0)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._login_failures: Dict[str, List[float]] = {}
+
+    def _spec(self, table: Dict[str, Any], endpoint: str) -> Optional[Dict]:
+        spec = table.get(endpoint, table.get("default"))
+        return spec or None
+
+    def delay(self, endpoint: str) -> float:
+        """Seconds to wait before answering a request to ``endpoint``"""
+        spec = self._spec(self.latency, endpoint)
+        if not spec:
+            return 0.0
+        distribution = spec.get("distribution", "fixed")
+        with self._lock:
+            if distribution == "fixed":
+                ms = spec.get("ms", 0)
+            elif distribution == "uniform":
+                ms = self.rng.uniform(spec.get("min_ms", 0), spec.get("max_ms", 0))
+            elif distribution == "normal":
+                ms = self.rng.gauss(spec.get("mean_ms", 0), spec.get("stddev_ms", 0))
+            elif distribution == "lognormal":
+                ms = spec.get("median_ms", 0) * math.exp(
+                    self.rng.gauss(0, spec.get("sigma", 0.5))
+                )
+            else:
+                ms = self.rng.expovariate(1 / max(spec.get("mean_ms", 1), 1e-3))
+        return min(max(ms, 0), spec.get("max_ms", ms)) / 1000
+
+    def injected_error(self, endpoint: str) -> Optional[int]:
+        """Status of an injected failure for this request, None for none"""
+        spec = self._spec(self.errors, endpoint)
+        if not spec or not spec.get("rate"):
+            return None
+        with self._lock:
+            failed = self.rng.random() < spec["rate"]
+        return spec.get("status", 503) if failed else None
+
+    def admit(self, client: str) -> Tuple[bool, Dict[str, str]]:
+        """Take a token from the client's bucket; rate limit headers either way"""
+        if not self.requests_per_minute:
+            return True, {}
+        rate = self.requests_per_minute / 60
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[client] = (tokens, now)
+        headers = {
+            "X-RateLimit-Limit": str(self.requests_per_minute),
+            "X-RateLimit-Remaining": str(int(tokens)),
+            "X-RateLimit-Reset": str(math.ceil((self.burst - tokens) / rate)),
+        }
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil((1 - tokens) / rate))
+        return allowed, headers
+
+    def login_blocked(self, username: str) -> Optional[int]:
+        """Seconds until ``username`` may try again after too many failures"""
+        if not self.login_failures_per_minute:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self._login_failures.get(username, []) if now - t < 60]
+            self._login_failures[username] = recent
+            if len(recent) < self.login_failures_per_minute:
+                return None
+            return math.ceil(60 - (now - recent[0]))
+
+    def record_login_failure(self, username: str) -> None:
+        if self.login_failures_per_minute:
+            with self._lock:
+                self._login_failures.setdefault(username, []).append(time.monotonic())
+
+
+Response = Tuple[int, Dict[str, Any]]
+
+
+def _success(message: Optional[str] = None, status: int = 200, **fields) -> Response:
+    body = {"status": "success", "success": True}
+    if message:
+        body["message"] = message
+    body.update(fields)
+    return status, body
+
+
+def _error(status: int, message: str) -> Response:
+    return status, {
+        "status": "error",
+        "success": False,
+        "message": message,
+        "error": message,
+    }
+
+
+def _int(value: Any, default: Optional[int] = None) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class MockAPI:
+    """In-memory implementation of the api.php endpoints"""
+
+    def __init__(
+        self,
+        seed: Dict[str, Any],
+        behaviour: Behaviour,
+        secret: str = DEFAULT_SECRET,
+        token_expiry: int = DEFAULT_TOKEN_EXPIRY,
+    ):
+        self.behaviour = behaviour
+        self.secret = secret
+        self.token_expiry = token_expiry
+        self.default_page_size = seed["default_page_size"]
+        self.max_page_size = seed["max_page_size"]
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1000)
+
+        self.users: Dict[str, Dict[str, Any]] = {}
+        for user in seed["users"]:
+            self._add_user(user)
+        self.words = seed["words"]
+        self.words_by_id = {word["id"]: word for word in self.words}
+        self.exercises = {str(item["id"]): item for item in seed["exercises"]}
+        self.categories = seed["categories"]
+
+        # refresh token -> (username, jti of the access token issued with it)
+        self.refresh_tokens: Dict[str, Tuple[str, str]] = {}
+        self.revoked: set = set()
+        self.favorites: Dict[str, set] = {}
+        self.learned: Dict[str, set] = {}
+        self.folders: Dict[str, Dict[int, Dict]] = {}
+        self.custom: Dict[str, Dict[int, Dict]] = {}
+        self.answers: Dict[str, List[bool]] = {}
+
+        # endpoint -> (handler, needs an authenticated user)
+        self.routes: Dict[str, Tuple[Callable[..., Response], bool]] = {
+            "health": (self.health, False),
+            "version": (self.version, False),
+            "login": (self.login, False),
+            "register": (self.register, False),
+            "logout": (self.logout, True),
+            "refreshToken": (self.refresh, False),
+            "verifyToken": (self.verify_token, False),
+            "profile": (self.profile, True),
+            "vocabulario": (self.vocabulary, True),
+            "favoritos": (self.favorite_words, True),
+            "aprendidas": (self.learned_words, True),
+            "customVocabulary": (self.custom_vocabulary, True),
+            "exportVocabulary": (self.export_vocabulary, True),
+            "folders": (self.folder_list, True),
+            "folders/moveWords": (self.move_words, True),
+            "folders/empty": (self.empty_folder, True),
+            "grammarCategories": (self.grammar_categories, True),
+            "grammarExercises": (self.grammar_exercises, True),
+            "grammarSubmit": (self.grammar_submit, True),
+            "grammarProgress": (self.grammar_progress, True),
+        }
+
+    def _add_user(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        record = {
+            "id": str(len(self.users) + 1),
+            "username": user["username"],
+            "password": str(user["password"]),
+            "firstName": user.get("first_name") or user.get("firstName") or "",
+            "lastName": user.get("last_name") or user.get("lastName") or "",
+            "email": user.get("email") or user["username"],
+            "role": user.get("role", "user"),
+            "status": user.get("status", "active"),
+        }
+        self.users[record["username"].lower()] = record
+        return record
+
+    def _public(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in user.items() if key != "password"}
+
+    def _claims(self, authorization: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Claims of a valid, unrevoked ``Bearer`` token"""
+        if not authorization or not authorization.startswith("Bearer "):
+            return None
+        claims = decode_jwt(authorization[len("Bearer ") :], self.secret)
+        if not claims or claims.get("jti") in self.revoked:
+            return None
+        return claims
+
+    def authenticate(self, authorization: Optional[str]) -> Optional[Dict[str, Any]]:
+        """User of a valid ``Bearer`` token, None otherwise"""
+        claims = self._claims(authorization)
+        if claims is None:
+            return None
+        return self.users.get(str(claims.get("username", "")).lower())
+
+    def _issue_tokens(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        now = int(time.time())
+        claims = {
+            "sub": user["id"],
+            "username": user["username"],
+            "role": user["role"],
+            "iat": now,
+            "exp": now + self.token_expiry,
+            "jti": os.urandom(8).hex(),
+        }
+        refresh_token = os.urandom(24).hex()
+        with self._lock:
+            self.refresh_tokens[refresh_token] = (
+                user["username"].lower(),
+                claims["jti"],
+            )
+        return {
+            "token": encode_jwt(claims, self.secret),
+            "refreshToken": refresh_token,
+            "expiresIn": self.token_expiry,
+        }
+
+    def dispatch(
+        self,
+        method: str,
+        endpoint: str,
+        query: Dict[str, str],
+        body: Any,
+        authorization: Optional[str],
+    ) -> Response:
+        route = self.routes.get(endpoint)
+        if route is None:
+            return _error(404, f"Unknown endpoint: {endpoint}")
+        handler, needs_user = route
+        user = self.authenticate(authorization)
+        if needs_user and user is None:
+            return _error(401, "Authentication required: missing or invalid token")
+        if not isinstance(body, dict):
+            body = {}
+        if endpoint == "logout":
+            # The token logged out with stops working
+            self.revoked.add(self._claims(authorization)["jti"])
+        return handler(method, query, body, user)
+
+    # System
+
+    def health(self, method, query, body, user) -> Response:
+        return _success(healthy=True, uptime=round(time.time() - self.started, 1))
+
+    def version(self, method, query, body, user) -> Response:
+        return _success(version="mock", api="wordmate")
+
+    # Authentication
+
+    def login(self, method, query, body, user) -> Response:
+        if method != "POST":
+            return _error(405, "Method not allowed")
+        username = str(body.get("username") or "")
+        password = str(body.get("password") or "")
+        if not username or not password:
+            return _error(400, "Missing required fields: username and password")
+        retry_after = self.behaviour.login_blocked(username.lower())
+        if retry_after is not None:
+            return 429, {
+                **_error(429, "Too many login attempts, try again later")[1],
+                "retryAfter": retry_after,
+            }
+        account = self.users.get(username.lower())
+        if account is None or not hmac.compare_digest(
+            account["password"].encode(), password.encode()
+        ):
+            self.behaviour.record_login_failure(username.lower())
+            return _error(401, "Invalid credentials")
+        if account["status"] != "active":
+            return _error(403, f"Account is {account['status']}")
+        tokens = self._issue_tokens(account)
+        return _success("Login successful", user=self._public(account), **tokens)
+
+    def register(self, method, query, body, user) -> Response:
+        if method != "POST":
+            return _error(405, "Method not allowed")
+        fields = ("username", "password", "firstName", "lastName")
+        missing = [field for field in fields if not body.get(field)]
+        if missing:
+            return _error(400, f"Missing required fields: {', '.join(missing)}")
+        if not EMAIL_PATTERN.match(body["username"]):
+            return _error(400, "Invalid email format")
+        if len(str(body["password"])) < 8:
+            return _error(400, "Password must be at least 8 characters")
+        with self._lock:
+            if body["username"].lower() in self.users:
+                return _error(409, "Email already registered")
+            account = self._add_user(body)
+        return _success("Registration successful", 201, user=self._public(account))
+
+    def logout(self, method, query, body, user) -> Response:
+        return _success("Logged out")
+
+    def refresh(self, method, query, body, user) -> Response:
+        refresh_token = body.get("refreshToken") or body.get("refresh_token")
+        with self._lock:
+            issued = self.refresh_tokens.pop(str(refresh_token), None)
+        if issued is None:
+            return _error(401, "Invalid refresh token")
+        username, access_jti = issued
+        # The access token issued with the refresh token is replaced
+        self.revoked.add(access_jti)
+        return _success("Token refreshed", **self._issue_tokens(self.users[username]))
+
+    def verify_token(self, method, query, body, user) -> Response:
+        if user is None:
+            return _error(401, "Token is invalid or expired")
+        return _success(valid=True, user=self._public(user))
+
+    def profile(self, method, query, body, user) -> Response:
+        key = user["username"].lower()
+        answers = self.answers.get(key, [])
+        statistics = {
+            "favoriteWords": len(self.favorites.get(key, ())),
+            "learnedWords": len(self.learned.get(key, ())),
+            "customWords": len(self.custom.get(key, {})),
+            "folders": len(self.folders.get(key, {})),
+            "grammarAnswered": len(answers),
+            "grammarCorrect": sum(answers),
+        }
+        return _success(user=self._public(user), statistics=statistics)
+
+    # Vocabulary
+
+    def _word(self, word: Dict[str, Any], key: str) -> Dict[str, Any]:
+        return {
+            **word,
+            "isFavorite": word["id"] in self.favorites.get(key, ()),
+            "isLearned": word["id"] in self.learned.get(key, ()),
+        }
+
+    def _paginate(self, items: List, query: Dict[str, str]) -> Optional[Tuple]:
+        page = _int(query.get("page"), 1)
+        limit = _int(query.get("limit"), self.default_page_size)
+        if page is None or limit is None or page < 1 or limit < 1:
+            return None
+        limit = min(limit, self.max_page_size)
+        total_pages = max(1, math.ceil(len(items) / limit))
+        start = (page - 1) * limit
+        pagination = {
+            "page": page,
+            "currentPage": page,
+            "limit": limit,
+            "total_pages": total_pages,
+            "totalPages": total_pages,
+            "total_count": len(items),
+            "totalItems": len(items),
+        }
+        return items[start : start + limit], pagination
+
+    def vocabulary(self, method, query, body, user) -> Response:
+        if method != "GET":
+            return _error(405, "Method not allowed")
+        words = self.words
+        search = query.get("search", "").strip().lower()
+        if search:
+            words = [word for word in words if search in word["word"].lower()]
+        for field in ("difficulty", "category"):
+            if query.get(field):
+                words = [word for word in words if word.get(field) == query[field]]
+        page = self._paginate(words, query)
+        if page is None:
+            return _error(400, "Invalid pagination parameters")
+        items, pagination = page
+        key = user["username"].lower()
+        items = [self._word(word, key) for word in items]
+        # Both shapes used by the suites: a ``data`` list and ``words``
+        return _success(data=items, words=items, pagination=pagination)
+
+    def _word_set(self, name: str, store: Dict[str, set], method, query, body, user):
+        key = user["username"].lower()
+        marked = store.setdefault(key, set())
+        if method == "GET":
+            items = [self._word(self.words_by_id[i], key) for i in sorted(marked)]
+            return _success(**{name: items, "count": len(items)})
+        word_id = _int(body.get("wordId", query.get("wordId")))
+        if word_id not in self.words_by_id:
+            return _error(404, "Word not found")
+        with self._lock:
+            if method == "POST":
+                if word_id in marked:
+                    return _error(409, f"Word already in {name}")
+                marked.add(word_id)
+                return _success(f"Word added to {name}", wordId=word_id)
+            if method == "DELETE":
+                if word_id not in marked:
+                    return _error(404, f"Word not found in {name}")
+                marked.discard(word_id)
+                return _success(f"Word removed from {name}", wordId=word_id)
+        return _error(405, "Method not allowed")
+
+    def favorite_words(self, method, query, body, user) -> Response:
+        return self._word_set("favorites", self.favorites, method, query, body, user)
+
+    def learned_words(self, method, query, body, user) -> Response:
+        return self._word_set("learned", self.learned, method, query, body, user)
+
+    def _validate_entry(self, body: Dict[str, Any], partial: bool) -> Optional[str]:
+        for field in ("word", "definition"):
+            if field not in body and partial:
+                continue
+            value = str(body.get(field) or "").strip()
+            if not value:
+                return f"Missing required field: {field}"
+            if len(value) > MAX_FIELD_LENGTH and field == "word":
+                return f"Word exceeds {MAX_FIELD_LENGTH} characters"
+            if "<" in value or ">" in value:
+                return f"Invalid characters in {field}"
+        return None
+
+    def custom_vocabulary(self, method, query, body, user) -> Response:
+        key = user["username"].lower()
+        entries = self.custom.setdefault(key, {})
+        if method == "GET":
+            return _success(entries=list(entries.values()), count=len(entries))
+        if method == "POST":
+            problem = self._validate_entry(body, partial=False)
+            if problem:
+                return _error(400, problem)
+            entry = {
+                "id": next(self._ids),
+                "word": body["word"].strip(),
+                "definition": body["definition"].strip(),
+                "pronunciation": body.get("pronunciation", ""),
+                "notes": body.get("notes", ""),
+                "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            with self._lock:
+                entries[entry["id"]] = entry
+            return _success("Entry created", 201, id=entry["id"], entry=entry)
+
+        entry_id = _int(body.get("id", query.get("id")))
+        if entry_id not in entries:
+            return _error(404, "Entry not found")
+        if method in ("PUT", "PATCH"):
+            problem = self._validate_entry(body, partial=True)
+            if problem:
+                return _error(400, problem)
+            with self._lock:
+                entry = entries[entry_id]
+                for field in ("word", "definition", "pronunciation", "notes"):
+                    if field in body:
+                        entry[field] = body[field]
+            return _success("Entry updated", id=entry_id, entry=entry)
+        if method == "DELETE":
+            with self._lock:
+                entries.pop(entry_id, None)
+            return _success("Entry deleted", id=entry_id)
+        return _error(405, "Method not allowed")
+
+    def export_vocabulary(self, method, query, body, user) -> Response:
+        entries = self.custom.get(user["username"].lower(), {}).values()
+        lines = ["word,definition,pronunciation"]
+        lines += [
+            f"{e['word']},{e['definition']},{e.get('pronunciation', '')}"
+            for e in entries
+        ]
+        return _success(format="csv", fileContent="\n".join(lines))
+
+    # Folders
+
+    def _validate_folder(self, body: Dict[str, Any], partial: bool) -> Optional[str]:
+        name = str(body.get("name") or "").strip()
+        if not name and not (partial and "name" not in body):
+            return "Folder name is required"
+        if len(name) > MAX_FIELD_LENGTH:
+            return f"Folder name exceeds {MAX_FIELD_LENGTH} characters"
+        if "color" in body and not COLOR_PATTERN.match(str(body["color"])):
+            return "Invalid folder color"
+        return None
+
+    def folder_list(self, method, query, body, user) -> Response:
+        folders = self.folders.setdefault(user["username"].lower(), {})
+        if method == "GET":
+            return _success(folders=list(folders.values()), count=len(folders))
+        if method == "POST":
+            problem = self._validate_folder(body, partial=False)
+            if problem:
+                return _error(400, problem)
+            folder = {
+                "id": next(self._ids),
+                "name": body["name"].strip(),
+                "color": body.get("color", "#007bff"),
+                "icon": body.get("icon", "folder"),
+                "description": body.get("description", ""),
+                "wordIds": [],
+                "wordCount": 0,
+            }
+            with self._lock:
+                folders[folder["id"]] = folder
+            return _success("Folder created", 201, id=folder["id"], folder=folder)
+
+        folder_id = _int(body.get("id", body.get("folderId", query.get("id"))))
+        if folder_id not in folders:
+            return _error(404, "Folder not found")
+        if method in ("PUT", "PATCH"):
+            problem = self._validate_folder(body, partial=True)
+            if problem:
+                return _error(400, problem)
+            with self._lock:
+                folder = folders[folder_id]
+                for field in ("name", "color", "icon", "description"):
+                    if field in body:
+                        folder[field] = body[field]
+            return _success("Folder updated", id=folder_id, folder=folder)
+        if method == "DELETE":
+            with self._lock:
+                folders.pop(folder_id, None)
+            return _success("Folder deleted", id=folder_id)
+        return _error(405, "Method not allowed")
+
+    def move_words(self, method, query, body, user) -> Response:
+        folders = self.folders.setdefault(user["username"].lower(), {})
+        folder = folders.get(_int(body.get("folderId")))
+        if folder is None:
+            return _error(404, "Folder not found")
+        word_ids = [_int(word_id) for word_id in body.get("wordIds") or []]
+        unknown = [word_id for word_id in word_ids if word_id not in self.words_by_id]
+        if unknown or not word_ids:
+            return _error(400, "Unknown or missing word ids")
+        with self._lock:
+            for other in folders.values():
+                other["wordIds"] = [i for i in other["wordIds"] if i not in word_ids]
+                other["wordCount"] = len(other["wordIds"])
+            folder["wordIds"].extend(word_ids)
+            folder["wordCount"] = len(folder["wordIds"])
+        return _success("Words moved", moved=len(word_ids), folder=folder)
+
+    def empty_folder(self, method, query, body, user) -> Response:
+        folders = self.folders.setdefault(user["username"].lower(), {})
+        folder = folders.get(_int(body.get("folderId", query.get("id"))))
+        if folder is None:
+            return _error(404, "Folder not found")
+        with self._lock:
+            folder["wordIds"], folder["wordCount"] = [], 0
+        return _success("Folder emptied", folder=folder)
+
+    # Grammar
+
+    def grammar_categories(self, method, query, body, user) -> Response:
+        categories = [
+            {"id": category_id, **details}
+            for category_id, details in self.categories.items()
+        ]
+        return _success(categories=categories)
+
+    def grammar_exercises(self, method, query, body, user) -> Response:
+        exercises = list(self.exercises.values())
+        for field in ("category", "difficulty"):
+            if query.get(field):
+                exercises = [e for e in exercises if e.get(field) == query[field]]
+        page = self._paginate(exercises, query)
+        if page is None:
+            return _error(400, "Invalid pagination parameters")
+        items, pagination = page
+        hidden = ("correct_answer", "explanation")
+        items = [{k: v for k, v in item.items() if k not in hidden} for item in items]
+        return _success(exercises=items, pagination=pagination)
+
+    def grammar_submit(self, method, query, body, user) -> Response:
+        if method != "POST":
+            return _error(405, "Method not allowed")
+        exercise = self.exercises.get(str(body.get("exerciseId")))
+        if exercise is None:
+            return _error(404, "Exercise not found")
+        answer = str(body.get("answer") or "").strip()
+        if not answer:
+            return _error(400, "Answer is required")
+
+        def normalize(text: str) -> str:
+            return re.sub(r"[\s!?.]+$", "", text.strip().lower())
+
+        correct = normalize(answer) == normalize(str(exercise.get("correct_answer")))
+        with self._lock:
+            self.answers.setdefault(user["username"].lower(), []).append(correct)
+        return _success(
+            exerciseId=exercise["id"],
+            isCorrect=correct,
+            score=int(correct),
+            correctAnswer=exercise.get("correct_answer"),
+            explanation=exercise.get("explanation", ""),
+        )
+
+    def grammar_progress(self, method, query, body, user) -> Response:
+        answers = self.answers.get(user["username"].lower(), [])
+        accuracy = round(100 * sum(answers) / len(answers), 1) if answers else 0.0
+        return _success(
+            answered=len(answers), correct=sum(answers), accuracyRate=accuracy
+        )
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server answering api.php requests from a MockAPI"""
+
+    daemon_threads = True
+    # Listen backlog; the default of 5 makes load test ramps wait on SYN retries
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], api: MockAPI, verbose: bool = False):
+        super().__init__(address, MockRequestHandler)
+        self.api = api
+        self.verbose = verbose
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def count(self, endpoint: str, status: int) -> None:
+        with self._stats_lock:
+            entry = self.stats.setdefault(endpoint or "/", {})
+            entry[str(status)] = entry.get(str(status), 0) + 1
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's MockAPI with the configured behaviour"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+    server: MockServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_GET
+
+    def _send(
+        self, status: int, body: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        if isinstance(body, bytes):
+            data, content_type = body, "text/html; charset=utf-8"
+        else:
+            data, content_type = json.dumps(body).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        accepted = self.headers.get("Accept-Encoding", "")
+        if len(data) >= GZIP_MIN_BYTES and "gzip" in accepted:
+            data = gzip.compress(data, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _handle(self) -> None:
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if parts.path == STATS_PATH:
+            with self.server._stats_lock:
+                self._send(200, {"endpoints": self.server.stats})
+            return
+        if not parts.path.endswith("api.php"):
+            if parts.path.rstrip("/").count("/") <= 1 and self.command == "GET":
+                self._send(200, b"<html><body>WordMate mock server</body></html>")
+            else:
+                self._send(404, _error(404, "Not found")[1])
+            return
+
+        query = {
+            name: values[0]
+            for name, values in parse_qs(parts.query, keep_blank_values=True).items()
+        }
+        endpoint = query.pop("endpoint", "")
+        api = self.server.api
+        behaviour = api.behaviour
+
+        authorization = self.headers.get("Authorization")
+        user = api.authenticate(authorization)
+        client = f"user:{user['username']}" if user else self.client_address[0]
+        allowed, headers = behaviour.admit(client)
+
+        time.sleep(behaviour.delay(endpoint))
+
+        injected = behaviour.injected_error(endpoint) if allowed else None
+        if not allowed:
+            status, body = _error(429, "Rate limit exceeded")
+        elif injected is not None:
+            status, body = _error(injected, "Injected server error")
+        else:
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                status, body = _error(400, "Invalid JSON format")
+            else:
+                status, body = api.dispatch(
+                    self.command, endpoint, query, body, authorization
+                )
+        if status == 429 and "Retry-After" not in headers:
+            headers["Retry-After"] = str(body.get("retryAfter", 1))
+
+        self.server.count(endpoint, status)
+        self._send(status, body, headers)
+
+
+def build_server(
+    config: Dict[str, Any],
+    host: str,
+    port: int,
+    seed: Optional[int] = None,
+    verbose: bool = False,
+) -> MockServer:
+    """Seeded server for a ``mock_server`` config section"""
+    rng = random.Random(seed)
+    behaviour = Behaviour(config, seed)
+    seed_data = load_seed(
+        Path(config.get("test_data_dir") or TEST_DATA_DIR),
+        int(config.get("vocabulary_size", DEFAULT_VOCABULARY_SIZE)),
+        rng,
+    )
+    api = MockAPI(
+        seed_data,
+        behaviour,
+        secret=config.get("jwt_secret") or DEFAULT_SECRET,
+        token_expiry=int(config.get("token_expiry") or DEFAULT_TOKEN_EXPIRY),
+    )
+    return MockServer((host, port), api, verbose)
+
+
+def wait_until_ready(url: str, timeout: float = 10) -> bool:
+    """Poll the health endpoint at ``url`` until it answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}?endpoint=health", timeout=1):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+
+def load_mock_config(path: Path) -> Dict[str, Any]:
+    """``mock_server`` section of an environment config, with JWT settings"""
+    config = load_yaml(path)
+    mock_config = dict(config.get("mock_server") or {})
+    authentication = config.get("authentication") or {}
+    mock_config.setdefault("jwt_secret", authentication.get("jwt_secret"))
+    mock_config.setdefault("token_expiry", authentication.get("token_expiry"))
+    return mock_config
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the WordMate api.php",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s
+  %(prog)s --port 9000 --seed 7
+  %(prog)s --no-latency --no-rate-limit --vocabulary-size 10000
+        """,
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=DEFAULT_CONFIG,
+        help="Environment config with a mock_server section "
+        "(default: config/environments/local.yaml)",
+    )
+    parser.add_argument(
+        "--host", help=f"Address to listen on (default: {DEFAULT_HOST})"
+    )
+    parser.add_argument(
+        "--port", type=int, help=f"Port to listen on (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument("--seed", type=int, help="Seed for latency and error draws")
+    parser.add_argument(
+        "--vocabulary-size", type=int, help="Words served, seeded ones included"
+    )
+    parser.add_argument(
+        "--no-latency", action="store_true", help="Answer without configured delays"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        help="Fraction of requests to any endpoint answered with 503",
+    )
+    parser.add_argument(
+        "--no-rate-limit", action="store_true", help="Never answer 429"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    config = load_mock_config(args.config) if args.config.exists() else {}
+    if args.vocabulary_size is not None:
+        config["vocabulary_size"] = args.vocabulary_size
+    if args.no_latency:
+        config["latency"] = {}
+    if args.error_rate is not None:
+        config["errors"] = {"default": {"rate": args.error_rate, "status": 503}}
+    if args.no_rate_limit:
+        config["rate_limit"] = {}
+
+    host = args.host or config.get("host") or DEFAULT_HOST
+    port = args.port or int(config.get("port") or DEFAULT_PORT)
+    seed = args.seed if args.seed is not None else config.get("seed")
+
+    try:
+        server = build_server(config, host, port, seed, args.verbose)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"❌ Could not start mock server: {e}")
+        return 1
+
+    api = server.api
+    print(
+        f"🚀 WordMate mock API on http://{host}:{port}/php/api.php "
+        f"({len(api.users)} users, {len(api.words)} words, "
+        f"{len(api.exercises)} grammar exercises)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
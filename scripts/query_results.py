@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+WordMate Results Query
+
+Answers common questions about past test runs straight from the results
+history database written by ``generate_report.py --history-db``, without
+re-parsing any output XML.
+
+Usage:
+    python scripts/query_results.py slowest --since 7d --limit 50
+    python scripts/query_results.py p95 --recent 7d --baseline 28d --min-increase 20
+    python scripts/query_results.py failures "connection refused" --since 30d
+    python scripts/query_results.py pass-rate --by tag --since 30d
+    python scripts/query_results.py regressions --runs 10
+    python scripts/query_results.py flaky --quarantined
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.report_history import DEFAULT_HISTORY_DB, ResultsHistory
+
+_PERIOD_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_period(value: str) -> float:
+    """Turn ``30m``, ``12h``, ``7d``, ``2w`` or an ISO date into a timestamp"""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([mhdw])", value.strip().lower())
+    if match:
+        return time.time() - float(match.group(1)) * _PERIOD_UNITS[match.group(2)]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid period '{value}': use e.g. 7d, 12h, 2w or 2024-01-31"
+        )
+
+
+def _format_value(key: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if key.endswith("started_at"):
+        return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M")
+    if key == "message":
+        return " ".join(str(value).split())[:120]
+    return str(value)
+
+
+def print_rows(rows: List[Dict[str, Any]], output_format: str) -> None:
+    """Print result rows as an aligned table, JSON or CSV"""
+    if output_format == "json":
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        if output_format == "table":
+            print("No matching results")
+        return
+
+    columns = list(rows[0])
+    if output_format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+
+    cells = [[_format_value(key, row[key]) for key in columns] for row in rows]
+    widths = [
+        max(len(column), *(len(line[index]) for line in cells))
+        for index, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def run_query(history: ResultsHistory, args) -> List[Dict[str, Any]]:
+    """Dispatch a parsed command to the history store"""
+    if args.command == "slowest":
+        return history.slowest_tests(args.since, args.env, args.limit)
+    if args.command == "p95":
+        return history.percentile_changes(
+            recent_since=args.recent,
+            baseline_since=args.baseline,
+            environment=args.env,
+            percent=args.percentile,
+            min_increase=args.min_increase / 100,
+            min_runs=args.min_runs,
+            limit=args.limit,
+        )
+    if args.command == "failures":
+        return history.search_failures(
+            args.text, args.since, args.env, args.limit, raw_query=args.raw
+        )
+    if args.command == "pass-rate":
+        return history.pass_rates(args.by, args.since, args.env)
+    if args.command == "flaky":
+        return history.flaky_tests(
+            min_flip_rate=args.min_flip_rate,
+            quarantined_only=args.quarantined,
+            limit=args.limit,
+        )
+    return history.duration_regressions(since_runs=args.runs, limit=args.limit)
+
+
+def create_argument_parser():
+    """Create command line argument parser"""
+    parser = argparse.ArgumentParser(
+        description="Query the WordMate test results history",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s slowest --since 7d --limit 50
+  %(prog)s p95 --recent 7d --baseline 28d --min-increase 20
+  %(prog)s failures "connection refused" --since 30d
+  %(prog)s failures 'timeout NOT login' --raw
+  %(prog)s --format csv pass-rate --by tag --since 30d
+        """,
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=project_root / DEFAULT_HISTORY_DB,
+        help=f"Results history database (default: {DEFAULT_HISTORY_DB})",
+    )
+    parser.add_argument("--env", help="Only consider runs from this environment")
+    parser.add_argument(
+        "--format",
+        choices=["table", "json", "csv"],
+        default="table",
+        help="Output format (default: table)",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slowest = commands.add_parser(
+        "slowest", help="Tests with the highest mean duration"
+    )
+    slowest.add_argument("--since", type=parse_period, help="e.g. 7d or 2024-01-31")
+    slowest.add_argument("--limit", type=int, default=50)
+
+    p95 = commands.add_parser("p95", help="Tests whose duration percentile rose")
+    p95.add_argument(
+        "--recent",
+        type=parse_period,
+        default="7d",
+        help="Start of the recent period (default: 7d)",
+    )
+    p95.add_argument(
+        "--baseline",
+        type=parse_period,
+        default="35d",
+        help="Start of the baseline period, which ends where --recent starts "
+        "(default: 35d)",
+    )
+    p95.add_argument("--percentile", type=float, default=95)
+    p95.add_argument(
+        "--min-increase",
+        type=float,
+        default=20,
+        help="Minimum rise in percent (default: 20)",
+    )
+    p95.add_argument(
+        "--min-runs",
+        type=int,
+        default=3,
+        help="Minimum runs in each period (default: 3)",
+    )
+    p95.add_argument("--limit", type=int, default=50)
+
+    failures = commands.add_parser("failures", help="Search failure messages")
+    failures.add_argument("text", help="Text to search for")
+    failures.add_argument("--since", type=parse_period, help="e.g. 30d")
+    failures.add_argument(
+        "--raw", action="store_true", help="Treat text as an FTS5 query expression"
+    )
+    failures.add_argument("--limit", type=int, default=100)
+
+    pass_rate = commands.add_parser(
+        "pass-rate", help="Pass rate per tag, suite or test"
+    )
+    pass_rate.add_argument("--by", choices=["tag", "suite", "test"], default="tag")
+    pass_rate.add_argument("--since", type=parse_period, help="e.g. 30d")
+
+    regressions = commands.add_parser(
+        "regressions", help="Duration regressions detected at ingestion"
+    )
+    regressions.add_argument(
+        "--runs", type=int, default=10, help="Look back this many runs (default: 10)"
+    )
+    regressions.add_argument("--limit", type=int, default=50)
+
+    flaky = commands.add_parser("flaky", help="Tests ranked by outcome flip rate")
+    flaky.add_argument(
+        "--min-flip-rate",
+        type=float,
+        default=0.0,
+        help="Only tests flipping more often than this (0-1, default: 0)",
+    )
+    flaky.add_argument(
+        "--quarantined", action="store_true", help="Only quarantined tests"
+    )
+    flaky.add_argument("--limit", type=int, default=50)
+
+    return parser
+
+
+def main():
+    """Main entry point"""
+    parser = create_argument_parser()
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"❌ No results history at {args.db}")
+        print("   Record runs with: generate_report.py --history-db <path>")
+        return 1
+
+    started = time.perf_counter()
+    with ResultsHistory(args.db) as history:
+        try:
+            rows = run_query(history, args)
+        except sqlite3.OperationalError as e:
+            print(f"❌ Query failed: {e}")
+            return 1
+    print_rows(rows, args.format)
+
+    if args.format == "table":
+        print(f"\n{len(rows)} rows in {time.perf_counter() - started:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
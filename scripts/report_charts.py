@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+WordMate Report Charts
+
+Chart rendering for the report generator. Charts are described as plain
+data specs, rendered in parallel worker processes with matplotlib's
+object-oriented API, and cached on disk by a hash of their spec so an
+unchanged chart is never redrawn. matplotlib is only imported inside the
+workers; when it is not installed, charts are written as dependency-free
+SVG instead.
+"""
+
+import hashlib
+import importlib.util
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scripts.report_html import escape
+
+CHART_BACKENDS = ("auto", "matplotlib", "svg", "none")
+CHART_DPI = 100
+CHART_CACHE_VERSION = 1
+
+PASS_COLOR = "#28a745"
+FAIL_COLOR = "#dc3545"
+BAR_COLOR = "#007bff"
+
+
+def matplotlib_available() -> bool:
+    """Check for matplotlib without paying for its import"""
+    return importlib.util.find_spec("matplotlib") is not None
+
+
+def _shorten(label: str, length: int) -> str:
+    return label[:length] + "..." if len(label) > length else label
+
+
+def build_chart_specs(report_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Describe the report charts as plain, hashable data"""
+    specs = []
+
+    passed = report_data["summary"]["passed_tests"]
+    failed = report_data["summary"]["failed_tests"]
+    if passed or failed:
+        slices = []
+        if passed > 0:
+            slices.append(
+                {"label": f"Passed ({passed})", "value": passed, "color": PASS_COLOR}
+            )
+        if failed > 0:
+            slices.append(
+                {"label": f"Failed ({failed})", "value": failed, "color": FAIL_COLOR}
+            )
+        specs.append(
+            {
+                "key": "test_results_pie",
+                "name": "Test Results Distribution",
+                "type": "pie",
+                "slices": slices,
+            }
+        )
+
+    performance_data = report_data["details"]["performance_metrics"]
+    if performance_data:
+        files = list(performance_data.keys())
+        specs.append(
+            {
+                "key": "execution_time_chart",
+                "name": "Execution Time by Test File",
+                "type": "bar",
+                "labels": [_shorten(f, 20) for f in files],
+                "series": [
+                    {
+                        "label": "Execution Time (seconds)",
+                        "values": [performance_data[f]["execution_time"] for f in files],
+                        "color": BAR_COLOR,
+                        "format": "{:.1f}s",
+                    }
+                ],
+                "xlabel": "Test Files",
+                "ylabel": "Execution Time (seconds)",
+            }
+        )
+
+    suites = report_data["details"]["test_suites"]
+    if suites:
+        specs.append(
+            {
+                "key": "test_suite_comparison",
+                "name": "Test Results by Suite",
+                "type": "bar",
+                "labels": [_shorten(suite["name"], 15) for suite in suites],
+                "series": [
+                    {
+                        "label": "Passed",
+                        "values": [suite["statistics"]["passed"] for suite in suites],
+                        "color": PASS_COLOR,
+                        "format": "{:.0f}",
+                    },
+                    {
+                        "label": "Failed",
+                        "values": [suite["statistics"]["failed"] for suite in suites],
+                        "color": FAIL_COLOR,
+                        "format": "{:.0f}",
+                    },
+                ],
+                "xlabel": "Test Suites",
+                "ylabel": "Number of Tests",
+            }
+        )
+
+    return specs
+
+
+def spec_hash(spec: Dict[str, Any], backend: str) -> str:
+    """Stable hash of everything that affects a chart's pixels"""
+    payload = json.dumps(
+        {"spec": spec, "backend": backend, "version": CHART_CACHE_VERSION},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def render_matplotlib_chart(spec: Dict[str, Any], path: str) -> str:
+    """Render one chart to PNG with the object-oriented API (worker entry point)"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if spec["type"] == "pie":
+        fig = Figure(figsize=(8, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.pie(
+            [s["value"] for s in spec["slices"]],
+            labels=[s["label"] for s in spec["slices"]],
+            colors=[s["color"] for s in spec["slices"]],
+            autopct="%1.1f%%",
+            startangle=90,
+        )
+    else:
+        series = spec["series"]
+        fig = Figure(figsize=(12, 8 if len(series) > 1 else 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        x = range(len(spec["labels"]))
+        width = 0.8 / len(series) if len(series) > 1 else 0.8
+        offset = -(width * (len(series) - 1)) / 2
+
+        for position, item in enumerate(series):
+            bars = ax.bar(
+                [i + offset + position * width for i in x],
+                item["values"],
+                width,
+                label=item["label"],
+                color=item["color"],
+                alpha=0.8,
+            )
+            for bar, value in zip(bars, item["values"]):
+                if value > 0:
+                    ax.text(
+                        bar.get_x() + bar.get_width() / 2.0,
+                        bar.get_height() + 0.1,
+                        item["format"].format(value),
+                        ha="center",
+                        va="bottom",
+                    )
+
+        ax.set_xlabel(spec["xlabel"])
+        ax.set_ylabel(spec["ylabel"])
+        ax.set_xticks(list(x))
+        ax.set_xticklabels(spec["labels"], rotation=45, ha="right")
+        if len(series) > 1:
+            ax.legend()
+
+    ax.set_title(spec["name"], fontsize=16, fontweight="bold")
+    fig.tight_layout()
+    fig.savefig(path, dpi=CHART_DPI, bbox_inches="tight")
+    return path
+
+
+def render_svg_chart(spec: Dict[str, Any]) -> str:
+    """Render a chart as a standalone SVG document without matplotlib"""
+    if spec["type"] == "pie":
+        return _svg_pie(spec)
+    return _svg_bars(spec)
+
+
+def _svg_document(width: int, height: int, title: str, body: List[str]) -> str:
+    return "\n".join(
+        [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+            f'width="{width}" height="{height}" font-family="sans-serif" font-size="12">',
+            f'<text x="{width / 2}" y="24" text-anchor="middle" font-size="18" '
+            f'font-weight="bold">{escape(title)}</text>',
+            *body,
+            "</svg>",
+        ]
+    )
+
+
+def _svg_pie(spec: Dict[str, Any]) -> str:
+    width, height, radius = 480, 360, 130
+    cx, cy = width / 2, height / 2 + 15
+    total = sum(s["value"] for s in spec["slices"])
+    body = []
+    angle = -math.pi / 2
+
+    for item in spec["slices"]:
+        fraction = item["value"] / total
+        end = angle + fraction * 2 * math.pi
+        if fraction >= 1:
+            body.append(f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{item["color"]}"/>')
+        else:
+            large = 1 if fraction > 0.5 else 0
+            x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+            x2, y2 = cx + radius * math.cos(end), cy + radius * math.sin(end)
+            body.append(
+                f'<path d="M{cx},{cy} L{x1:.2f},{y1:.2f} '
+                f'A{radius},{radius} 0 {large} 1 {x2:.2f},{y2:.2f} Z" fill="{item["color"]}"/>'
+            )
+        middle = (angle + end) / 2
+        lx, ly = cx + (radius + 25) * math.cos(middle), cy + (radius + 25) * math.sin(middle)
+        anchor = "start" if math.cos(middle) >= 0 else "end"
+        body.append(
+            f'<text x="{lx:.2f}" y="{ly:.2f}" text-anchor="{anchor}">'
+            f'{escape(item["label"])} {fraction * 100:.1f}%</text>'
+        )
+        angle = end
+
+    return _svg_document(width, height, spec["name"], body)
+
+
+def _svg_bars(spec: Dict[str, Any]) -> str:
+    labels, series = spec["labels"], spec["series"]
+    left, top, bottom, slot = 60, 50, 110, 60
+    width = max(480, left + 20 + slot * len(labels))
+    height = 420
+    plot_height = height - top - bottom
+    peak = max((max(s["values"]) for s in series if s["values"]), default=0) or 1
+    bar_width = (slot * 0.8) / len(series)
+    body = [
+        f'<line x1="{left}" y1="{height - bottom}" x2="{width - 10}" '
+        f'y2="{height - bottom}" stroke="#333"/>',
+        f'<text x="16" y="{top + plot_height / 2}" text-anchor="middle" '
+        f'transform="rotate(-90 16 {top + plot_height / 2})">{escape(spec["ylabel"])}</text>',
+    ]
+
+    for index, label in enumerate(labels):
+        slot_x = left + 10 + index * slot
+        for position, item in enumerate(series):
+            value = item["values"][index]
+            bar_height = plot_height * value / peak
+            x = slot_x + slot * 0.1 + position * bar_width
+            y = height - bottom - bar_height
+            body.append(
+                f'<rect x="{x:.2f}" y="{y:.2f}" width="{bar_width:.2f}" '
+                f'height="{bar_height:.2f}" fill="{item["color"]}" opacity="0.8">'
+                f'<title>{escape(item["label"])}: {item["format"].format(value)}</title></rect>'
+            )
+            if value > 0:
+                body.append(
+                    f'<text x="{x + bar_width / 2:.2f}" y="{y - 4:.2f}" text-anchor="middle" '
+                    f'font-size="10">{item["format"].format(value)}</text>'
+                )
+        label_x, label_y = slot_x + slot / 2, height - bottom + 14
+        body.append(
+            f'<text x="{label_x:.2f}" y="{label_y}" text-anchor="end" '
+            f'transform="rotate(-45 {label_x:.2f} {label_y})">{escape(label)}</text>'
+        )
+
+    if len(series) > 1:
+        for position, item in enumerate(series):
+            y = top + position * 18
+            body.append(
+                f'<rect x="{width - 110}" y="{y}" width="12" height="12" fill="{item["color"]}"/>'
+                f'<text x="{width - 92}" y="{y + 11}">{escape(item["label"])}</text>'
+            )
+
+    return _svg_document(width, height, spec["name"], body)
+
+
+def render_charts(
+    report_data: Dict[str, Any],
+    charts_dir: Path,
+    backend: str = "auto",
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """Render all report charts, reusing cached files, and describe them"""
+    if backend == "none":
+        return []
+    if backend == "auto":
+        backend = "matplotlib" if matplotlib_available() else "svg"
+    if backend == "matplotlib" and not matplotlib_available():
+        print("Warning: matplotlib not available. Rendering SVG charts instead.")
+        backend = "svg"
+
+    charts_dir.mkdir(parents=True, exist_ok=True)
+    extension = "png" if backend == "matplotlib" else "svg"
+
+    charts = []
+    pending = []
+    for spec in build_chart_specs(report_data):
+        chart_path = charts_dir / f"{spec['key']}-{spec_hash(spec, backend)}.{extension}"
+        _remove_stale_charts(charts_dir, spec["key"], chart_path)
+        if not chart_path.exists():
+            pending.append((spec, chart_path))
+        charts.append(
+            {
+                "name": spec["name"],
+                "file": chart_path.name,
+                "type": spec["type"],
+            }
+        )
+
+    failed = []
+    if backend == "svg":
+        for spec, chart_path in pending:
+            try:
+                chart_path.write_text(render_svg_chart(spec), encoding="utf-8")
+            except Exception as e:
+                print(f"Error generating {spec['name']} chart: {e}")
+                failed.append(chart_path.name)
+    elif len(pending) == 1:
+        spec, chart_path = pending[0]
+        try:
+            render_matplotlib_chart(spec, str(chart_path))
+        except Exception as e:
+            print(f"Error generating {spec['name']} chart: {e}")
+            failed.append(chart_path.name)
+    elif pending:
+        workers = min(len(pending), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (
+                    spec,
+                    chart_path,
+                    executor.submit(render_matplotlib_chart, spec, str(chart_path)),
+                )
+                for spec, chart_path in pending
+            ]
+            for spec, chart_path, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error generating {spec['name']} chart: {e}")
+                    failed.append(chart_path.name)
+
+    charts = [chart for chart in charts if chart["file"] not in failed]
+    print(
+        f"Charts ready in {charts_dir} "
+        f"({len(pending) - len(failed)} rendered, "
+        f"{len(charts) - len(pending) + len(failed)} cached)"
+    )
+    return charts
+
+
+def _remove_stale_charts(charts_dir: Path, key: str, current: Path) -> None:
+    for old_chart in charts_dir.glob(f"{key}-*.*"):
+        if old_chart != current:
+            old_chart.unlink()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+WordMate Report Export Formats
+
+Streaming writers for the machine-readable test results. Every format
+carries ``schema_version`` and writes tests row by row from the column
+model, so the full document is never built in memory:
+
+    json      - single compact JSON document (test_results.json)
+    jsonl.gz  - gzip-compressed JSON Lines, one header line then one line
+                per test (test_results.jsonl.gz)
+    parquet   - columnar Parquet written in record batches, requires
+                pyarrow (test_results.parquet)
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from scripts.report_model import STATUS_NAMES, ReportModel
+
+SCHEMA_VERSION = 2
+EXPORT_FORMATS = ("json", "jsonl.gz", "parquet")
+PARQUET_BATCH_SIZE = 50000
+
+_FILE_NAMES = {
+    "json": "test_results.json",
+    "jsonl.gz": "test_results.jsonl.gz",
+    "parquet": "test_results.parquet",
+}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _iter_test_dicts(model: ReportModel) -> Iterator[Dict[str, Any]]:
+    for test in model.iter_tests():
+        yield test.to_dict(include_keywords=True)
+
+
+def _header(report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Report document without the per-test rows"""
+    return {"schema_version": SCHEMA_VERSION, **report_data}
+
+
+def write_json(f: TextIO, report_data: Dict[str, Any], model: ReportModel) -> None:
+    """Write one compact JSON document, streaming ``details.tests``"""
+    header = _header(report_data)
+    details = header.pop("details")
+
+    f.write("{")
+    for key, value in header.items():
+        f.write(f"{_dumps(key)}:{_dumps(value)},")
+
+    f.write('"details":{')
+    for key, value in details.items():
+        f.write(f"{_dumps(key)}:{_dumps(value)},")
+
+    f.write('"tests":[')
+    for index, test in enumerate(_iter_test_dicts(model)):
+        if index:
+            f.write(",")
+        f.write(_dumps(test))
+    f.write("]}}\n")
+
+
+def write_jsonl(f: TextIO, report_data: Dict[str, Any], model: ReportModel) -> None:
+    """Write a header record followed by one record per test"""
+    f.write(_dumps({"type": "header", **_header(report_data)}))
+    f.write("\n")
+    for test in _iter_test_dicts(model):
+        f.write(_dumps({"type": "test", **test}))
+        f.write("\n")
+
+
+def _parquet_schema(report_data: Dict[str, Any]):
+    return pa.schema(
+        [
+            ("suite", pa.dictionary(pa.int32(), pa.string())),
+            ("name", pa.string()),
+            ("status", pa.dictionary(pa.int8(), pa.string())),
+            ("execution_time", pa.float64()),
+            ("start_time", pa.float64()),
+            ("end_time", pa.float64()),
+            ("tags", pa.list_(pa.string())),
+            ("message", pa.string()),
+        ],
+        metadata={
+            "schema_version": str(SCHEMA_VERSION),
+            "meta": _dumps(report_data["meta"]),
+            "summary": _dumps(report_data["summary"]),
+        },
+    )
+
+
+def write_parquet(path: Path, report_data: Dict[str, Any], model: ReportModel) -> None:
+    """Write the test rows as Parquet, one record batch at a time"""
+    schema = _parquet_schema(report_data)
+    suite_dictionary = pa.array(list(model.suites), type=pa.string())
+    status_dictionary = pa.array(STATUS_NAMES, type=pa.string())
+
+    with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+        for start in range(0, len(model), PARQUET_BATCH_SIZE):
+            end = min(start + PARQUET_BATCH_SIZE, len(model))
+            rows = range(start, end)
+            batch = pa.record_batch(
+                [
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(
+                            model.column("suite_ids")[start:end], type=pa.int32()
+                        ),
+                        suite_dictionary,
+                    ),
+                    pa.array(
+                        [model.names[i] for i in model.name_ids[start:end]],
+                        type=pa.string(),
+                    ),
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(model.column("statuses")[start:end], type=pa.int8()),
+                        status_dictionary,
+                    ),
+                    pa.array(model.column("durations")[start:end], type=pa.float64()),
+                    pa.array(
+                        model.column("start_times")[start:end],
+                        type=pa.float64(),
+                        from_pandas=True,
+                    ),
+                    pa.array(
+                        model.column("end_times")[start:end],
+                        type=pa.float64(),
+                        from_pandas=True,
+                    ),
+                    pa.array([model.test(i).tags for i in rows]),
+                    pa.array([model.messages.get(i) for i in rows], type=pa.string()),
+                ],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+
+
+def export_results(
+    output_dir: Path,
+    report_data: Dict[str, Any],
+    model: ReportModel,
+    export_format: str = "json",
+) -> Path:
+    """Write results in the requested format and return the file path"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    if export_format == "parquet" and not PYARROW_AVAILABLE:
+        print("Warning: pyarrow not available. Writing jsonl.gz instead of parquet.")
+        export_format = "jsonl.gz"
+
+    output_file = output_dir / _FILE_NAMES[export_format]
+
+    if export_format == "json":
+        with open(output_file, "w", encoding="utf-8") as f:
+            write_json(f, report_data, model)
+    elif export_format == "jsonl.gz":
+        with gzip.open(output_file, "wt", encoding="utf-8", compresslevel=6) as f:
+            write_jsonl(f, report_data, model)
+    else:
+        write_parquet(output_file, report_data, model)
+
+    return output_file
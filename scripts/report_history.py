@@ -0,0 +1,804 @@
+#!/usr/bin/env python3
+"""
+WordMate Results History
+
+SQLite store of test results across runs, plus incremental duration
+regression detection. Each ingested run only touches the state rows of
+the tests and suites it contains, so ingestion stays cheap with thousands
+of tests and hundreds of stored runs.
+
+Regression detection keeps, per test and per suite, a bounded window of
+baseline durations (robust median and MAD) and a one-sided CUSUM over the
+robust z-score of each new duration. When the CUSUM crosses its decision
+threshold the change is recorded together with the run in which the
+upward drift began, and the baseline is reset to the new level. Slow
+creep is caught by comparing the sliding baseline with the level it was
+anchored at.
+
+Flakiness is tracked the same way: each test keeps its last
+``FLAKY_WINDOW`` attempt outcomes with running flip and failure counts,
+so an ingest only slides those windows forward. Tests whose flip rate
+crosses ``QUARANTINE_FLIP_RATE`` are quarantined until it drops below
+``RELEASE_FLIP_RATE``, and the quarantine list is written as YAML for
+run_tests.py.
+
+The query helpers back scripts/query_results.py: runs are indexed by
+start time, results by test, status and tag, and failure messages are
+searchable through an FTS5 index.
+"""
+
+import itertools
+import json
+import math
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from scripts.report_model import ReportModel
+
+DEFAULT_HISTORY_DB = Path("reports") / "history" / "results.db"
+
+BASELINE_WINDOW = 20
+MIN_BASELINE_SAMPLES = 5
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 8.0
+MAD_SCALE = 1.4826
+MIN_RELATIVE_SPREAD = 0.05
+MIN_ABSOLUTE_SPREAD = 0.01
+MIN_SHIFT_SAMPLES = 4
+Z_SCORE_CLIP = 3.0
+SHIFT_Z_SCORE = 2.0
+MIN_RELATIVE_SLOWDOWN = 0.15
+MIN_ABSOLUTE_SLOWDOWN = 0.1
+
+DEFAULT_QUARANTINE_FILE = Path("config") / "quarantine.yaml"
+_OUTCOME_CODES = {"PASS": "P", "FAIL": "F"}
+FLAKY_WINDOW = 30
+MIN_FLAKY_ATTEMPTS = 5
+QUARANTINE_FLIP_RATE = 0.2
+RELEASE_FLIP_RATE = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_key TEXT UNIQUE NOT NULL,
+    started_at REAL,
+    ingested_at REAL NOT NULL,
+    environment TEXT,
+    report_type TEXT,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_id TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    start_time REAL,
+    message TEXT,
+    tags TEXT,
+    PRIMARY KEY (run_id, test_id)
+);
+
+CREATE TABLE IF NOT EXISTS result_tags (
+    tag TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    test_id TEXT NOT NULL,
+    PRIMARY KEY (tag, run_id, test_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results(test_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results(status, run_id);
+
+CREATE TABLE IF NOT EXISTS flakiness_state (
+    test_id TEXT PRIMARY KEY,
+    outcomes TEXT NOT NULL,
+    flips INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    flip_rate REAL NOT NULL,
+    failure_rate REAL NOT NULL,
+    quarantined_since INTEGER,
+    last_run INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_flakiness_rate ON flakiness_state(flip_rate);
+
+CREATE TABLE IF NOT EXISTS duration_state (
+    kind TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    baseline TEXT NOT NULL,
+    pending TEXT NOT NULL,
+    cusum REAL NOT NULL,
+    anchor TEXT,
+    runs_seen INTEGER NOT NULL,
+    last_run INTEGER,
+    PRIMARY KEY (kind, entity)
+);
+
+CREATE TABLE IF NOT EXISTS duration_changes (
+    kind TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    change_run INTEGER NOT NULL,
+    detected_run INTEGER NOT NULL,
+    baseline_median REAL NOT NULL,
+    new_median REAL NOT NULL,
+    PRIMARY KEY (kind, entity, change_run)
+);
+"""
+
+# Full-text index over result messages, stored against the results rowid
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+    message, content='results', content_rowid='rowid'
+);
+"""
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Linearly interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _run_filter(
+    since: Optional[float], until: Optional[float], environment: Optional[str]
+) -> Tuple[str, List[Any]]:
+    """SQL condition and parameters selecting runs by start time and environment"""
+    conditions = ["1 = 1"]
+    params: List[Any] = []
+    if since is not None:
+        conditions.append("runs.started_at >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("runs.started_at < ?")
+        params.append(until)
+    if environment:
+        conditions.append("runs.environment = ?")
+        params.append(environment)
+    return " AND ".join(conditions), params
+
+
+def robust_baseline(samples: List[float]) -> Tuple[float, float]:
+    """Median and scaled MAD of a sample, with a floor on the spread"""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(value - median) for value in samples) * MAD_SCALE
+    spread = max(mad, median * MIN_RELATIVE_SPREAD, MIN_ABSOLUTE_SPREAD)
+    return median, spread
+
+
+class ResultsHistory:
+    """Persistent store of per-run test results"""
+
+    def __init__(self, db_path: Path = DEFAULT_HISTORY_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self.fts_available = self._create_search_index()
+
+    def _create_search_index(self) -> bool:
+        """Create the message search index, backfilling older databases"""
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'message_search'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            with self.connection:
+                self.connection.executescript(_FTS_SCHEMA)
+                self.connection.execute(
+                    "INSERT INTO message_search(message_search) VALUES ('rebuild')"
+                )
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: searches fall back to LIKE
+            return False
+        return True
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "ResultsHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def ingest_run(
+        self,
+        model: ReportModel,
+        environment: str = None,
+        report_type: str = None,
+        attempts: Optional[Dict[str, List[str]]] = None,
+    ) -> Optional[int]:
+        """Store a run and update duration and flakiness state
+
+        ``attempts`` maps test ids to the statuses of every attempt made
+        in this run, oldest first, for tests that were re-executed; a
+        fail-then-pass rerun then counts as a flip. Returns the run id, or
+        None when the same run (environment and start time) has already
+        been ingested.
+        """
+        started_at = _earliest_start(model)
+        run_key = f"{environment or 'unknown'}:{started_at:.3f}:{len(model)}"
+        counts = model.status_counts()
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO runs (run_key, started_at, ingested_at, "
+                "environment, report_type, total, passed, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_key,
+                    started_at,
+                    time.time(),
+                    environment,
+                    report_type,
+                    len(model),
+                    counts["PASS"],
+                    counts["FAIL"],
+                ),
+            )
+            if not cursor.rowcount:
+                return None
+            run_id = cursor.lastrowid
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (run_id, test_id, suite, name, "
+                "status, duration, start_time, message, tags) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        test.longname,
+                        test.suite,
+                        test.name,
+                        test.status,
+                        test.execution_time,
+                        None if math.isnan(test.start_time) else test.start_time,
+                        test.message or None,
+                        ",".join(test.tags),
+                    )
+                    for test in model.iter_tests()
+                ),
+            )
+
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO result_tags (tag, run_id, test_id) "
+                "VALUES (?, ?, ?)",
+                (
+                    (tag, run_id, test.longname)
+                    for test in model.iter_tests()
+                    for tag in test.tags
+                ),
+            )
+            if self.fts_available:
+                self.connection.execute(
+                    "INSERT INTO message_search (rowid, message) "
+                    "SELECT rowid, message FROM results "
+                    "WHERE run_id = ? AND message IS NOT NULL",
+                    (run_id,),
+                )
+
+            test_durations = {
+                test.longname: test.execution_time
+                for test in model.iter_tests()
+                if test.status in ("PASS", "FAIL")
+            }
+            suite_durations = {
+                suite: stats["execution_time"]
+                for suite, stats in model.suite_statistics().items()
+                if stats["total"]
+            }
+            self._update_duration_state("test", test_durations, run_id)
+            self._update_duration_state("suite", suite_durations, run_id)
+
+            outcomes = {
+                test.longname: "".join(
+                    _OUTCOME_CODES[status]
+                    for status in (attempts or {}).get(test.longname, [test.status])
+                    if status in _OUTCOME_CODES
+                )
+                for test in model.iter_tests()
+            }
+            self._update_flakiness(
+                {test_id: codes for test_id, codes in outcomes.items() if codes},
+                run_id,
+            )
+
+        return run_id
+
+    def _update_flakiness(self, outcomes: Dict[str, str], run_id: int) -> None:
+        """Slide each test's outcome window forward by this run's attempts"""
+        states = {}
+        test_ids = list(outcomes)
+        for start in range(0, len(test_ids), 500):
+            batch = test_ids[start : start + 500]
+            rows = self.connection.execute(
+                "SELECT * FROM flakiness_state WHERE test_id IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            )
+            for row in rows:
+                states[row["test_id"]] = dict(row)
+
+        updates = []
+        for test_id, codes in outcomes.items():
+            state = states.get(test_id) or {
+                "outcomes": "",
+                "flips": 0,
+                "failures": 0,
+                "quarantined_since": None,
+            }
+            for code in codes:
+                _advance_flakiness(state, code)
+
+            seen = len(state["outcomes"])
+            flip_rate = state["flips"] / (seen - 1) if seen > 1 else 0.0
+            if state["quarantined_since"] is None:
+                if seen >= MIN_FLAKY_ATTEMPTS and flip_rate >= QUARANTINE_FLIP_RATE:
+                    state["quarantined_since"] = run_id
+            elif flip_rate < RELEASE_FLIP_RATE:
+                state["quarantined_since"] = None
+
+            updates.append(
+                (
+                    test_id,
+                    state["outcomes"],
+                    state["flips"],
+                    state["failures"],
+                    flip_rate,
+                    state["failures"] / seen,
+                    state["quarantined_since"],
+                    run_id,
+                )
+            )
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO flakiness_state (test_id, outcomes, flips, "
+            "failures, flip_rate, failure_rate, quarantined_since, last_run) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            updates,
+        )
+
+    def flaky_tests(
+        self,
+        min_flip_rate: float = 0.0,
+        quarantined_only: bool = False,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Tests ranked by how often their outcome flips between attempts"""
+        condition = "quarantined_since IS NOT NULL" if quarantined_only else "1 = 1"
+        rows = self.connection.execute(
+            "SELECT * FROM flakiness_state "
+            f"WHERE {condition} AND flip_rate > ? AND length(outcomes) >= ? "
+            "ORDER BY flip_rate DESC, failure_rate DESC, test_id LIMIT ?",
+            (min_flip_rate, MIN_FLAKY_ATTEMPTS, limit),
+        )
+        return [
+            {
+                "test": row["test_id"],
+                "attempts": len(row["outcomes"]),
+                "flip_rate": round(row["flip_rate"], 3),
+                "failure_rate": round(row["failure_rate"], 3),
+                "recent": row["outcomes"][-10:],
+                "quarantined_since": row["quarantined_since"],
+            }
+            for row in rows
+        ]
+
+    def write_quarantine_file(self, path: Path) -> List[Dict[str, Any]]:
+        """Write the quarantine list read by run_tests.py and return it"""
+        quarantined = self.flaky_tests(quarantined_only=True, limit=-1)
+        document = {
+            "generated_at": datetime.now().isoformat(),
+            "window": FLAKY_WINDOW,
+            "tests": [
+                {
+                    "test": test["test"],
+                    "flip_rate": test["flip_rate"],
+                    "failure_rate": test["failure_rate"],
+                    "attempts": test["attempts"],
+                    "since_run": test["quarantined_since"],
+                }
+                for test in quarantined
+            ],
+        }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "# Flaky tests quarantined from the main run, maintained by\n"
+                "# generate_report.py --history-db. run_tests.py runs them\n"
+                "# separately with retries.\n"
+            )
+            yaml.safe_dump(document, f, sort_keys=False)
+        return quarantined
+
+    def _update_duration_state(
+        self, kind: str, durations: Dict[str, float], run_id: int
+    ) -> None:
+        """Advance the CUSUM state of every entity seen in this run"""
+        if not durations:
+            return
+
+        states = self._load_states(kind, durations.keys())
+        updates = []
+        changes = []
+
+        for entity, duration in durations.items():
+            state = states.get(entity) or {
+                "baseline": [],
+                "pending": [],
+                "cusum": 0.0,
+                "runs_seen": 0,
+                "anchor": None,
+            }
+            change = _advance_state(state, duration, run_id)
+            if change:
+                changes.append((kind, entity, *change, run_id))
+            updates.append(
+                (
+                    kind,
+                    entity,
+                    json.dumps(state["baseline"]),
+                    json.dumps(state["pending"]),
+                    state["cusum"],
+                    json.dumps(state["anchor"]),
+                    state["runs_seen"],
+                    run_id,
+                )
+            )
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO duration_state (kind, entity, baseline, pending, "
+            "cusum, anchor, runs_seen, last_run) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            updates,
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO duration_changes (kind, entity, change_run, "
+            "baseline_median, new_median, detected_run) VALUES (?, ?, ?, ?, ?, ?)",
+            changes,
+        )
+
+    def _load_states(self, kind: str, entities: Iterable[str]) -> Dict[str, Dict]:
+        states = {}
+        entities = list(entities)
+        for start in range(0, len(entities), 500):
+            batch = entities[start : start + 500]
+            rows = self.connection.execute(
+                "SELECT * FROM duration_state WHERE kind = ? AND entity IN "
+                f"({','.join('?' * len(batch))})",
+                (kind, *batch),
+            )
+            for row in rows:
+                states[row["entity"]] = {
+                    "baseline": json.loads(row["baseline"]),
+                    "pending": json.loads(row["pending"]),
+                    "cusum": row["cusum"],
+                    "anchor": json.loads(row["anchor"]) if row["anchor"] else None,
+                    "runs_seen": row["runs_seen"],
+                }
+        return states
+
+    def slowest_tests(
+        self,
+        since: Optional[float] = None,
+        environment: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Tests with the highest mean duration over the selected runs"""
+        condition, params = _run_filter(since, None, environment)
+        rows = self.connection.execute(
+            "SELECT r.test_id, COUNT(*) AS runs, AVG(r.duration) AS mean, "
+            "MAX(r.duration) AS max, SUM(r.status = 'FAIL') AS failures "
+            "FROM results r JOIN runs ON runs.run_id = r.run_id "
+            f"WHERE {condition} GROUP BY r.test_id ORDER BY mean DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [
+            {
+                "test": row["test_id"],
+                "runs": row["runs"],
+                "mean_seconds": round(row["mean"], 3),
+                "max_seconds": round(row["max"], 3),
+                "failures": row["failures"],
+            }
+            for row in rows
+        ]
+
+    def percentile_changes(
+        self,
+        recent_since: float,
+        baseline_since: float,
+        environment: Optional[str] = None,
+        percent: float = 95,
+        min_increase: float = 0.2,
+        min_runs: int = 3,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """Tests whose duration percentile rose between two periods
+
+        The baseline period runs from ``baseline_since`` to ``recent_since``
+        and the recent one from ``recent_since`` on. Rows are streamed in
+        test order so only one test's durations are held at a time.
+        """
+        condition, params = _run_filter(baseline_since, None, environment)
+        rows = self.connection.execute(
+            "SELECT r.test_id, r.duration, runs.started_at >= ? AS recent "
+            "FROM results r JOIN runs ON runs.run_id = r.run_id "
+            f"WHERE {condition} AND r.status IN ('PASS', 'FAIL') "
+            "ORDER BY r.test_id",
+            (recent_since, *params),
+        )
+
+        changes = []
+        for test_id, group in itertools.groupby(rows, key=lambda row: row[0]):
+            baseline, recent = [], []
+            for _, duration, is_recent in group:
+                (recent if is_recent else baseline).append(duration)
+            if len(baseline) < min_runs or len(recent) < min_runs:
+                continue
+            before = percentile(baseline, percent)
+            after = percentile(recent, percent)
+            if before > 0 and after / before - 1 > min_increase:
+                changes.append(
+                    {
+                        "test": test_id,
+                        "baseline_runs": len(baseline),
+                        "recent_runs": len(recent),
+                        "baseline_seconds": round(before, 3),
+                        "recent_seconds": round(after, 3),
+                        "increase_percent": round((after / before - 1) * 100, 1),
+                    }
+                )
+
+        changes.sort(key=lambda change: change["increase_percent"], reverse=True)
+        return changes[:limit]
+
+    def search_failures(
+        self,
+        text: str,
+        since: Optional[float] = None,
+        environment: Optional[str] = None,
+        limit: int = 100,
+        raw_query: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Failed results whose message matches ``text``, newest first
+
+        ``text`` is matched as a phrase unless ``raw_query`` is set, in
+        which case it is passed to FTS5 as a full query expression.
+        """
+        condition, params = _run_filter(since, None, environment)
+        select = (
+            "SELECT r.test_id, r.message, r.duration, runs.run_id, "
+            "runs.started_at, runs.environment FROM "
+        )
+        if self.fts_available:
+            query = text if raw_query else '"' + text.replace('"', '""') + '"'
+            sql = (
+                select + "message_search "
+                "JOIN results r ON r.rowid = message_search.rowid "
+                "JOIN runs ON runs.run_id = r.run_id "
+                "WHERE message_search MATCH ? AND r.status = 'FAIL' "
+            )
+            params = [query, *params]
+        else:
+            sql = (
+                select + "results r JOIN runs ON runs.run_id = r.run_id "
+                "WHERE r.message LIKE ? AND r.status = 'FAIL' "
+            )
+            params = [f"%{text}%", *params]
+
+        rows = self.connection.execute(
+            sql + f"AND {condition} ORDER BY runs.started_at DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [
+            {
+                "test": row["test_id"],
+                "run": row["run_id"],
+                "started_at": row["started_at"],
+                "environment": row["environment"],
+                "message": row["message"],
+            }
+            for row in rows
+        ]
+
+    def pass_rates(
+        self,
+        group_by: str = "tag",
+        since: Optional[float] = None,
+        environment: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Pass rate per tag, suite or test over the selected runs"""
+        condition, params = _run_filter(since, None, environment)
+        if group_by == "tag":
+            source = (
+                "result_tags t JOIN results r "
+                "ON r.run_id = t.run_id AND r.test_id = t.test_id"
+            )
+            key = "t.tag"
+        elif group_by in ("suite", "test"):
+            source = "results r"
+            key = "r.suite" if group_by == "suite" else "r.test_id"
+        else:
+            raise ValueError(f"Unsupported grouping: {group_by}")
+
+        rows = self.connection.execute(
+            f"SELECT {key} AS name, COUNT(*) AS total, "
+            "SUM(r.status = 'PASS') AS passed, SUM(r.status = 'FAIL') AS failed "
+            f"FROM {source} JOIN runs ON runs.run_id = r.run_id "
+            f"WHERE {condition} GROUP BY {key} ORDER BY passed * 1.0 / total, name",
+            params,
+        )
+        return [
+            {
+                group_by: row["name"],
+                "total": row["total"],
+                "passed": row["passed"],
+                "failed": row["failed"],
+                "pass_rate_percent": round(row["passed"] / row["total"] * 100, 1),
+            }
+            for row in rows
+        ]
+
+    def duration_regressions(
+        self, since_runs: int = 10, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Changes detected in the last ``since_runs`` runs, slowest first"""
+        rows = self.connection.execute(
+            "SELECT c.kind, c.entity, c.change_run, c.detected_run, "
+            "c.baseline_median, c.new_median, r.started_at "
+            "FROM duration_changes c LEFT JOIN runs r ON r.run_id = c.change_run "
+            "WHERE c.detected_run > (SELECT COALESCE(MAX(run_id), 0) FROM runs) - ? "
+            "ORDER BY (c.new_median - c.baseline_median) DESC LIMIT ?",
+            (since_runs, limit),
+        )
+        return [
+            {
+                "kind": row["kind"],
+                "name": row["entity"],
+                "change_run": row["change_run"],
+                "change_started_at": row["started_at"],
+                "detected_run": row["detected_run"],
+                "baseline_seconds": round(row["baseline_median"], 3),
+                "current_seconds": round(row["new_median"], 3),
+                "added_seconds": round(row["new_median"] - row["baseline_median"], 3),
+                "slowdown_percent": round(
+                    (row["new_median"] / row["baseline_median"] - 1) * 100, 1
+                )
+                if row["baseline_median"]
+                else None,
+            }
+            for row in rows
+        ]
+
+
+def _advance_state(
+    state: Dict[str, Any], duration: float, run_id: int
+) -> Optional[Tuple[int, float, float]]:
+    """Feed one duration into a CUSUM state
+
+    Returns ``(change_run, baseline_median, new_median)`` when a
+    sustained, significant slowdown is confirmed, otherwise None. Step
+    changes are caught by the CUSUM; slow creep, which the sliding
+    baseline would otherwise absorb, is caught by comparing the baseline
+    median against the anchor set at the last confirmed level.
+    """
+    state["runs_seen"] += 1
+    baseline = state["baseline"]
+
+    if len(baseline) < MIN_BASELINE_SAMPLES:
+        baseline.append(duration)
+        if len(baseline) == MIN_BASELINE_SAMPLES:
+            state["anchor"] = [run_id, statistics.median(baseline)]
+        return None
+
+    median, spread = robust_baseline(baseline)
+    # Clip so a single outlier cannot push the CUSUM over the threshold
+    z_score = min(max((duration - median) / spread, -Z_SCORE_CLIP), Z_SCORE_CLIP)
+    cusum = max(0.0, state["cusum"] + z_score - CUSUM_SLACK)
+
+    if cusum == 0.0:
+        # Back to normal: suspected drift samples were noise
+        _fold_pending(state, duration)
+        return _check_creep(state, run_id)
+
+    state["pending"].append([run_id, duration])
+    state["cusum"] = cusum
+    if len(state["pending"]) > BASELINE_WINDOW:
+        # Long excursion without a confirmed shift: age out the oldest sample
+        baseline.append(state["pending"].pop(0)[1])
+        del baseline[:-BASELINE_WINDOW]
+
+    if cusum < CUSUM_THRESHOLD:
+        return None
+
+    # The change segment is the trailing run of samples clearly above the
+    # baseline noise; isolated spikes never form one long enough to confirm
+    shifted = []
+    for sample in reversed(state["pending"]):
+        if (sample[1] - median) / spread <= SHIFT_Z_SCORE:
+            break
+        shifted.insert(0, sample)
+    if len(shifted) < MIN_SHIFT_SAMPLES:
+        return None
+    new_median = statistics.median(value for _, value in shifted)
+
+    if not _is_significant(median, new_median):
+        # Statistically visible but too small to matter
+        _fold_pending(state)
+        return _check_creep(state, run_id)
+
+    # Sustained slowdown: record it and re-baseline at the new level
+    change = (shifted[0][0], median, new_median)
+    state["baseline"] = [value for _, value in shifted][-BASELINE_WINDOW:]
+    state["pending"] = []
+    state["cusum"] = 0.0
+    state["anchor"] = [shifted[0][0], new_median]
+    return change
+
+
+def _is_significant(old: float, new: float) -> bool:
+    return new - old >= max(MIN_ABSOLUTE_SLOWDOWN, old * MIN_RELATIVE_SLOWDOWN)
+
+
+def _check_creep(
+    state: Dict[str, Any], run_id: int
+) -> Optional[Tuple[int, float, float]]:
+    """Report gradual drift of the baseline away from its anchor"""
+    anchor_run, anchor_median = state["anchor"]
+    median = statistics.median(state["baseline"])
+    if not _is_significant(anchor_median, median):
+        return None
+    state["anchor"] = [run_id, median]
+    return anchor_run, anchor_median, median
+
+
+def _advance_flakiness(state: Dict[str, Any], code: str) -> None:
+    """Append one outcome, keeping flip and failure counts in O(1)"""
+    outcomes = state["outcomes"]
+    if outcomes and outcomes[-1] != code:
+        state["flips"] += 1
+    state["failures"] += code == "F"
+    outcomes += code
+
+    if len(outcomes) > FLAKY_WINDOW:
+        if outcomes[0] != outcomes[1]:
+            state["flips"] -= 1
+        state["failures"] -= outcomes[0] == "F"
+        outcomes = outcomes[1:]
+    state["outcomes"] = outcomes
+
+
+def _fold_pending(state: Dict[str, Any], duration: Optional[float] = None) -> None:
+    """Move pending samples back into the baseline window and reset CUSUM"""
+    baseline = state["baseline"]
+    baseline.extend(value for _, value in state["pending"])
+    if duration is not None:
+        baseline.append(duration)
+    del baseline[:-BASELINE_WINDOW]
+    state["pending"] = []
+    state["cusum"] = 0.0
+
+
+def _earliest_start(model: ReportModel) -> float:
+    starts = [value for value in model.start_times if not math.isnan(value)]
+    return min(starts) if starts else time.time()
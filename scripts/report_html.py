@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+WordMate Report HTML Helpers
+
+Helpers for streaming the HTML report to disk. Per-test and failure rows
+are not inlined into the page; they are written as gzip-compressed JSON
+shards wrapped in small script files (so they load from ``file://``),
+and a virtualized table in the page fetches only the shards it needs to
+display.
+"""
+
+import base64
+import gzip
+import html
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+DATA_DIR_NAME = "report-data"
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def escape(value: Any) -> str:
+    """HTML-escape any value for inline rendering"""
+    return html.escape(str(value), quote=True)
+
+
+def write_data_chunks(
+    output_dir: Path,
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[List[Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Write rows as compressed script shards and return the table manifest
+
+    Only one chunk of rows is held in memory at a time.
+    """
+    data_dir = output_dir / DATA_DIR_NAME
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {
+        "columns": list(columns),
+        "rows": 0,
+        "chunk_size": chunk_size,
+        "chunks": [],
+    }
+
+    chunk: List[List[Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            _flush_chunk(data_dir, table_name, chunk, manifest)
+            chunk = []
+
+    if chunk:
+        _flush_chunk(data_dir, table_name, chunk, manifest)
+
+    return manifest
+
+
+def _flush_chunk(
+    data_dir: Path, table_name: str, chunk: List[List[Any]], manifest: Dict[str, Any]
+) -> None:
+    index = len(manifest["chunks"])
+    payload = gzip.compress(
+        json.dumps(chunk, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        compresslevel=6,
+    )
+    encoded = base64.b64encode(payload).decode("ascii")
+
+    file_name = f"{table_name}-{index:05d}.js"
+    with open(data_dir / file_name, "w", encoding="ascii") as f:
+        f.write(f'wmReport.loadChunk("{table_name}",{index},"{encoded}");\n')
+
+    manifest["chunks"].append(f"{DATA_DIR_NAME}/{file_name}")
+    manifest["rows"] += len(chunk)
+
+
+def virtual_table(table_name: str, title: str, manifest: Dict[str, Any]) -> str:
+    """Placeholder markup for a virtualized table"""
+    return f"""
+        <div class="section">
+            <h2>{escape(title)} ({manifest['rows']})</h2>
+            <input class="vt-filter" data-table="{escape(table_name)}" placeholder="Filter loaded rows...">
+            <div class="vt" id="vt-{escape(table_name)}" data-table="{escape(table_name)}"></div>
+        </div>
+"""
+
+
+VIRTUAL_TABLE_CSS = """
+        .vt { position: relative; height: 480px; overflow-y: auto; border: 1px solid #dee2e6; border-radius: 4px; font-size: 0.9em; }
+        .vt-head, .vt-row { display: grid; grid-auto-flow: column; grid-auto-columns: minmax(0, 1fr); height: 32px; line-height: 32px; }
+        .vt-head { position: sticky; top: 0; z-index: 1; background: #f8f9fa; font-weight: 600; border-bottom: 1px solid #dee2e6; }
+        .vt-row { position: absolute; left: 0; right: 0; border-bottom: 1px solid #f1f3f5; }
+        .vt-head span, .vt-row span { padding: 0 8px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+        .vt-row .FAIL { color: #dc3545; font-weight: bold; }
+        .vt-row .PASS { color: #28a745; font-weight: bold; }
+        .vt-filter { margin-bottom: 10px; padding: 6px 10px; width: 300px; border: 1px solid #ced4da; border-radius: 4px; }
+"""
+
+
+VIRTUAL_TABLE_JS = """
+(function () {
+  var ROW_HEIGHT = 32, OVERSCAN = 10;
+  var manifest = JSON.parse(document.getElementById("wm-manifest").textContent);
+  var tables = {};
+
+  function decode(encoded) {
+    var bytes = Uint8Array.from(atob(encoded), function (c) { return c.charCodeAt(0); });
+    var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+    return new Response(stream).json();
+  }
+
+  window.wmReport = {
+    loadChunk: function (name, index, encoded) {
+      decode(encoded).then(function (rows) {
+        var table = tables[name];
+        table.chunks[index] = rows;
+        table.pending[index] = false;
+        if (table.filterText) { applyFilter(table, table.filterText); } else { render(table); }
+      });
+    }
+  };
+
+  function requestChunk(table, index) {
+    if (table.chunks[index] || table.pending[index]) { return; }
+    table.pending[index] = true;
+    var script = document.createElement("script");
+    script.src = table.meta.chunks[index];
+    document.body.appendChild(script);
+  }
+
+  function rowAt(table, position) {
+    var index = table.filtered ? table.filtered[position] : position;
+    var chunk = table.chunks[Math.floor(index / table.meta.chunk_size)];
+    return chunk ? chunk[index % table.meta.chunk_size] : null;
+  }
+
+  function render(table) {
+    var count = table.filtered ? table.filtered.length : table.meta.rows;
+    table.spacer.style.height = (count * ROW_HEIGHT) + "px";
+    var first = Math.max(0, Math.floor(table.el.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(count, first + Math.ceil(table.el.clientHeight / ROW_HEIGHT) + 2 * OVERSCAN);
+    var fragment = document.createDocumentFragment();
+    for (var position = first; position < last; position++) {
+      var row = rowAt(table, position);
+      if (!row) {
+        var index = table.filtered ? table.filtered[position] : position;
+        requestChunk(table, Math.floor(index / table.meta.chunk_size));
+        continue;
+      }
+      var line = document.createElement("div");
+      line.className = "vt-row";
+      line.style.top = ((position + 1) * ROW_HEIGHT) + "px";
+      row.forEach(function (value, column) {
+        var cell = document.createElement("span");
+        cell.textContent = value;
+        cell.title = value;
+        if (table.meta.columns[column] === "Status") { cell.className = value; }
+        line.appendChild(cell);
+      });
+      fragment.appendChild(line);
+    }
+    table.body.replaceChildren(fragment);
+  }
+
+  function applyFilter(table, text) {
+    text = text.toLowerCase();
+    table.filterText = text;
+    if (!text) { table.filtered = null; render(table); return; }
+    for (var i = 0; i < table.meta.chunks.length; i++) { requestChunk(table, i); }
+    table.filtered = [];
+    table.chunks.forEach(function (chunk, chunkIndex) {
+      if (!chunk) { return; }
+      chunk.forEach(function (row, rowIndex) {
+        if (row.join(" ").toLowerCase().indexOf(text) !== -1) {
+          table.filtered.push(chunkIndex * table.meta.chunk_size + rowIndex);
+        }
+      });
+    });
+    render(table);
+  }
+
+  document.querySelectorAll(".vt").forEach(function (el) {
+    var meta = manifest[el.dataset.table];
+    var head = document.createElement("div");
+    head.className = "vt-head";
+    meta.columns.forEach(function (column) {
+      var cell = document.createElement("span");
+      cell.textContent = column;
+      head.appendChild(cell);
+    });
+    var spacer = document.createElement("div");
+    var body = document.createElement("div");
+    el.appendChild(head);
+    el.appendChild(spacer);
+    el.appendChild(body);
+    var table = { el: el, meta: meta, spacer: spacer, body: body, chunks: [], pending: [], filtered: null, filterText: "" };
+    tables[el.dataset.table] = table;
+    el.addEventListener("scroll", function () { render(table); }, { passive: true });
+    render(table);
+  });
+
+  document.querySelectorAll(".vt-filter").forEach(function (input) {
+    var timer = null;
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () { applyFilter(tables[input.dataset.table], input.value); }, 200);
+    });
+  });
+})();
+"""
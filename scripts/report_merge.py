@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+WordMate Output Merging
+
+Decides which Robot Framework output files in a results directory to
+parse, and collapses repeated executions of the same test into its last
+attempt. A results directory typically holds the per-process outputs of
+a pabot run, the Rebot-merged ``output.xml`` built from them and the
+outputs of ``--rerunfailed`` runs; adding them all up counts every test
+several times.
+
+Files are classified from the root ``<robot>`` element and the top-level
+suite alone, without parsing the rest of the document:
+
+- XML files that are not Robot Framework outputs are skipped.
+- Outputs are grouped into runs by lineage, never by suite name alone:
+  run_tests.py names every output of one invocation after its start
+  (``output_<run>.xml``, ``output_<run>_retry<N>.xml`` for
+  ``--rerunfailed`` attempts, ``quarantine_output_<run>.xml``), so files
+  sharing that stem are one run. Pabot per-process outputs
+  (``pabot_results/<n>/``) belong to the merged output pabot writes next
+  to ``pabot_results`` after them. Any other file is a run of its own.
+- Within a run, Rebot-generated (merged) outputs are skipped when
+  original Robot outputs generated before them are present, since they
+  only repeat those.
+- The remaining files are ordered by generation time so that later files
+  hold later attempts. Repeats of a test are collapsed only within its
+  run; two separate runs of the same suite stay separate results.
+
+Usage:
+    python scripts/report_merge.py reports/dev
+    python scripts/report_merge.py --check
+"""
+
+import argparse
+import math
+import re
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.report_model import ReportModel, parse_robot_timestamp  # noqa: E402
+
+PABOT_RESULTS_DIR = "pabot_results"
+# output_<run>.xml, quarantine_output_<run>.xml and their _retry<N> reruns
+LINEAGE_PATTERN = re.compile(r"^(?:quarantine_)?(?P<stem>.+?)(?:_retry\d+)?$")
+
+
+class OutputFile:
+    """Metadata of one output file, read from its first elements"""
+
+    __slots__ = (
+        "path",
+        "generator",
+        "generated",
+        "suite_name",
+        "suite_source",
+        "run",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        generator: str,
+        generated: float,
+        suite_name: str,
+        suite_source: str,
+    ):
+        self.path = path
+        self.generator = generator
+        self.generated = generated
+        self.suite_name = suite_name
+        self.suite_source = suite_source
+        self.run = lineage_run(path)
+
+    @property
+    def is_merged(self) -> bool:
+        """Whether the file was written by Rebot rather than by a test run"""
+        return self.generator.lower().startswith("rebot")
+
+
+def lineage_run(path: Path) -> str:
+    """Run an output file belongs to, from the name run_tests.py gave it"""
+    stem = LINEAGE_PATTERN.match(path.stem).group("stem")
+    return str(path.parent / stem)
+
+
+def _pabot_output_dir(path: Path) -> Optional[Path]:
+    """Output directory of the pabot run a per-process output comes from"""
+    for parent in path.parents:
+        if parent.name == PABOT_RESULTS_DIR:
+            return parent.parent
+    return None
+
+
+def _assign_pabot_runs(output_files: List[OutputFile]) -> None:
+    """Put pabot per-process outputs in the run of the output merged from them
+
+    That is the first Rebot output written to the pabot output directory
+    after them; without one (pabot stopped before merging) the processes
+    of that directory form a run of their own.
+    """
+    merged: Dict[Path, List[OutputFile]] = {}
+    for output_file in output_files:
+        if output_file.is_merged:
+            merged.setdefault(output_file.path.parent, []).append(output_file)
+
+    for output_file in output_files:
+        output_dir = _pabot_output_dir(output_file.path)
+        if output_dir is None:
+            continue
+        following = [
+            candidate
+            for candidate in merged.get(output_dir, [])
+            if candidate.generated >= output_file.generated
+        ]
+        if following:
+            output_file.run = min(following, key=lambda item: item.generated).run
+        else:
+            output_file.run = str(output_dir / PABOT_RESULTS_DIR)
+
+
+def probe_output_file(path: Path) -> Optional[OutputFile]:
+    """Read the generator and top-level suite of an output file
+
+    Stops at the first ``<suite>`` start tag. Returns None for XML files
+    that are not Robot Framework outputs.
+    """
+    root = None
+    with open(path, "rb") as f:
+        for _, element in ET.iterparse(f, events=("start",)):
+            if root is None:
+                if element.tag != "robot":
+                    return None
+                root = element
+            elif element.tag == "suite":
+                generated = parse_robot_timestamp(root.get("generated"))
+                if math.isnan(generated):
+                    generated = path.stat().st_mtime
+                return OutputFile(
+                    path=path,
+                    generator=root.get("generator", ""),
+                    generated=generated,
+                    suite_name=element.get("name", "Unknown"),
+                    suite_source=element.get("source", ""),
+                )
+    return None
+
+
+def select_output_files(
+    paths: Iterable[Path],
+) -> Tuple[List[OutputFile], List[Tuple[Path, str]]]:
+    """Return ``(files_to_parse, skipped)`` with files in attempt order
+
+    ``skipped`` pairs each ignored path with the reason it was ignored.
+    """
+    output_files: List[OutputFile] = []
+    skipped: List[Tuple[Path, str]] = []
+
+    for path in paths:
+        try:
+            output_file = probe_output_file(path)
+        except (ET.ParseError, OSError) as e:
+            skipped.append((path, f"unreadable: {e}"))
+            continue
+        if output_file is None:
+            skipped.append((path, "not a Robot Framework output"))
+            continue
+        output_files.append(output_file)
+
+    _assign_pabot_runs(output_files)
+    groups: Dict[str, List[OutputFile]] = {}
+    for output_file in output_files:
+        groups.setdefault(output_file.run, []).append(output_file)
+
+    selected: List[OutputFile] = []
+    for files in groups.values():
+        originals = [
+            output_file.generated for output_file in files if not output_file.is_merged
+        ]
+        first_original = min(originals, default=math.inf)
+        for output_file in files:
+            if output_file.is_merged and first_original <= output_file.generated:
+                skipped.append((output_file.path, "merged copy of other outputs"))
+            else:
+                selected.append(output_file)
+
+    selected.sort(key=lambda item: (item.generated, str(item.path)))
+    return selected, skipped
+
+
+def deduplicate_attempts(
+    model: ReportModel, runs: Optional[Dict[str, str]] = None
+) -> Tuple[ReportModel, List[Dict[str, Any]]]:
+    """Keep the last attempt of every test and return the attempt history
+
+    Rows must have been added in attempt order. Tests are identified by
+    their run and full name; repeats inside one output file are distinct
+    tests (Robot Framework allows duplicate names) and are all kept.
+    ``runs`` maps output file paths to their run (``OutputFile.run``);
+    without it every row is taken to come from one run.
+    """
+    runs = runs or {}
+    latest: Dict[Tuple[str, str], Tuple[int, List[int]]] = {}
+    superseded: Dict[Tuple[str, str], List[int]] = {}
+
+    for index in range(len(model)):
+        test = model.test(index)
+        key = (runs.get(test.file, ""), test.longname)
+        file_id = model.file_ids[index]
+        entry = latest.get(key)
+        if entry is None:
+            latest[key] = (file_id, [index])
+        elif entry[0] == file_id:
+            entry[1].append(index)
+        else:
+            superseded.setdefault(key, []).extend(entry[1])
+            latest[key] = (file_id, [index])
+
+    if not superseded:
+        return model, []
+
+    history = []
+    for key, previous_rows in superseded.items():
+        run, longname = key
+        rows = previous_rows + latest[key][1]
+        attempts = [
+            {
+                "status": model.test(row).status,
+                "file": model.test(row).file,
+                "start_time": _time_or_none(model.start_times[row]),
+                "execution_time": model.durations[row],
+                "message": model.test(row).message,
+            }
+            for row in rows
+        ]
+        history.append(
+            {
+                "test_id": longname,
+                "run": run,
+                "name": model.test(rows[-1]).name,
+                "suite": model.test(rows[-1]).suite,
+                "final_status": attempts[-1]["status"],
+                "passed_on_rerun": attempts[-1]["status"] == "PASS"
+                and any(attempt["status"] == "FAIL" for attempt in attempts[:-1]),
+                "attempts": attempts,
+            }
+        )
+
+    keep = [row for _, rows in latest.values() for row in rows]
+    return model.subset(keep), history
+
+
+def _time_or_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _write_check_output(
+    path: Path, generator: str, started: str, statuses: Dict[str, str]
+) -> None:
+    """Write a minimal RF 7 output holding one suite with ``statuses``"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tests = "".join(
+        f'<test id="s1-t{i}" name="{name}">'
+        f'<status status="{status}" start="{started}" elapsed="1.0"/></test>'
+        for i, (name, status) in enumerate(statuses.items(), 1)
+    )
+    path.write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<robot generator="{generator} 7.0 (Python 3.11)" generated="{started}" '
+        f'schemaversion="5"><suite id="s1" name="Api" source="/tests/api">'
+        f'{tests}<status status="PASS" start="{started}" elapsed="3.0"/>'
+        f"</suite><statistics/><errors/></robot>\n",
+        encoding="utf-8",
+    )
+
+
+def check_run_grouping() -> List[str]:
+    """Merge synthetic outputs of separate runs, a rerun and a pabot run
+
+    Returns the problems found; empty when runs are grouped correctly.
+    """
+    from scripts.generate_report import WordMateReportGenerator
+
+    tests = {"Login": "PASS", "Logout": "PASS", "Profile": "FAIL"}
+    rerun = {"Profile": "PASS"}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        # Two back-to-back CLI invocations, the second with a rerun
+        _write_check_output(
+            root / "output_20240101_100000.xml", "Robot", "2024-01-01T10:00:00", tests
+        )
+        _write_check_output(
+            root / "output_20240101_101000.xml", "Robot", "2024-01-01T10:10:00", tests
+        )
+        _write_check_output(
+            root / "output_20240101_101000_retry1.xml",
+            "Robot",
+            "2024-01-01T10:11:00",
+            rerun,
+        )
+        # A pabot run: one process per test and the output merged from them
+        for index, name in enumerate(tests):
+            _write_check_output(
+                root / PABOT_RESULTS_DIR / str(index) / "output.xml",
+                "Robot",
+                f"2024-01-01T10:20:0{index}",
+                {name: tests[name]},
+            )
+        _write_check_output(
+            root / "output_20240101_102000.xml", "Rebot", "2024-01-01T10:21:00", tests
+        )
+
+        generator = WordMateReportGenerator()
+        generator.load_robot_output_files(root)
+        details = generator.report_data["details"]
+
+    problems = []
+    runs = details["runs"]
+    if len(runs) != 3:
+        problems.append(f"expected 3 runs, found {len(runs)}: {runs}")
+    retried = details["retried_tests"]
+    if [test["test_id"] for test in retried] != ["Api.Profile"]:
+        problems.append(f"expected only Api.Profile re-executed, got {retried}")
+    elif not retried[0]["run"].endswith("output_20240101_101000"):
+        problems.append(f"rerun merged into the wrong run: {retried[0]['run']}")
+    if len(generator.model) != 9:
+        problems.append(f"expected 9 tests (3 runs of 3), got {len(generator.model)}")
+    return problems
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Show how Robot Framework outputs are grouped into runs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s reports/dev
+  %(prog)s --check
+        """,
+    )
+    parser.add_argument("input_dir", type=Path, nargs="?", help="Results directory")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check that separate runs, reruns and pabot outputs group correctly",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check_run_grouping()
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Separate runs stay separate; reruns and pabot outputs merge")
+        return 1 if problems else 0
+
+    if args.input_dir is None:
+        parser.error("input_dir is required unless --check is given")
+    selected, skipped = select_output_files(args.input_dir.rglob("*.xml"))
+    runs: Dict[str, List[OutputFile]] = {}
+    for output_file in selected:
+        runs.setdefault(output_file.run, []).append(output_file)
+    for run, files in runs.items():
+        print(f"📦 {run}")
+        for output_file in files:
+            print(f"   {output_file.path} ({output_file.generator or 'unknown'})")
+    for path, reason in skipped:
+        print(f"   ⏭️  {path}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+WordMate Report Data Model
+
+Compact, column-oriented in-memory model for Robot Framework results.
+Suite, test, tag and keyword names are interned into string pools and
+per-test values (status, duration, timestamps) live in typed arrays, so
+a run with 100k+ tests costs a few bytes per test instead of a nested
+dict per test and per keyword.
+
+Usage:
+    python scripts/report_model.py --benchmark 100000
+"""
+
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+STATUS_NAMES = ("PASS", "FAIL", "SKIP", "NOT RUN", "UNKNOWN")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+UNKNOWN_STATUS = STATUS_CODES["UNKNOWN"]
+NO_TIME = float("nan")
+
+
+def status_code(status: Optional[str]) -> int:
+    """Map a Robot Framework status string to its column code"""
+    return STATUS_CODES.get(status or "UNKNOWN", UNKNOWN_STATUS)
+
+
+def parse_robot_timestamp(value: Optional[str]) -> float:
+    """Parse a Robot Framework timestamp into epoch seconds
+
+    Supports both the RF < 7 format (``20240115 10:00:00.123``) and the
+    ISO 8601 format used by RF 7+. Returns NaN when the value is missing.
+    """
+    if not value or value == "N/A":
+        return NO_TIME
+
+    try:
+        return datetime.strptime(value, "%Y%m%d %H:%M:%S.%f").timestamp()
+    except ValueError:
+        pass
+
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return NO_TIME
+
+
+def parse_status_times(status_element) -> Tuple[float, float, float]:
+    """Return ``(start, end, elapsed_seconds)`` for a ``<status>`` element"""
+    if status_element is None:
+        return NO_TIME, NO_TIME, 0.0
+
+    start = parse_robot_timestamp(
+        status_element.get("start") or status_element.get("starttime")
+    )
+    end = parse_robot_timestamp(status_element.get("endtime"))
+
+    elapsed_attr = status_element.get("elapsed")
+    if elapsed_attr is not None:
+        try:
+            elapsed = float(elapsed_attr)
+        except ValueError:
+            elapsed = 0.0
+        if math.isnan(end) and not math.isnan(start):
+            end = start + elapsed
+    elif not math.isnan(start) and not math.isnan(end):
+        elapsed = max(end - start, 0.0)
+    else:
+        elapsed = 0.0
+
+    return start, end, elapsed
+
+
+class StringPool:
+    """Interns strings so repeated names are stored once and referenced by id"""
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        """Return the id for ``value``, adding it to the pool if needed"""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._values)
+            self._ids[value] = string_id
+            self._values.append(sys.intern(value))
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Return the id for ``value`` without adding it"""
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._values[string_id]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+
+class SuiteRecord:
+    """Top-level suite of one output file"""
+
+    __slots__ = (
+        "name",
+        "source",
+        "file",
+        "start_time",
+        "end_time",
+        "execution_time",
+        "first_test",
+        "last_test",
+        "statistics",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        file: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        execution_time: float = 0.0,
+        first_test: int = 0,
+    ):
+        self.name = name
+        self.source = source
+        self.file = file
+        self.start_time = start_time
+        self.end_time = end_time
+        self.execution_time = execution_time
+        self.first_test = first_test
+        self.last_test = first_test
+        self.statistics = {"total": 0, "passed": 0, "failed": 0, "skipped": 0}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary used by the HTML and JSON reports"""
+        return {
+            "name": self.name,
+            "source": self.source,
+            "file": self.file,
+            "statistics": dict(self.statistics),
+            "execution_time": self.execution_time,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
+
+
+class TestRecord:
+    """Lightweight read-only view of one row of a ReportModel"""
+
+    __slots__ = ("_model", "index")
+
+    def __init__(self, model: "ReportModel", index: int):
+        self._model = model
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self._model.names[self._model.name_ids[self.index]]
+
+    @property
+    def suite(self) -> str:
+        return self._model.suites[self._model.suite_ids[self.index]]
+
+    @property
+    def longname(self) -> str:
+        """Stable test id: full suite path plus test name"""
+        return f"{self.suite}.{self.name}"
+
+    @property
+    def file(self) -> str:
+        return self._model.files[self._model.file_ids[self.index]]
+
+    @property
+    def status(self) -> str:
+        return STATUS_NAMES[self._model.statuses[self.index]]
+
+    @property
+    def execution_time(self) -> float:
+        return self._model.durations[self.index]
+
+    @property
+    def start_time(self) -> float:
+        return self._model.start_times[self.index]
+
+    @property
+    def end_time(self) -> float:
+        return self._model.end_times[self.index]
+
+    @property
+    def message(self) -> str:
+        return self._model.messages.get(self.index, "")
+
+    @property
+    def tags(self) -> List[str]:
+        model = self._model
+        start, end = model.tag_offsets[self.index], model.tag_offsets[self.index + 1]
+        return [model.tags[tag_id] for tag_id in model.tag_ids[start:end]]
+
+    @property
+    def keywords(self) -> List[Dict[str, str]]:
+        model = self._model
+        start, end = model.kw_offsets[self.index], model.kw_offsets[self.index + 1]
+        return [
+            {"name": model.keywords[kw_id], "status": STATUS_NAMES[kw_status]}
+            for kw_id, kw_status in zip(
+                model.kw_ids[start:end], model.kw_statuses[start:end]
+            )
+        ]
+
+    def to_dict(self, include_keywords: bool = False) -> Dict[str, Any]:
+        """Serializable representation of the test"""
+        record = {
+            "name": self.name,
+            "suite": self.suite,
+            "status": self.status,
+            "message": self.message,
+            "tags": self.tags,
+            "execution_time": self.execution_time,
+            "start_time": _timestamp_or_none(self.start_time),
+            "end_time": _timestamp_or_none(self.end_time),
+        }
+        if include_keywords:
+            record["keywords"] = self.keywords
+        return record
+
+
+def _copy_suite_record(record: SuiteRecord, first_test: int) -> SuiteRecord:
+    return SuiteRecord(
+        name=record.name,
+        source=record.source,
+        file=record.file,
+        start_time=record.start_time,
+        end_time=record.end_time,
+        execution_time=record.execution_time,
+        first_test=first_test,
+    )
+
+
+def _timestamp_or_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class ReportModel:
+    """Column store for test results
+
+    Every test is one row. Columns are parallel ``array`` objects indexed
+    by row number; variable-length tags and keywords are stored as flat
+    id arrays addressed through offset arrays. Failure messages are kept
+    in a sparse dict because passing tests rarely carry one.
+    """
+
+    def __init__(self):
+        self.suites = StringPool()
+        self.names = StringPool()
+        self.tags = StringPool()
+        self.keywords = StringPool()
+        self.files = StringPool()
+
+        self.suite_ids = array("I")
+        self.name_ids = array("I")
+        self.file_ids = array("I")
+        self.statuses = array("B")
+        self.durations = array("d")
+        self.start_times = array("d")
+        self.end_times = array("d")
+
+        self.tag_offsets = array("I", [0])
+        self.tag_ids = array("I")
+        self.kw_offsets = array("I", [0])
+        self.kw_ids = array("I")
+        self.kw_statuses = array("B")
+
+        self.messages: Dict[int, str] = {}
+        self.suite_records: List[SuiteRecord] = []
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def add_test(
+        self,
+        suite: str,
+        name: str,
+        status: str,
+        duration: float,
+        start_time: float = NO_TIME,
+        end_time: float = NO_TIME,
+        tags: Optional[List[str]] = None,
+        keywords: Optional[List[Tuple[str, str]]] = None,
+        message: str = "",
+        file: str = "",
+    ) -> int:
+        """Append one test row and return its index"""
+        index = len(self.statuses)
+
+        self.suite_ids.append(self.suites.intern(suite))
+        self.name_ids.append(self.names.intern(name))
+        self.file_ids.append(self.files.intern(file))
+        self.statuses.append(status_code(status))
+        self.durations.append(duration)
+        self.start_times.append(start_time)
+        self.end_times.append(end_time)
+
+        for tag in tags or ():
+            self.tag_ids.append(self.tags.intern(tag))
+        self.tag_offsets.append(len(self.tag_ids))
+
+        for kw_name, kw_status in keywords or ():
+            self.kw_ids.append(self.keywords.intern(kw_name))
+            self.kw_statuses.append(status_code(kw_status))
+        self.kw_offsets.append(len(self.kw_ids))
+
+        if message:
+            self.messages[index] = message
+
+        return index
+
+    def add_suite(self, suite_record: SuiteRecord) -> None:
+        """Register the top-level suite of an output file"""
+        self.suite_records.append(suite_record)
+
+    def close_suite(self, suite_record: SuiteRecord) -> None:
+        """Finalize per-suite statistics for the rows added since ``add_suite``"""
+        suite_record.last_test = len(self)
+        counts = self.status_counts(suite_record.first_test, suite_record.last_test)
+        suite_record.statistics = {
+            "total": suite_record.last_test - suite_record.first_test,
+            "passed": counts["PASS"],
+            "failed": counts["FAIL"],
+            "skipped": counts["SKIP"] + counts["NOT RUN"] + counts["UNKNOWN"],
+        }
+
+    def test(self, index: int) -> TestRecord:
+        return TestRecord(self, index)
+
+    def subset(self, rows: Iterable[int]) -> "ReportModel":
+        """Copy the given rows, in ascending order, into a new model
+
+        Suite records are carried over with their row ranges remapped and
+        statistics recomputed; suites left without rows are dropped.
+        """
+        subset = ReportModel()
+        suite_records = iter(self.suite_records)
+        current = next(suite_records, None)
+        pending_record = None
+
+        for index in sorted(rows):
+            while current is not None and index >= current.last_test:
+                if pending_record is not None:
+                    subset.close_suite(pending_record)
+                    pending_record = None
+                current = next(suite_records, None)
+            if pending_record is None and current is not None:
+                pending_record = _copy_suite_record(current, first_test=len(subset))
+                subset.add_suite(pending_record)
+
+            test = self.test(index)
+            subset.add_test(
+                suite=test.suite,
+                name=test.name,
+                status=test.status,
+                duration=test.execution_time,
+                start_time=test.start_time,
+                end_time=test.end_time,
+                tags=test.tags,
+                keywords=[(kw["name"], kw["status"]) for kw in test.keywords],
+                message=test.message,
+                file=test.file,
+            )
+
+        if pending_record is not None:
+            subset.close_suite(pending_record)
+        return subset
+
+    def iter_tests(self) -> Iterator[TestRecord]:
+        for index in range(len(self)):
+            yield TestRecord(self, index)
+
+    def indices_with_status(self, status: str) -> List[int]:
+        """Row indices of all tests with the given status"""
+        code = status_code(status)
+        if NUMPY_AVAILABLE:
+            return np.flatnonzero(self.column("statuses") == code).tolist()
+        return [i for i, value in enumerate(self.statuses) if value == code]
+
+    def column(self, name: str):
+        """Return a column, as a zero-copy numpy view when numpy is available"""
+        values = getattr(self, name)
+        if not NUMPY_AVAILABLE:
+            return values
+        if not values:
+            return np.empty(0, dtype=values.typecode)
+        return np.frombuffer(values, dtype=values.typecode)
+
+    def status_counts(self, start: int = 0, end: Optional[int] = None) -> Dict[str, int]:
+        """Count tests per status over a row range"""
+        end = len(self) if end is None else end
+        if NUMPY_AVAILABLE:
+            counts = np.bincount(
+                self.column("statuses")[start:end], minlength=len(STATUS_NAMES)
+            ).tolist()
+        else:
+            rows = self.statuses[start:end]
+            counts = [rows.count(code) for code in range(len(STATUS_NAMES))]
+        return dict(zip(STATUS_NAMES, counts))
+
+    def total_duration(self) -> float:
+        """Sum of test durations"""
+        if NUMPY_AVAILABLE:
+            return float(self.column("durations").sum())
+        return math.fsum(self.durations)
+
+    def suite_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Per-suite counts and summed durations, grouped by interned suite id"""
+        suite_count = len(self.suites)
+        if NUMPY_AVAILABLE and len(self):
+            suite_ids = self.column("suite_ids")
+            statuses = self.column("statuses")
+            totals = np.bincount(suite_ids, minlength=suite_count)
+            passed = np.bincount(
+                suite_ids, weights=statuses == STATUS_CODES["PASS"], minlength=suite_count
+            )
+            failed = np.bincount(
+                suite_ids, weights=statuses == STATUS_CODES["FAIL"], minlength=suite_count
+            )
+            durations = np.bincount(
+                suite_ids, weights=self.column("durations"), minlength=suite_count
+            )
+            rows = zip(
+                totals.tolist(), passed.tolist(), failed.tolist(), durations.tolist()
+            )
+        else:
+            totals = [0] * suite_count
+            passed = [0] * suite_count
+            failed = [0] * suite_count
+            durations = [0.0] * suite_count
+            for suite_id, status, duration in zip(
+                self.suite_ids, self.statuses, self.durations
+            ):
+                totals[suite_id] += 1
+                durations[suite_id] += duration
+                if status == STATUS_CODES["PASS"]:
+                    passed[suite_id] += 1
+                elif status == STATUS_CODES["FAIL"]:
+                    failed[suite_id] += 1
+            rows = zip(totals, passed, failed, durations)
+
+        statistics = {}
+        for suite_id, (total, pass_count, fail_count, duration) in enumerate(rows):
+            statistics[self.suites[suite_id]] = {
+                "total": int(total),
+                "passed": int(pass_count),
+                "failed": int(fail_count),
+                "skipped": int(total - pass_count - fail_count),
+                "execution_time": float(duration),
+            }
+        return statistics
+
+    def used_tags(self) -> List[str]:
+        """All distinct tags carried by at least one test"""
+        return list(self.tags)
+
+    def memory_footprint(self) -> int:
+        """Approximate bytes held by the column arrays"""
+        columns = (
+            self.suite_ids,
+            self.name_ids,
+            self.file_ids,
+            self.statuses,
+            self.durations,
+            self.start_times,
+            self.end_times,
+            self.tag_offsets,
+            self.tag_ids,
+            self.kw_offsets,
+            self.kw_ids,
+            self.kw_statuses,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+def _synthetic_rows(test_count: int, keywords_per_test: int = 5):
+    """Yield synthetic rows shaped like parsed Robot Framework tests"""
+    for i in range(test_count):
+        suite = f"Tests.Api.Suite {i % 200}"
+        status = "FAIL" if i % 17 == 0 else "PASS"
+        yield {
+            "suite": suite,
+            "name": f"Test Case {i}",
+            "status": status,
+            "message": f"Expected 200 but got 500 (request {i})" if status == "FAIL" else "",
+            "tags": ["api", "regression", f"priority-{i % 3}"],
+            "keywords": [
+                (f"Keyword {k}", "PASS") for k in range(keywords_per_test)
+            ],
+            "execution_time": (i % 1000) / 100.0,
+            "start_time": 1700000000.0 + i,
+            "end_time": 1700000000.0 + i + (i % 1000) / 100.0,
+        }
+
+
+def _build_dict_model(test_count: int) -> List[Dict[str, Any]]:
+    tests = []
+    for row in _synthetic_rows(test_count):
+        tests.append(
+            {
+                "name": row["name"],
+                "suite": row["suite"],
+                "status": row["status"],
+                "message": row["message"],
+                "tags": list(row["tags"]),
+                "keywords": [
+                    {"name": name, "status": status} for name, status in row["keywords"]
+                ],
+                "execution_time": row["execution_time"],
+                "start_time": str(row["start_time"]),
+                "end_time": str(row["end_time"]),
+            }
+        )
+    return tests
+
+
+def _build_column_model(test_count: int) -> ReportModel:
+    model = ReportModel()
+    for row in _synthetic_rows(test_count):
+        model.add_test(
+            row["suite"],
+            row["name"],
+            row["status"],
+            row["execution_time"],
+            row["start_time"],
+            row["end_time"],
+            row["tags"],
+            row["keywords"],
+            row["message"],
+        )
+    return model
+
+
+def _dict_model_statistics(tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    suites: Dict[str, Dict[str, float]] = {}
+    passed = failed = 0
+    total_time = 0.0
+    for test in tests:
+        suite = suites.setdefault(
+            test["suite"], {"total": 0, "passed": 0, "failed": 0, "execution_time": 0.0}
+        )
+        suite["total"] += 1
+        suite["execution_time"] += test["execution_time"]
+        total_time += test["execution_time"]
+        if test["status"] == "PASS":
+            passed += 1
+            suite["passed"] += 1
+        elif test["status"] == "FAIL":
+            failed += 1
+            suite["failed"] += 1
+    return {"passed": passed, "failed": failed, "time": total_time, "suites": suites}
+
+
+def _measure(build, statistics) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build()
+    build_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    statistics(data)
+    stats_seconds = time.perf_counter() - start
+
+    return {
+        "build_seconds": round(build_seconds, 4),
+        "statistics_seconds": round(stats_seconds, 4),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def benchmark_models(test_count: int) -> Dict[str, Dict[str, float]]:
+    """Compare memory and time of the dict model against the column model"""
+    dict_results = _measure(
+        lambda: _build_dict_model(test_count), _dict_model_statistics
+    )
+    column_results = _measure(
+        lambda: _build_column_model(test_count),
+        lambda model: (model.status_counts(), model.suite_statistics()),
+    )
+    return {"dict_model": dict_results, "column_model": column_results}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the WordMate report data model"
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        default=100000,
+        metavar="TESTS",
+        help="Number of synthetic tests to benchmark with (default: 100000)",
+    )
+    args = parser.parse_args()
+
+    print(f"📏 Benchmarking report models with {args.benchmark} tests...")
+    results = benchmark_models(args.benchmark)
+    for model_name, metrics in results.items():
+        print(f"\n{model_name}:")
+        for metric, value in metrics.items():
+            print(f"  {metric:<20} {value}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+WordMate Execution Timeline
+
+Rebuilds the per-worker timeline of a (pabot) parallel run from the start
+and end times stored for every test. Robot Framework outputs do not record
+which pabot process ran an item, so execution units are assigned to
+worker lanes by interval partitioning: a unit goes to the lane that became
+free most recently before it started, which recovers the minimum number of
+concurrent workers and their individual schedules.
+
+A unit is a suite (pabot's default split) unless tests of one suite ran
+concurrently, in which case the run used ``--testlevelsplit`` and every
+test is its own unit.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.report_model import ReportModel
+
+MIN_IDLE_GAP = 1.0
+MAX_REPORTED_GAPS = 20
+MAX_TIMELINE_BARS = 3000
+
+
+def _collect_units(model: ReportModel) -> Tuple[str, List[Dict[str, Any]]]:
+    """Group timed tests into execution units; returns ``(unit_kind, units)``"""
+    suites: Dict[str, Dict[str, Any]] = {}
+    tests = []
+    concurrent_tests = False
+
+    for test in model.iter_tests():
+        start, end = test.start_time, test.end_time
+        if math.isnan(start) or math.isnan(end):
+            continue
+        unit = {
+            "name": test.longname,
+            "suite": test.suite,
+            "start": start,
+            "end": max(end, start),
+            "tests": 1,
+            "failed": test.status == "FAIL",
+        }
+        tests.append(unit)
+
+        suite = suites.get(test.suite)
+        if suite is None:
+            suites[test.suite] = {**unit, "name": test.suite, "last_end": unit["end"]}
+            continue
+        if start < suite["last_end"]:
+            concurrent_tests = True
+        suite["last_end"] = max(suite["last_end"], unit["end"])
+        suite["start"] = min(suite["start"], start)
+        suite["end"] = max(suite["end"], unit["end"])
+        suite["tests"] += 1
+        suite["failed"] = suite["failed"] or unit["failed"]
+
+    if concurrent_tests:
+        return "test", tests
+    for suite in suites.values():
+        del suite["last_end"]
+    return "suite", list(suites.values())
+
+
+def assign_lanes(units: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Assign units to the fewest worker lanes with no overlap in a lane"""
+    lanes: List[List[Dict[str, Any]]] = []
+    free_lanes: List[tuple] = []  # (-end, lane) so the most recently freed wins
+    busy_lanes: List[tuple] = []  # (end, lane)
+
+    for unit in sorted(units, key=lambda item: (item["start"], item["end"])):
+        while busy_lanes and busy_lanes[0][0] <= unit["start"]:
+            end, lane = heapq.heappop(busy_lanes)
+            heapq.heappush(free_lanes, (-end, lane))
+
+        if free_lanes:
+            _, lane = heapq.heappop(free_lanes)
+        else:
+            lane = len(lanes)
+            lanes.append([])
+
+        unit["worker"] = lane
+        lanes[lane].append(unit)
+        heapq.heappush(busy_lanes, (unit["end"], lane))
+
+    return lanes
+
+
+def estimate_wall_clock(durations: List[float], workers: int) -> float:
+    """Wall-clock of longest-first greedy scheduling on ``workers`` lanes"""
+    if not durations:
+        return 0.0
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def analyze_timeline(model: ReportModel) -> Optional[Dict[str, Any]]:
+    """Wall-clock, utilization, idle gaps and critical path of a run
+
+    Returns None when the results carry no usable timestamps.
+    """
+    unit_kind, units = _collect_units(model)
+    if not units:
+        return None
+
+    lanes = assign_lanes(units)
+    run_start = min(unit["start"] for unit in units)
+    run_end = max(unit["end"] for unit in units)
+    wall_clock = run_end - run_start
+    busy_time = sum(unit["end"] - unit["start"] for unit in units)
+    test_time = model.total_duration()
+    workers = len(lanes)
+
+    workers_summary = []
+    idle_gaps = []
+    for index, lane in enumerate(lanes):
+        lane_busy = sum(unit["end"] - unit["start"] for unit in lane)
+        previous_end = run_start
+        for unit in lane:
+            gap = unit["start"] - previous_end
+            if gap >= MIN_IDLE_GAP:
+                idle_gaps.append(
+                    {
+                        "worker": index,
+                        "start": round(previous_end - run_start, 3),
+                        "duration": round(gap, 3),
+                        "before": unit["name"],
+                    }
+                )
+            previous_end = max(previous_end, unit["end"])
+        tail_idle = run_end - previous_end
+        if tail_idle >= MIN_IDLE_GAP:
+            idle_gaps.append(
+                {
+                    "worker": index,
+                    "start": round(previous_end - run_start, 3),
+                    "duration": round(tail_idle, 3),
+                    "before": None,
+                }
+            )
+        workers_summary.append(
+            {
+                "worker": index,
+                "units": len(lane),
+                "busy_seconds": round(lane_busy, 3),
+                "idle_seconds": round(wall_clock - lane_busy, 3),
+                "utilization_percent": (
+                    round(lane_busy / wall_clock * 100, 1) if wall_clock else 100.0
+                ),
+            }
+        )
+    idle_gaps.sort(key=lambda gap: gap["duration"], reverse=True)
+
+    # The run ends with the last unit of the busiest lane; the longest unit
+    # is the floor no number of workers can go below
+    last_unit = max(units, key=lambda unit: unit["end"])
+    longest_unit = max(units, key=lambda unit: unit["end"] - unit["start"])
+    critical_lane = last_unit["worker"]
+
+    durations = [unit["end"] - unit["start"] for unit in units]
+    what_if = [
+        {
+            "workers": count,
+            "estimated_wall_clock": round(estimate_wall_clock(durations, count), 3),
+        }
+        for count in sorted({workers, workers + 1, workers * 2, workers * 4})
+    ]
+
+    bars = []
+    if len(units) <= MAX_TIMELINE_BARS:
+        bars = [
+            [
+                index,
+                round(unit["start"] - run_start, 3),
+                round(unit["end"] - unit["start"], 3),
+                unit["name"],
+                unit["failed"],
+            ]
+            for index, lane in enumerate(lanes)
+            for unit in lane
+        ]
+
+    return {
+        "unit": unit_kind,
+        "workers": workers,
+        "units": len(units),
+        "wall_clock_seconds": round(wall_clock, 3),
+        "busy_seconds": round(busy_time, 3),
+        "test_seconds": round(test_time, 3),
+        "speedup": round(test_time / wall_clock, 2) if wall_clock else None,
+        "parallel_efficiency_percent": (
+            round(busy_time / (workers * wall_clock) * 100, 1) if wall_clock else 100.0
+        ),
+        "idle_seconds": round(workers * wall_clock - busy_time, 3),
+        "idle_gaps": idle_gaps[:MAX_REPORTED_GAPS],
+        "critical_path": {
+            "worker": critical_lane,
+            "last_unit": last_unit["name"],
+            "worker_busy_seconds": workers_summary[critical_lane]["busy_seconds"],
+            "longest_unit": longest_unit["name"],
+            "longest_unit_seconds": round(
+                longest_unit["end"] - longest_unit["start"], 3
+            ),
+        },
+        "worker_summary": workers_summary,
+        "what_if": what_if,
+        "bars": bars,
+    }
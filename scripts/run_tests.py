@@ -8,6 +8,8 @@ for the WordMate application with various configuration options.
 Usage:
     python scripts/run_tests.py --env dev --suite ui
     python scripts/run_tests.py --env production --parallel 4
+    python scripts/run_tests.py --env dev --suite api --api-mode replay
+    python scripts/run_tests.py --env local --suite api
     python scripts/run_tests.py --help
 """
 
@@ -16,6 +18,8 @@ import os
 import re
 import subprocess
 import sys
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -25,6 +29,17 @@ import yaml
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from resources.libraries.cassette import CASSETTE_SUFFIX, DEFAULT_CASSETTE_DIR
+from resources.libraries.circuit_breaker import STATE_FILE_ENV as CIRCUIT_STATE_ENV
+from scripts.configure_environments import EnvironmentConfigurator
+from scripts.mock_server import wait_until_ready
+
+QUARANTINE_TAG = "quarantine"
+QUARANTINE_MODIFIER = Path("resources") / "libraries" / "QuarantineModifier.py"
+# Robot Framework exits with 252 when no test matched the selection
+NO_TESTS_RETURN_CODE = 252
+MOCK_SERVER_STARTUP_TIMEOUT = 15
+
 
 class WordMateTestRunner:
     """Test runner for WordMate Robot Framework tests"""
@@ -34,6 +49,9 @@ class WordMateTestRunner:
         self.config_dir = self.project_root / "config"
         self.reports_dir = self.project_root / "reports"
         self.tests_dir = self.project_root / "tests"
+        # Names every output of this invocation, so report_merge.py can tell
+        # its reruns and quarantine outputs from those of other runs
+        self.run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     def load_environment_config(self, environment):
         """Load environment configuration from YAML file with environment variable substitution"""
@@ -76,10 +94,23 @@ class WordMateTestRunner:
 
         return env_reports_dir
 
-    def build_robot_command(self, args, config):
-        """Build Robot Framework command based on arguments and config"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def load_quarantine(self, quarantine_file):
+        """Return the test names listed in the quarantine file"""
+        if not quarantine_file.exists():
+            return []
+        with open(quarantine_file, "r") as f:
+            document = yaml.safe_load(f) or {}
+        return [entry["test"] for entry in document.get("tests", [])]
+
+    def build_robot_command(self, args, config, quarantine=None):
+        """Build Robot Framework command based on arguments and config
+
+        ``quarantine`` is None for a plain run, ``"exclude"`` to leave the
+        quarantined tests out, or ``"only"`` to run just those tests.
+        """
+        timestamp = self.run_timestamp
         reports_dir = self.create_reports_directory(args.environment)
+        prefix = "quarantine_" if quarantine == "only" else ""
 
         # Base robot command
         cmd = ["robot"]
@@ -90,11 +121,11 @@ class WordMateTestRunner:
                 "--outputdir",
                 str(reports_dir),
                 "--output",
-                f"output_{timestamp}.xml",
+                f"{prefix}output_{timestamp}.xml",
                 "--log",
-                f"log_{timestamp}.html",
+                f"{prefix}log_{timestamp}.html",
                 "--report",
-                f"report_{timestamp}.html",
+                f"{prefix}report_{timestamp}.html",
             ]
         )
 
@@ -111,11 +142,28 @@ class WordMateTestRunner:
                 f"BROWSER:{config['web']['browser']}",
                 "--variable",
                 f"HEADLESS:{config['web']['headless']}",
+                "--variable",
+                f"API_TRANSPORT:{config['api'].get('transport', 'http1')}",
+                "--variable",
+                f"API_LOG_SAMPLE:{config['api'].get('log_sample', 100)}",
             ]
         )
 
         # Test tags
-        if args.include_tags:
+        if quarantine:
+            cmd.extend(
+                [
+                    "--prerunmodifier",
+                    f"{QUARANTINE_MODIFIER}:{args.quarantine_file}",
+                ]
+            )
+
+        if quarantine == "only":
+            # Includes are OR'ed, so narrow each requested tag to quarantined tests
+            for tag in args.include_tags or [None]:
+                pattern = f"{tag}AND{QUARANTINE_TAG}" if tag else QUARANTINE_TAG
+                cmd.extend(["--include", pattern])
+        elif args.include_tags:
             for tag in args.include_tags:
                 cmd.extend(["--include", tag])
 
@@ -123,14 +171,17 @@ class WordMateTestRunner:
             for tag in args.exclude_tags:
                 cmd.extend(["--exclude", tag])
 
+        if quarantine == "exclude":
+            cmd.extend(["--exclude", QUARANTINE_TAG])
+
         # Log level
         if args.log_level:
             cmd.extend(["--loglevel", args.log_level])
         else:
             cmd.extend(["--loglevel", config["logging"]["level"]])
 
-        # Parallel execution
-        if args.parallel:
+        # Parallel execution; quarantined tests always run serially
+        if args.parallel and quarantine != "only":
             # Use pabot for parallel execution
             cmd[0] = "pabot"
             cmd.extend(["--processes", str(args.parallel)])
@@ -151,31 +202,223 @@ class WordMateTestRunner:
 
         return cmd
 
+    def prepare_api_mode(self, args):
+        """Pass record/replay mode to the robot processes; False if it cannot run"""
+        cassette_dir = Path(args.cassette_dir)
+        os.environ["WORDMATE_API_MODE"] = args.api_mode
+        os.environ["WORDMATE_CASSETTE_DIR"] = str(cassette_dir.resolve())
+
+        if args.api_mode == "record":
+            # A recording replaces the previous one instead of mixing with it
+            stale = list(cassette_dir.glob(f"*{CASSETTE_SUFFIX}"))
+            for path in stale:
+                path.unlink()
+            print(f"🎙️  Recording API traffic to {cassette_dir}")
+        elif args.api_mode == "replay":
+            cassettes = list(cassette_dir.glob(f"*{CASSETTE_SUFFIX}"))
+            if not cassettes:
+                print(f"❌ No cassettes in {cassette_dir}, record some first:")
+                print("   python scripts/run_tests.py --suite api --api-mode record")
+                return False
+            print(f"📼 Replaying API traffic from {len(cassettes)} cassettes")
+        return True
+
+    def prepare_circuit_state(self):
+        """Give this run's robot processes a fresh, shared circuit breaker file
+
+        Returns the file, to be removed once the run is over.
+        """
+        state_file = Path(tempfile.gettempdir()) / (
+            f"wordmate_circuit_breaker_{os.getpid()}.json"
+        )
+        state_file.unlink(missing_ok=True)
+        os.environ[CIRCUIT_STATE_ENV] = str(state_file)
+        return state_file
+
+    def start_mock_server(self, args, config):
+        """Start the local api.php stand-in of environments that have one
+
+        Returns the server process, or None when nothing was started.
+        """
+        mock_config = config.get("mock_server")
+        if not mock_config:
+            return None
+
+        # common_variables.robot reads credentials from %{<env>_TEST_USER} etc.
+        users = (config.get("test_data") or {}).get("default_users") or {}
+        for prefix, user in (("TEST", "valid_user"), ("INVALID", "invalid_user")):
+            if user in users:
+                os.environ.setdefault(
+                    f"{args.environment}_{prefix}_USER", users[user]["username"]
+                )
+                os.environ.setdefault(
+                    f"{args.environment}_{prefix}_PASSWORD", users[user]["password"]
+                )
+
+        if not mock_config.get("autostart", True) or args.api_mode == "replay":
+            return None
+        api_url = config["environment"]["api_base_url"]
+        if wait_until_ready(api_url, timeout=0):
+            print(f"Mock server already running at {api_url}")
+            return None
+
+        config_file = self.config_dir / "environments" / f"{args.environment}.yaml"
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                str(self.project_root / "scripts" / "mock_server.py"),
+                "--config",
+                str(config_file),
+            ],
+            cwd=self.project_root,
+        )
+        if not wait_until_ready(api_url, MOCK_SERVER_STARTUP_TIMEOUT):
+            self.stop_mock_server(process)
+            raise RuntimeError(f"Mock server did not start at {api_url}")
+        return process
+
+    def stop_mock_server(self, process):
+        if process is None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def run_preflight(self, args, config):
+        """Check the environment is reachable before starting any workers"""
+        started = time.perf_counter()
+        failures = EnvironmentConfigurator().run_preflight(args.environment, config)
+        elapsed = time.perf_counter() - started
+
+        if failures:
+            print(
+                f"❌ Preflight failed for {args.environment} after {elapsed:.1f}s, "
+                "not starting the test run:"
+            )
+            for failure in failures:
+                print(f"   • {failure}")
+            print("   Use --skip-preflight to run anyway")
+            return False
+
+        print(f"✅ Preflight passed for {args.environment} ({elapsed:.1f}s)")
+        return True
+
+    def execute_command(self, cmd, verbose=False):
+        """Run one robot/pabot command and return its exit code"""
+        # Print command for debugging
+        if verbose:
+            print("Executing command:")
+            print(" ".join(cmd))
+            print("-" * 50)
+
+        return subprocess.run(cmd, cwd=self.project_root).returncode
+
+    def build_retry_command(self, cmd, previous_output, attempt):
+        """Derive a command re-running only the failed tests of ``previous_output``"""
+        retry_cmd = list(cmd)
+        for option in ("--output", "--log", "--report"):
+            index = retry_cmd.index(option) + 1
+            stem, suffix = os.path.splitext(retry_cmd[index])
+            retry_cmd[index] = f"{stem}_retry{attempt}{suffix}"
+        retry_cmd[-1:-1] = ["--rerunfailed", str(previous_output)]
+        return retry_cmd
+
+    def run_quarantined_tests(self, args, config):
+        """Run quarantined tests serially, retrying failures
+
+        Returns the Robot return code of the last attempt. It is reported in
+        the run summary but does not change the run's own return code.
+        """
+        cmd = self.build_robot_command(args, config, quarantine="only")
+        output_dir = Path(cmd[cmd.index("--outputdir") + 1])
+
+        retries = args.quarantine_retries
+        print(f"\n🧪 Running quarantined tests (up to {retries} retries)...")
+        returncode = self.execute_command(cmd, args.verbose)
+
+        attempt = 0
+        retry_cmd = cmd
+        while (
+            returncode not in (0, NO_TESTS_RETURN_CODE)
+            and attempt < retries
+            and not args.dryrun
+        ):
+            attempt += 1
+            previous_output = output_dir / retry_cmd[retry_cmd.index("--output") + 1]
+            retry_cmd = self.build_retry_command(cmd, previous_output, attempt)
+            print(f"🔁 Retrying failed quarantined tests (attempt {attempt})...")
+            returncode = self.execute_command(retry_cmd, args.verbose)
+
+        if returncode == NO_TESTS_RETURN_CODE:
+            print("No quarantined tests matched the selection")
+        elif returncode == 0:
+            print(f"✅ Quarantined tests passed after {attempt} retries")
+        else:
+            print(
+                f"⚠️  {returncode} quarantined tests still failing "
+                f"after {attempt} retries"
+            )
+        return returncode
+
     def run_tests(self, args):
         """Execute Robot Framework tests"""
         try:
             # Load environment configuration
             config = self.load_environment_config(args.environment)
 
-            # Build robot command
-            cmd = self.build_robot_command(args, config)
-
-            # Print command for debugging
-            if args.verbose:
-                print("Executing command:")
-                print(" ".join(cmd))
-                print("-" * 50)
-
-            # Execute tests
-            result = subprocess.run(cmd, cwd=self.project_root)
-
-            # Print results summary
-            reports_dir = self.reports_dir / args.environment
-            print(f"\nTest execution completed!")
-            print(f"Reports available in: {reports_dir}")
-            print(f"Return code: {result.returncode}")
-
-            return result.returncode
+            if not self.prepare_api_mode(args):
+                return 1
+
+            circuit_state = self.prepare_circuit_state()
+            mock_server = self.start_mock_server(args, config)
+            try:
+                # A down environment would otherwise make every test wait through
+                # its own retries and timeouts before failing; replay needs none
+                replay = args.api_mode == "replay"
+                if not (args.skip_preflight or args.dryrun or replay):
+                    if not self.run_preflight(args, config):
+                        return 1
+
+                # Keep quarantined flaky tests out of the main (parallel) run
+                quarantined = []
+                if not args.no_quarantine:
+                    quarantined = self.load_quarantine(args.quarantine_file)
+
+                # Build robot command and execute tests
+                if quarantined:
+                    print(f"Quarantine: {len(quarantined)} flaky tests run separately")
+                    cmd = self.build_robot_command(args, config, quarantine="exclude")
+                    returncode = self.execute_command(cmd, args.verbose)
+                    if returncode == NO_TESTS_RETURN_CODE:
+                        # Every selected test is quarantined
+                        returncode = 0
+                    # Known-flaky failures are reported but never fail the run
+                    quarantine_returncode = self.run_quarantined_tests(args, config)
+                else:
+                    cmd = self.build_robot_command(args, config)
+                    returncode = self.execute_command(cmd, args.verbose)
+
+                # Print results summary
+                reports_dir = self.reports_dir / args.environment
+                print(f"\nTest execution completed!")
+                print(f"Reports available in: {reports_dir}")
+                print(f"Return code: {returncode}")
+                if quarantined:
+                    if quarantine_returncode in (0, NO_TESTS_RETURN_CODE):
+                        quarantine_result = "passed"
+                    else:
+                        quarantine_result = f"{quarantine_returncode} failing"
+                    print(
+                        f"Quarantined tests: {quarantine_result} "
+                        "(not counted in the return code)"
+                    )
+
+                return returncode
+            finally:
+                self.stop_mock_server(mock_server)
+                circuit_state.unlink(missing_ok=True)
 
         except FileNotFoundError as e:
             print(f"Error: {e}")
@@ -216,6 +459,9 @@ Examples:
   %(prog)s --env production --suite api --parallel 4
   %(prog)s --env dev --include-tags smoke --exclude-tags slow
   %(prog)s --env dev --test-file tests/ui/auth/login_ui_tests.robot
+  %(prog)s --env dev --parallel 4 --quarantine-retries 3
+  %(prog)s --env dev --suite api --api-mode record
+  %(prog)s --suite api --api-mode replay
   %(prog)s --list-tests
         """,
     )
@@ -262,6 +508,50 @@ Examples:
 
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
 
+    parser.add_argument(
+        "--skip-preflight",
+        action="store_true",
+        help="Start the run without first checking the environment is reachable",
+    )
+
+    # Record/replay of API traffic
+    parser.add_argument(
+        "--api-mode",
+        choices=["live", "record", "replay"],
+        default="live",
+        help="Send API requests to the environment (live), also record them "
+        "to cassettes (record), or answer them from cassettes without any "
+        "network (replay)",
+    )
+
+    parser.add_argument(
+        "--cassette-dir",
+        type=Path,
+        default=DEFAULT_CASSETTE_DIR,
+        help=f"Cassette directory (default: {DEFAULT_CASSETTE_DIR.name}/)",
+    )
+
+    # Flaky test quarantine
+    parser.add_argument(
+        "--quarantine-file",
+        type=Path,
+        default=project_root / "config" / "quarantine.yaml",
+        help="Quarantine list written by generate_report.py --history-db",
+    )
+
+    parser.add_argument(
+        "--quarantine-retries",
+        type=int,
+        default=2,
+        help="Retries for failing quarantined tests (default: 2)",
+    )
+
+    parser.add_argument(
+        "--no-quarantine",
+        action="store_true",
+        help="Run quarantined tests with the rest of the suite",
+    )
+
     # Information commands
     parser.add_argument(
         "--list-tests", action="store_true", help="List available test suites and exit"